@@ -0,0 +1,169 @@
+"""
+Latency of the whole path from a sensor to the UI: sends authenticated measure frames to a UDP gateway on localhost,
+one at a time, and measures how long it takes a websocket client of the UI server to get the temperature update
+published when the measure is saved. Runs the controller in threads, as it does by default, and on a single event loop.
+"""
+import asyncio
+import json
+import logging
+import os
+import socket
+import tempfile
+import threading
+from datetime import datetime
+from statistics import median
+from struct import pack, unpack
+from time import monotonic
+from typing import List, Tuple
+from secrets import MY_ADDRESS
+from sqlalchemy.orm import sessionmaker
+from command_bus import CommandBus, CommandExecutor
+from domain_types import MeasureKind
+from persistence import AbstractBase, NounceManager, create_database_engine
+from radio_bus import Framing, OutboundMessage, RadioController, RateLimiter, TransmitScheduler, UdpGateway
+from runtime import AsyncRuntime
+from ui import UiController
+
+FRAMES = 500
+FRAME_INTERVAL = 0.01  # seconds between the update of one frame and the next frame
+HANDSHAKE = (
+    "GET / HTTP/1.1\r\nHost: 127.0.0.1\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+    "Sec-WebSocket-Key: dGhlIHNhbXBsZSBub25jZQ==\r\nSec-WebSocket-Version: 13\r\n\r\n"
+)
+
+
+def free_port() -> int:
+    """
+    Returns a TCP port nothing listens on
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+async def connect_ui(ui_port: int) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    """
+    Connects to the UI server as soon as it listens. The websockets client can't be used here, the secrets module of
+    the controller shadows the one of the standard library it generates the handshake key with.
+    """
+    while True:
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", ui_port)
+            break
+        except OSError:
+            await asyncio.sleep(0.01)
+
+    writer.write(HANDSHAKE.encode())
+    await reader.readuntil(b"\r\n\r\n")
+    return reader, writer
+
+
+async def receive_ui(reader: asyncio.StreamReader) -> dict:
+    """
+    Receives the next message sent by the UI server, skipping control frames
+    """
+    while True:
+        opcode, length = await reader.readexactly(2)
+        if length == 126:
+            length = unpack(">H", await reader.readexactly(2))[0]
+        elif length == 127:
+            length = unpack(">Q", await reader.readexactly(8))[0]
+        payload = await reader.readexactly(length)
+        if opcode & 0x0f == 0x01:
+            return json.loads(payload)
+
+
+async def measure_latencies(gateway: UdpGateway, ui_port: int) -> List[float]:
+    """
+    Sends the frames one by one, returns how long it took for each of them to be published to the UI
+    """
+    reader, writer = await connect_ui(ui_port)
+
+    latencies = []
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sensor:
+        for nounce in range(1, FRAMES + 1):
+            # the temperature tells which frame the update is for, rounded the way it's sent
+            temperature = unpack("<f", pack("<f", 10 + nounce / 100))[0]
+            frame = OutboundMessage(
+                MeasureKind.LIVING_ROOM.value, MY_ADDRESS, 0x01, nounce, pack("<fff", temperature, 40.0, 3.3)
+            )
+            sent_at = monotonic()
+            sensor.sendto(frame.encoded_for(Framing.COBS), gateway.address)
+            while True:
+                message = await asyncio.wait_for(receive_ui(reader), 5)
+                if message["type"] == "measure/updateTemperature" and message["payload"]["temperature"] == temperature:
+                    break
+            latencies.append(monotonic() - sent_at)
+            await asyncio.sleep(FRAME_INTERVAL)
+
+    writer.close()
+    return latencies
+
+
+def run(database_path: str, use_event_loop: bool) -> List[float]:
+    """
+    Runs the controller in given mode against a database at given path, returns the latencies of the frames
+    """
+    stop = threading.Event()
+    command_bus = CommandBus()
+    outbound_bus = TransmitScheduler()
+    db_engine = create_database_engine(database_path)
+    db_session_factory = sessionmaker(db_engine, expire_on_commit=False)
+    AbstractBase.metadata.create_all(db_engine)
+    nounce_manager = NounceManager(db_session_factory)
+    nounce_manager.load()
+
+    gateway = UdpGateway("udp", "127.0.0.1", 0)
+    ui_port = free_port()
+    ui_controller = UiController(ui_port, command_bus, stop)
+    radio_controller = RadioController(
+        [gateway], outbound_bus, command_bus, datetime, stop, nounce_manager, RateLimiter({})
+    )
+    executor = CommandExecutor(
+        db_session_factory, outbound_bus, command_bus, ui_controller, datetime, stop, nounce_manager
+    )
+    if use_event_loop:
+        threads = [
+            threading.Thread(target=AsyncRuntime(radio_controller, executor, ui_controller, nounce_manager, stop).run)
+        ]
+    else:
+        threads = [
+            threading.Thread(target=radio_controller.run_receiver, args=(gateway,)),
+            threading.Thread(target=radio_controller.run_transmitter),
+            threading.Thread(target=executor.run),
+            threading.Thread(target=ui_controller.run),
+            threading.Thread(target=nounce_manager.run, args=(stop,)),
+        ]
+    for thread in threads:
+        thread.start()
+
+    try:
+        return asyncio.run(measure_latencies(gateway, ui_port))
+    finally:
+        stop.set()
+        # wake the idle command worker up, so it notices it's been stopped
+        command_bus.put_nowait(None)
+        for thread in threads:
+            thread.join()
+        nounce_manager.close()
+        gateway.close()
+
+
+def print_latencies(label: str, latencies: List[float]) -> None:
+    """
+    Prints out median, 90th and 99th percentile, and maximum latency
+    """
+    latencies.sort()
+    print(
+        f"{label:>10}: median {1000 * median(latencies):6.2f} ms, "
+        f"p90 {1000 * latencies[int(len(latencies) * 0.9)]:6.2f} ms, "
+        f"p99 {1000 * latencies[int(len(latencies) * 0.99)]:6.2f} ms, max {1000 * latencies[-1]:6.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    print(f"{FRAMES} measure frames, sensor to UI")
+    with tempfile.TemporaryDirectory() as database_directory:
+        print_latencies("threads", run(os.path.join(database_directory, "threads.db"), False))
+        print_latencies("asyncio", run(os.path.join(database_directory, "asyncio.db"), True))
@@ -0,0 +1,35 @@
+"""
+Compares bytes on air per frame type in the nibble-split and COBS framings. MACs and nounces differ between frames,
+so every frame type is averaged over many frames.
+"""
+import random
+from struct import pack
+from radio_bus import Framing, OutboundMessage
+
+FRAMES = 2000
+BAUDRATE = 4800
+
+FRAME_TYPES = {
+    "nounce reply": (0x00, lambda rng: pack("<L", rng.getrandbits(32))),
+    "turn on / off": (0x01, lambda rng: None),
+    "device ping": (0x01, lambda rng: b'\x01'),
+    "indoor measure": (0x01, lambda rng: pack("<fff", rng.uniform(15, 30), rng.uniform(30, 70), rng.uniform(2.8, 3.3))),
+    "outdoor measure": (0x01, lambda rng: pack("<ff", rng.uniform(-20, 35), rng.uniform(2.8, 3.3))),
+}
+
+
+if __name__ == "__main__":
+    rng = random.Random(2023)
+    print(f"{'frame type':>16s}  {'nibble':>8s}  {'cobs':>8s}  {'saved':>6s}  {'airtime saved':>13s}")
+    for name, (command, payload) in FRAME_TYPES.items():
+        nibble = 0
+        cobs = 0
+        for _ in range(FRAMES):
+            msg = OutboundMessage(0x01, 0x30, command, rng.getrandbits(32), payload(rng))
+            nibble += len(msg.encoded_for(Framing.NIBBLE))
+            cobs += len(msg.encoded_for(Framing.COBS))
+
+        print(
+            f"{name:>16s}  {nibble / FRAMES:8.1f}  {cobs / FRAMES:8.1f}  {1 - cobs / nibble:6.1%}  "
+            f"{(nibble - cobs) / FRAMES * 10 / BAUDRATE * 1000:10.1f} ms"
+        )
@@ -0,0 +1,69 @@
+"""
+Compares the table-driven nibble-split codec with the byte-by-byte loops it replaced, on a realistic measure frame
+(MAC, header and 12 bytes of readings) and on a worst-case frame with the highest bit set on every byte.
+"""
+import os
+import timeit
+from hashlib import blake2s
+from struct import pack
+from radio_bus.radio.NibbleCodec import decode, encode
+
+ROUNDS = 20000
+
+
+def legacy_encode(message: bytes) -> bytes:
+    """
+    Encoding loop as it was in OutboundMessage
+    """
+    encoded_data = bytearray()
+    for b in message:
+        if b & 0x80:
+            encoded_data.append((b >> 4) | 0x80)
+            encoded_data.append(b & 0x0F)
+        else:
+            encoded_data.append(b)
+    return bytes(encoded_data)
+
+
+def legacy_decode(data: bytes) -> bytes:
+    """
+    Decoding loop as it was in InboundMessage
+    """
+    result = bytearray()
+    i = 0
+    while i < len(data):
+        if data[i] & 0x80 and i < len(data) - 1:
+            result.append(((data[i] & 0x0F) << 4) | (data[i + 1]))
+            i += 1
+        else:
+            result.append(data[i])
+        i += 1
+    return bytes(result)
+
+
+def run(name: str, message: bytes) -> None:
+    """
+    Times both implementations on given message and prints microseconds per frame
+    """
+    encoded = encode(message)
+    assert encoded == legacy_encode(message)
+    assert decode(encoded) == legacy_decode(encoded) == message
+
+    results = []
+    for label, statement in [
+        ("legacy encode", lambda: legacy_encode(message)),
+        ("table encode", lambda: encode(message)),
+        ("legacy decode", lambda: legacy_decode(encoded)),
+        ("table decode", lambda: decode(encoded)),
+    ]:
+        results.append(f"{label} {timeit.timeit(statement, number=ROUNDS) / ROUNDS * 1e6:6.2f} us")
+
+    print(f"{name:>10s} ({len(message):d} -> {len(encoded):d} bytes): " + ", ".join(results))
+
+
+if __name__ == "__main__":
+    header = pack("<LBBB", 0x74646B, 0x20, 0x01, 0x01)
+    readings = pack("<fff", 23.5, 45.2, 3.01)
+    measure = blake2s(header + readings, key=os.urandom(16), digest_size=16).digest() + header + readings
+    run("measure", measure)
+    run("worst case", bytes(b | 0x80 for b in os.urandom(len(measure))))
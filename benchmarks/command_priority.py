@@ -0,0 +1,98 @@
+"""
+Simulates ten minutes of the command executor going through the commands of three sensors and two devices, hit by
+a storm of reconnecting UI clients and by a backlog of replayed measures. Prints out how long the regulation, the
+persistence and the UI commands have been waiting on a FIFO queue and on the priority-aware command bus.
+"""
+import heapq
+from queue import Empty, Queue
+from typing import Callable, Dict, List, Optional, Tuple
+from command_bus import CommandBus, CommandPriority
+
+DURATION = 600  # simulated seconds
+STORM_AT = 120  # seconds
+STORM_CLIENTS = 200
+BACKLOG_AT = 300  # seconds
+BACKLOG_MEASURES = 500
+
+
+class Job:
+    """
+    Simulated command, taking a fixed time to execute and queueing the follow-up job when executed
+    """
+
+    def __init__(self, label: str, priority: CommandPriority, cost: float, follow_up: Optional["Job"] = None):
+        self.label = label
+        self.PRIORITY = priority  # pylint: disable=C0103
+        self.cost = cost
+        self.follow_up = follow_up
+        self.queued_at = 0.0
+
+
+def arrivals() -> List[Tuple[float, int, Job]]:
+    """
+    Returns the jobs put on the bus by the radio and the UI, with the time they arrive at
+    """
+    jobs: List[Tuple[float, Job]] = []
+    for sensor in range(3):
+        for at in range(sensor * 20, DURATION, 60):
+            regulation = Job("regulation", CommandPriority.CRITICAL, 0.005)
+            jobs.append((at, Job("persistence", CommandPriority.NORMAL, 0.003)))
+            jobs.append((at, Job("regulation", CommandPriority.CRITICAL, 0.002, regulation)))
+    for device in range(2):
+        for at in range(device * 15, DURATION, 30):
+            jobs.append((at, Job("persistence", CommandPriority.NORMAL, 0.003)))
+    jobs.extend((STORM_AT, Job("ui", CommandPriority.BACKGROUND, 0.025)) for _ in range(STORM_CLIENTS))
+    jobs.extend((BACKLOG_AT, Job("persistence", CommandPriority.NORMAL, 0.003)) for _ in range(BACKLOG_MEASURES))
+
+    return [(at, sequence, job) for sequence, (at, job) in enumerate(jobs)]
+
+
+def simulate(create_bus: Callable[[Callable[[], float]], Queue]) -> Dict[str, List[float]]:
+    """
+    Runs a single executor against the bus, returns the queue waits of the jobs by their label
+    """
+    clock = [0.0]
+    bus = create_bus(lambda: clock[0])
+    pending = arrivals()
+    heapq.heapify(pending)
+    waits: Dict[str, List[float]] = {}
+
+    while pending or bus.qsize():
+        while pending and pending[0][0] <= clock[0]:
+            job = heapq.heappop(pending)[2]
+            job.queued_at = clock[0]
+            bus.put_nowait(job)
+
+        try:
+            job = bus.get_nowait()
+        except Empty:
+            clock[0] = pending[0][0]
+            continue
+
+        waits.setdefault(job.label, []).append(clock[0] - job.queued_at)
+        clock[0] += job.cost
+        if job.follow_up is not None:
+            job.follow_up.queued_at = clock[0]
+            bus.put_nowait(job.follow_up)
+
+    return waits
+
+
+def print_waits(label: str, waits: Dict[str, List[float]]) -> None:
+    """
+    Prints out mean, 99th percentile and maximum queue wait of each kind of jobs
+    """
+    print(f"{label:s}:")
+    for kind, values in sorted(waits.items()):
+        values.sort()
+        print(
+            f"{kind:>12}: {len(values):4d} commands, mean {1000 * sum(values) / len(values):7.1f} ms, "
+            f"p99 {1000 * values[int(len(values) * 0.99)]:7.1f} ms, max {1000 * values[-1]:7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    print(f"{STORM_CLIENTS} UI clients reconnecting at {STORM_AT} s, "
+          f"{BACKLOG_MEASURES} measures replayed at {BACKLOG_AT} s")
+    print_waits("FIFO queue", simulate(lambda clock: Queue()))
+    print_waits("Command bus", simulate(lambda clock: CommandBus(clock=clock)))
@@ -0,0 +1,108 @@
+"""
+Feeds the command executor with the commands of indoor measure frames - SaveMeasure and EvaluateMeasure, which queues
+RegulateTemperature and AdjustReportingInterval - against a database on disk, keeping a few frames queued at all
+times. Prints out sustained commands per second and transactions committed (each of them at least one fsync) per
+frame, with every command committed on its own and with commands committed in batches.
+"""
+import logging
+import os
+import tempfile
+import threading
+from datetime import datetime
+from time import monotonic, sleep
+from typing import Dict
+from unittest.mock import Mock
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+from command_bus import CommandBus, CommandExecutor, EvaluateMeasure, SaveMeasure
+from domain_types import MeasureKind, PowerStatus
+from persistence import AbstractBase, AwayStatusRepository, NounceManager, SensorMeasure, create_database_engine
+from radio_bus import TransmitScheduler
+
+FRAMES = 1000
+QUEUED_FRAMES = 4  # frames waiting on the command bus, as if the radio kept receiving them
+
+
+def feed(command_bus: CommandBus) -> None:
+    """
+    Puts the commands of the frames on the command bus, as fast as the executor takes them
+    """
+    for index in range(FRAMES):
+        kind = MeasureKind.LIVING_ROOM if index % 2 == 0 else MeasureKind.BEDROOM
+        measure = SensorMeasure(datetime.now(), kind, 14.0 + index % 20 / 10, 40.0, 3.3)
+        command_bus.put_nowait(SaveMeasure(measure))
+        command_bus.put_nowait(EvaluateMeasure(measure))
+        while command_bus.qsize() > 2 * QUEUED_FRAMES:
+            sleep(0.0001)
+
+
+def run(database_path: str, batch_size: int) -> Dict[str, float]:
+    """
+    Runs the frames through the executor with given batch size and returns the statistics
+    """
+    db_engine = create_database_engine(database_path)
+    db_session_factory = sessionmaker(db_engine, expire_on_commit=False)
+    AbstractBase.metadata.create_all(db_engine)
+    with db_session_factory() as db_session:
+        # away mode regulates heating with the living room and bedroom measures
+        AwayStatusRepository(db_session).set_away_status(datetime.now(), PowerStatus.TURNED_ON)
+        db_session.commit()
+
+    commits = [0]
+    event.listen(db_engine, "commit", lambda _connection: commits.__setitem__(0, commits[0] + 1))
+
+    stop = threading.Event()
+    command_bus = CommandBus()
+    nounce_manager = NounceManager(db_session_factory)
+    nounce_manager.load()
+    executor = CommandExecutor(
+        db_session_factory,
+        TransmitScheduler(),
+        command_bus,
+        Mock(),
+        datetime,
+        stop,
+        nounce_manager,
+        batch_size
+    )
+    threads = [
+        threading.Thread(target=executor.run),
+        threading.Thread(target=nounce_manager.run, args=(stop,)),
+    ]
+    for thread in threads:
+        thread.start()
+
+    started_at = monotonic()
+    feed(command_bus)
+    command_bus.join()
+    elapsed = monotonic() - started_at
+
+    stop.set()
+    for thread in threads:
+        thread.join()
+    nounce_manager.close()
+
+    return {
+        "commands": executor.counters["commands"] / elapsed,
+        "frames": FRAMES / elapsed,
+        "commits": commits[0] / FRAMES,
+        "batch": executor.counters["commands"] / executor.counters["batches"],
+    }
+
+
+def print_stats(label: str, stats: Dict[str, float]) -> None:
+    """
+    Prints out the statistics of a single run
+    """
+    print(
+        f"{label:>10}: {stats['commands']:7.1f} commands/s, {stats['frames']:6.1f} frames/s, "
+        f"{stats['commits']:5.2f} commits per frame, {stats['batch']:5.2f} commands per transaction"
+    )
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    print(f"{FRAMES} indoor measure frames, {QUEUED_FRAMES} of them queued at any time")
+    with tempfile.TemporaryDirectory() as database_directory:
+        print_stats("one by one", run(os.path.join(database_directory, "single.db"), 1))
+        print_stats("batched", run(os.path.join(database_directory, "batched.db"), CommandExecutor.BATCH_SIZE))
@@ -0,0 +1,149 @@
+"""
+Simulates a busy channel shared by the controller and sensors that transmit whenever they please, and compares
+goodput with and without listen-before-talk. Runs the actual ChannelMonitor against simulated time: the controller
+hears every sensor frame from its first byte to its last one, and a controller transmission overlapping a sensor
+transmission makes both frames lost.
+"""
+import random
+from typing import List, Tuple
+from radio_bus import ChannelMonitor
+
+DURATION = 3600  # simulated seconds
+FRAME_AIRTIME = 45 * 10 / 4800  # 45 bytes at 4800 baud
+SENSORS = 5
+SENSOR_INTERVAL = 4.0  # mean seconds between frames of a single sensor
+CONTROLLER_INTERVAL = 2.0  # mean seconds between controller frames
+
+
+class SimulatedClock:
+    """
+    Clock that only moves when told to
+    """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def sensor_transmissions(rng: random.Random) -> List[Tuple[float, float]]:
+    """
+    Returns start and end times of all the sensor frames, sorted by start
+    """
+    transmissions = []
+    for _ in range(SENSORS):
+        at = rng.expovariate(1 / SENSOR_INTERVAL)
+        while at < DURATION:
+            transmissions.append((at, at + FRAME_AIRTIME))
+            at += FRAME_AIRTIME + rng.expovariate(1 / SENSOR_INTERVAL)
+
+    return sorted(transmissions)
+
+
+class SimulatedChannel:
+    """
+    Feeds the channel monitor with sensor frames as simulated time passes
+    """
+
+    def __init__(self, sensors: List[Tuple[float, float]]):
+        self.events = sorted([(start, True) for start, _ in sensors] + [(end, False) for _, end in sensors])
+        self.clock = SimulatedClock()
+        self.monitor = ChannelMonitor(clock=self.clock)
+        self.next_event = 0
+
+    def advance(self, to: float) -> None:
+        """
+        Moves the time forward, letting the monitor observe every sensor frame starting or ending meanwhile
+        """
+        while self.next_event < len(self.events) and self.events[self.next_event][0] <= to:
+            self.clock.now, in_frame = self.events[self.next_event]
+            self.monitor.observe(1, in_frame)
+            self.next_event += 1
+        self.clock.now = to
+
+    def wait_until_quiet(self) -> None:
+        """
+        Moves the time forward until the channel is quiet or the maximum deferral has passed
+        """
+        deadline = self.clock.now + self.monitor.max_deferral
+        while self.monitor.quiet_in() > 0 and self.clock.now < deadline:
+            following = self.events[self.next_event][0] if self.next_event < len(self.events) else float("inf")
+            # a nanosecond on top, so that rounding can't leave us short of the end of the guard interval
+            self.advance(min(self.clock.now + self.monitor.quiet_in() + 1e-9, following, deadline))
+
+
+def controller_transmissions(
+    rng: random.Random,
+    sensors: List[Tuple[float, float]],
+    listen_before_talk: bool
+) -> List[Tuple[float, float]]:
+    """
+    Returns start and end times of all the controller frames
+    """
+    channel = SimulatedChannel(sensors)
+    transmissions: List[Tuple[float, float]] = []
+    at = rng.expovariate(1 / CONTROLLER_INTERVAL)
+    free_at = 0.0
+    while at < DURATION:
+        channel.advance(max(at, free_at))
+        if listen_before_talk:
+            channel.wait_until_quiet()
+
+        free_at = channel.clock.now + FRAME_AIRTIME
+        transmissions.append((channel.clock.now, free_at))
+        at += rng.expovariate(1 / CONTROLLER_INTERVAL)
+
+    return transmissions
+
+
+def simulate(listen_before_talk: bool, seed: int) -> Tuple[int, int, int, int]:
+    """
+    Runs the simulation and returns delivered and total counts of sensor and controller frames
+    """
+    rng = random.Random(seed)
+    sensors = sensor_transmissions(rng)
+    controller = controller_transmissions(rng, sensors, listen_before_talk)
+
+    lost_sensors = set()
+    lost_controller = 0
+    first = 0
+    for start, end in controller:
+        while first < len(sensors) and sensors[first][1] <= start:
+            first += 1
+        collided = False
+        index = first
+        while index < len(sensors) and sensors[index][0] < end:
+            lost_sensors.add(index)
+            collided = True
+            index += 1
+        lost_controller += collided
+
+    # sensors colliding with each other are lost regardless of the controller
+    for index in range(1, len(sensors)):
+        if sensors[index][0] < sensors[index - 1][1]:
+            lost_sensors.update((index - 1, index))
+
+    return (
+        len(sensors) - len(lost_sensors),
+        len(sensors),
+        len(controller) - lost_controller,
+        len(controller),
+    )
+
+
+def report(name: str, listen_before_talk: bool) -> None:
+    """
+    Prints out goodput of the simulation
+    """
+    sensors_ok, sensors_total, controller_ok, controller_total = simulate(listen_before_talk, 2023)
+    print(
+        f"{name:>20s}: goodput {(sensors_ok + controller_ok) / DURATION * 60:6.1f} frames/min, "
+        f"sensor frames delivered {sensors_ok / sensors_total:6.1%}, "
+        f"controller frames delivered {controller_ok / controller_total:6.1%}"
+    )
+
+
+if __name__ == "__main__":
+    report("transmit right away", False)
+    report("listen before talk", True)
@@ -0,0 +1,118 @@
+"""
+Turns the air conditioner on and off over and over again, the way the command executor does it - one session and
+one commit per command - and counts the SQL statements every turn-on takes. Outbound nounces are taken either from
+the nounce row, bumped in the command's own session, or from the blocks reserved by the NounceManager. The blocks are
+reserved ahead, on load and before every command's session, as the command executor does it, so none of them is
+reserved within a command.
+"""
+from datetime import datetime, timedelta
+from queue import Queue
+from typing import Callable, Dict, List
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from devices.AirConditioner import AirConditioner
+from domain_types import DeviceKind
+from persistence import (
+    AbstractBase,
+    DevicePingRepository,
+    DeviceStatusRepository,
+    NounceManager,
+    NounceRepository,
+)
+
+CYCLES = 1000  # turn on and turn off pairs
+
+
+class Clock:
+    """
+    Simulated time source, moved forward by the benchmark
+    """
+    current = datetime(2024, 1, 1)
+
+    @classmethod
+    def now(cls) -> datetime:
+        """
+        Returns simulated current time
+        """
+        return cls.current
+
+
+class _Discard:
+    """
+    UI publisher that drops all the updates
+    """
+
+    def publish(self, message: dict) -> None:
+        """
+        Drops the update
+        """
+
+
+def run(nounces_for: Callable) -> Dict[str, float]:
+    """
+    Runs the turn on and turn off cycles against a fresh database and returns the statistics of the turn-ons. The
+    nounces_for callable returns the nounce source for a session.
+    """
+    engine = create_engine("sqlite://")
+    AbstractBase.metadata.create_all(engine)
+    session_factory = sessionmaker(engine)
+    statements: List[str] = []
+    counting = [False]
+
+    def count(_conn, _cursor, statement, *_args) -> None:
+        if counting[0]:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    outbound_bus: Queue = Queue()
+    manager = NounceManager(session_factory)
+    manager.load()
+    reserved_on_load = manager.counters["reservations"]
+
+    for _ in range(CYCLES):
+        for turn_on in (True, False):
+            Clock.current += timedelta(seconds=AirConditioner.MIN_GRACE_PERIOD + 1)
+            manager.reserve_ahead()
+            with session_factory() as session:
+                DevicePingRepository(session).create(DeviceKind.COOLING, Clock.now())
+                session.flush()
+                counting[0] = turn_on
+                device = AirConditioner(
+                    DevicePingRepository(session),
+                    DeviceStatusRepository(session),
+                    nounces_for(session, manager),
+                    Clock,
+                    _Discard(),
+                    outbound_bus,
+                )
+                if turn_on:
+                    device.turn_on()
+                else:
+                    device.turn_off()
+                session.commit()
+                counting[0] = False
+
+    nounce_statements = [s for s in statements if "nounce" in s.lower()]
+    return {
+        "statements": len(statements) / CYCLES,
+        "nounce statements": len(nounce_statements) / CYCLES,
+        "reservations": manager.counters["reservations"] - reserved_on_load,
+        "frames": outbound_bus.qsize(),
+    }
+
+
+def print_stats(label: str, stats: Dict[str, float]) -> None:
+    """
+    Prints out the statistics of a single run
+    """
+    print(
+        f"{label:>10}: {stats['statements']:5.2f} SQL statements per turn-on, "
+        f"{stats['nounce statements']:5.3f} of them on nounces, {stats['frames']:.0f} frames, "
+        f"{stats['reservations']:.0f} block reservations"
+    )
+
+
+if __name__ == "__main__":
+    print(f"{CYCLES} turn-ons and {CYCLES} turn-offs of the air conditioner")
+    print_stats("row", run(lambda session, manager: NounceRepository(session)))
+    print_stats("hi/lo", run(lambda session, manager: manager))
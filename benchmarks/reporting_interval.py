@@ -0,0 +1,78 @@
+"""
+Simulates a day of a heated bedroom whose sensor reports either at a fixed interval, or at the interval the controller
+picks with AdjustReportingInterval. Prints out frames on air, database writes and how well the temperature has been
+kept above the warm-up threshold in both cases.
+"""
+import math
+from typing import Dict
+from command_bus import AdjustReportingInterval
+from domain_types import DeviceKind, OperatingMode
+from persistence import ThresholdTemperature
+
+DURATION = 24 * 3600  # simulated seconds
+STEP = 10  # seconds of simulation step
+THRESHOLD = ThresholdTemperature(DeviceKind.HEATING, OperatingMode.DAY, 1900)
+TIME_CONSTANT = 2 * 3600  # seconds it takes the room to get most of the way to the ambient temperature
+HEATING_RATE = 3 / 3600  # degrees per second the heating adds
+
+
+def ambient(at: float) -> float:
+    """
+    Returns the temperature the room drifts towards with heating off: 18C at night, 23C in the afternoon sun
+    """
+    return 20.5 + 2.5 * math.sin(2 * math.pi * (at - 9 * 3600) / DURATION)
+
+
+def simulate(adaptive: bool) -> Dict[str, float]:
+    """
+    Runs the simulation and returns the statistics
+    """
+    temperature = 21.0
+    is_heating = False
+    interval = AdjustReportingInterval.SHORT_INTERVAL
+    sent_interval, sent_at = None, -math.inf
+    next_report = 0.0
+    stats = {"reports": 0, "downlinks": 0, "status changes": 0, "lowest": temperature}
+
+    for at in range(0, DURATION, STEP):
+        temperature += (ambient(at) - temperature) * STEP / TIME_CONSTANT
+        temperature += HEATING_RATE * STEP if is_heating else 0
+        stats["lowest"] = min(stats["lowest"], temperature)
+        if at < next_report:
+            continue
+
+        stats["reports"] += 1
+        if (not is_heating and temperature < THRESHOLD.warm_up_threshold) or \
+                (is_heating and temperature > THRESHOLD.cool_down_threshold):
+            is_heating = not is_heating
+            stats["status changes"] += 1
+
+        if adaptive:
+            interval = AdjustReportingInterval.interval_for(temperature, [THRESHOLD], is_heating)
+            if interval != sent_interval or at - sent_at >= AdjustReportingInterval.REFRESH_AFTER.total_seconds():
+                sent_interval, sent_at = interval, at
+                stats["downlinks"] += 1
+
+        next_report = at + interval
+
+    return stats
+
+
+def print_stats(label: str, stats: Dict[str, float]) -> None:
+    """
+    Prints out the statistics of a single simulation
+    """
+    frames = stats["reports"] + stats["downlinks"] + stats["status changes"]
+    # every report is a measure insert, every downlink bumps the nounce and records the interval
+    writes = stats["reports"] + 2 * stats["downlinks"] + stats["status changes"]
+    print(
+        f"{label:>10}: {stats['reports']:5.0f} reports, {stats['downlinks']:4.0f} interval downlinks, "
+        f"{frames:5.0f} frames, {writes:5.0f} DB writes, {stats['status changes']:3.0f} heating switches, "
+        f"lowest {stats['lowest']:.2f} C"
+    )
+
+
+if __name__ == "__main__":
+    print(f"One day, heating between {THRESHOLD.warm_up_threshold} C and {THRESHOLD.cool_down_threshold} C")
+    print_stats("fixed", simulate(False))
+    print_stats("adaptive", simulate(True))
@@ -0,0 +1,68 @@
+"""
+Simulates nodes sharing the channel, either transmitting whenever their reporting interval comes round (with some
+jitter, as their clocks are not synchronized with anybody), or in slots assigned by the controller's SlotSchedule
+(with some clock drift within the slot). Prints out collision rate and goodput for fleets of various sizes.
+"""
+import random
+from typing import List, Tuple
+from radio_bus import SlotSchedule
+
+DURATION = 24 * 3600  # simulated seconds
+INTERVAL = 30  # seconds between reports of every node
+FRAME_AIRTIME = 45 * 10 / 4800  # 45 bytes at 4800 baud
+JITTER = 0.1  # fraction of the interval nodes' reports drift by
+SLOT_ERROR = 0.05  # seconds a slotted node may start late by
+FLEETS = [3, 10, 30]
+
+
+def unslotted(rng: random.Random, nodes: int) -> List[float]:
+    """
+    Returns the transmission start times of nodes that transmit whenever they please
+    """
+    starts = []
+    for _ in range(nodes):
+        at = rng.uniform(0, INTERVAL)
+        while at < DURATION:
+            starts.append(at)
+            at += INTERVAL * rng.uniform(1 - JITTER, 1 + JITTER)
+
+    return starts
+
+
+def slotted(rng: random.Random, nodes: int) -> List[float]:
+    """
+    Returns the transmission start times of nodes that transmit in their slots
+    """
+    schedule = SlotSchedule({address: INTERVAL for address in range(nodes)}, epoch=0.0)
+    starts = []
+    for address in range(nodes):
+        at = schedule.next_slot_start(address, 0.0)
+        while at < DURATION:
+            starts.append(at + rng.uniform(0, SLOT_ERROR))
+            at = schedule.next_slot_start(address, at + FRAME_AIRTIME)
+
+    return starts
+
+
+def collisions(starts: List[float]) -> Tuple[int, int]:
+    """
+    Returns the number of frames that have been delivered and the number of those lost to collisions
+    """
+    starts = sorted(starts)
+    lost = set()
+    for index in range(1, len(starts)):
+        if starts[index] < starts[index - 1] + FRAME_AIRTIME:
+            lost.update((index - 1, index))
+
+    return len(starts) - len(lost), len(lost)
+
+
+if __name__ == "__main__":
+    print(f"{'nodes':>5s}  {'mode':>9s}  {'collisions':>10s}  {'goodput':>14s}")
+    for fleet in FLEETS:
+        for mode, transmissions in [("unslotted", unslotted), ("slotted", slotted)]:
+            delivered, collided = collisions(transmissions(random.Random(2023), fleet))
+            print(
+                f"{fleet:5d}  {mode:>9s}  {collided / (delivered + collided):10.2%}  "
+                f"{delivered / DURATION * 60:7.2f} frames/min"
+            )
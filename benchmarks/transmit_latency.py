@@ -0,0 +1,113 @@
+"""
+Measures how long an outbound message waits between being put on the outbound bus and being written to the serial
+port. Runs the radio controller against a fake, idle serial port that behaves like a real one in terms of read
+timeouts, and compares with the legacy single-loop behaviour, where transmitting had to wait for receiving.
+"""
+import logging
+import statistics
+import threading
+from datetime import datetime
+from queue import Empty, Queue
+from time import perf_counter, sleep
+from typing import Dict, List
+from unittest.mock import Mock
+from radio_bus import (
+    AbstractRadio,
+    OutboundMessage,
+    RadioController,
+    RadioGateway,
+    TransmitScheduler,
+    VirtualRadio,
+)
+
+MESSAGES = 20
+
+
+class FakeSerial:
+    """
+    Serial port with nothing on the air - reads block for the whole timeout and return nothing
+    """
+
+    def __init__(self):
+        self.timeout = AbstractRadio.READ_TIMEOUT
+        self.in_waiting = 0
+        self.written_at: Dict[bytes, float] = {}
+
+    def read(self, _size: int = 1) -> bytes:
+        """
+        Waits for the configured timeout, as nothing is ever received
+        """
+        sleep(self.timeout)
+        return b""
+
+    def write(self, data: bytes) -> int:
+        """
+        Records the time when given data has been written
+        """
+        self.written_at[data] = perf_counter()
+        return len(data)
+
+
+def legacy_run(controller: RadioController) -> None:
+    """
+    Receive / transmit loop as it was before receiving and transmitting were separated
+    """
+    while not controller.stop.is_set():
+        try:
+            controller.gateways[0].radio.receive()  # the legacy loop waited up to a second for the start marker
+            outbound = controller.outbound_bus.get(timeout=3)
+            controller.gateways[0].radio.send(outbound)
+        except Empty:
+            continue
+
+
+def measure(legacy: bool) -> List[float]:
+    """
+    Enqueues messages at random points of the receive cycle and returns their enqueue-to-write latencies
+    """
+    stop = threading.Event()
+    outbound_bus = TransmitScheduler()
+    gateway = RadioGateway("fake", VirtualRadio(FakeSerial()))
+    controller = RadioController([gateway], outbound_bus, Queue(), datetime, stop, Mock())
+
+    if legacy:
+        threads = [threading.Thread(target=legacy_run, args=(controller,))]
+    else:
+        threads = [
+            threading.Thread(target=controller.run_receiver, args=(gateway,)),
+            threading.Thread(target=controller.run_transmitter),
+        ]
+
+    for thread in threads:
+        thread.start()
+
+    enqueued_at: Dict[bytes, float] = {}
+    for nounce in range(MESSAGES):
+        sleep(0.37)  # not aligned with any of the timeouts
+        message = OutboundMessage(0x01, 0x30, 0x01, nounce)
+        enqueued_at[message.encoded_data] = perf_counter()
+        outbound_bus.put_nowait(message)
+
+    sleep(4)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    written_at = gateway.radio.serial.written_at
+    return [(written_at[data] - enqueued) * 1000 for data, enqueued in enqueued_at.items() if data in written_at]
+
+
+def report(name: str, latencies: List[float]) -> None:
+    """
+    Prints out latency statistics
+    """
+    print(
+        f"{name:>8s}: sent {len(latencies):d}/{MESSAGES:d}, "
+        f"median {statistics.median(latencies):8.2f} ms, max {max(latencies):8.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    report("legacy", measure(True))
+    report("duplex", measure(False))
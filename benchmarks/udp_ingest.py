@@ -0,0 +1,113 @@
+"""
+Load test of the ingest pipeline without any hardware: pushes authenticated measure frames through a UDP gateway on
+localhost and measures how many of them per second go through framing, authentication, nounce validation and
+dispatching, and how many per second the command bus then saves and evaluates.
+"""
+import logging
+import os
+import socket
+import tempfile
+import threading
+from datetime import datetime
+from struct import pack
+from time import monotonic, sleep
+from typing import Counter
+from unittest.mock import Mock
+from secrets import MY_ADDRESS
+from sqlalchemy.orm import sessionmaker
+from command_bus import CommandBus, CommandExecutor
+from domain_types import MeasureKind
+from persistence import AbstractBase, NounceManager, create_database_engine
+from radio_bus import Framing, OutboundMessage, RadioController, RateLimiter, TransmitScheduler, UdpGateway
+
+FRAMES = 5000
+BURST = 50  # frames sent back to back, before letting the controller catch up
+
+
+def send_frames(gateway: UdpGateway, counters: Counter) -> None:
+    """
+    Sends measure frames to the gateway as fast as the controller takes them in
+    """
+    sensor = MeasureKind.LIVING_ROOM.value
+    frames = [
+        OutboundMessage(sensor, MY_ADDRESS, 0x01, nounce, pack("<fff", 21.5, 40.0, 3.3)).encoded_for(Framing.COBS)
+        for nounce in range(1, FRAMES + 1)
+    ]
+
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as client:
+        for index, frame in enumerate(frames):
+            client.sendto(frame, gateway.address)
+            # the socket buffer of the gateway is finite, don't get too far ahead of it
+            while index % BURST == BURST - 1 and counters["received"] < index - BURST:
+                sleep(0.0001)
+
+
+def run(database_path: str) -> None:
+    """
+    Runs the load test against a database at given path and prints out the results
+    """
+    stop = threading.Event()
+    command_bus = CommandBus()
+    outbound_bus = TransmitScheduler()
+    db_engine = create_database_engine(database_path)
+    db_session_factory = sessionmaker(db_engine, expire_on_commit=False)
+    AbstractBase.metadata.create_all(db_engine)
+    nounce_manager = NounceManager(db_session_factory)
+    nounce_manager.load()
+
+    gateway = UdpGateway("udp", "127.0.0.1", 0)
+    # a single sensor floods the pipeline on purpose, so there are no rate limits
+    controller = RadioController(
+        [gateway],
+        outbound_bus,
+        command_bus,
+        datetime,
+        stop,
+        nounce_manager,
+        RateLimiter({})
+    )
+    executor = CommandExecutor(db_session_factory, outbound_bus, command_bus, Mock(), datetime, stop, nounce_manager)
+    threads = [
+        threading.Thread(target=controller.run_receiver, args=(gateway,)),
+        threading.Thread(target=executor.run),
+        threading.Thread(target=nounce_manager.run, args=(stop,)),
+    ]
+
+    for thread in threads:
+        thread.start()
+
+    started_at = monotonic()
+    send_frames(gateway, controller.validator.counters)
+
+    while controller.validator.counters["received"] < FRAMES and monotonic() - started_at < 60:
+        sleep(0.001)
+    ingested_in = monotonic() - started_at
+
+    command_bus.join()
+    processed_in = monotonic() - started_at
+
+    stop.set()
+    for thread in threads:
+        thread.join()
+    nounce_manager.close()
+    gateway.close()
+
+    print_results(controller, nounce_manager, ingested_in, processed_in)
+
+
+def print_results(controller: RadioController, nounce_manager: NounceManager, ingested_in: float, processed_in: float):
+    """
+    Prints out the results of the load test
+    """
+    counters = controller.validator.counters
+    print(", ".join(f"{stage:s}: {count:d}" for stage, count in sorted(counters.items())))
+    print(f"Ingest: {counters['accepted'] / ingested_in:8.1f} frames/s (authenticated, nounce validated, dispatched)")
+    print(f"Commands: {counters['accepted'] / processed_in:6.1f} frames/s (measures saved and evaluated)")
+    print(f"Nounces written down {nounce_manager.counters['flushes']:d} times")
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    # Radio and command threads need their own connections to the same database, keep it in RAM-backed storage
+    with tempfile.TemporaryDirectory(dir="/dev/shm" if os.path.isdir("/dev/shm") else None) as database_directory:
+        run(os.path.join(database_directory, "udp_ingest.db"))
@@ -0,0 +1,124 @@
+"""
+Puts the commands of indoor measure frames on the command bus, one frame every 10 ms, while 20 UI clients reconnect
+and every one of their display initializations takes a while, and runs them through a single worker and through a pool
+of workers against a database on disk. Prints out how long the critical (regulation) and the background (UI) commands
+have waited on the command bus.
+"""
+import logging
+import os
+import tempfile
+import threading
+from datetime import datetime
+from time import monotonic, sleep
+from typing import Any, Dict, List
+from sqlalchemy.orm import sessionmaker
+from command_bus import CommandBus, CommandExecutor, CommandPriority, EvaluateMeasure, InitializeDisplay, SaveMeasure
+from domain_types import MeasureKind, PowerStatus
+from persistence import AbstractBase, AwayStatusRepository, NounceManager, SensorMeasure, create_database_engine
+from radio_bus import TransmitScheduler
+
+FRAMES = 200
+FRAME_INTERVAL = 0.01  # seconds
+CLIENTS = 20
+SEND_DELAY = 0.02  # seconds a display initialization takes per message
+
+
+class SlowPublisher:
+    """
+    Publisher that holds the display initialization up while it sends the messages, as if it was a long one
+    """
+
+    def publish(self, message: dict) -> None:
+        """
+        Discards the message
+        """
+
+    def send(self, _websocket: Any, messages: List[dict]) -> None:
+        """
+        Takes a while to send the messages
+        """
+        sleep(SEND_DELAY * len(messages))
+
+
+def feed(command_bus: CommandBus) -> None:
+    """
+    Puts the display initializations and the commands of the frames on the command bus
+    """
+    for _ in range(CLIENTS):
+        command_bus.put_nowait(InitializeDisplay(object()))
+
+    for index in range(FRAMES):
+        kind = MeasureKind.LIVING_ROOM if index % 2 == 0 else MeasureKind.BEDROOM
+        measure = SensorMeasure(datetime.now(), kind, 14.0 + index % 20 / 10, 40.0, 3.3)
+        command_bus.put_nowait(SaveMeasure(measure))
+        command_bus.put_nowait(EvaluateMeasure(measure))
+        sleep(FRAME_INTERVAL)
+
+
+def run(database_path: str, workers: int) -> Dict[CommandPriority, List[int]]:
+    """
+    Runs the commands through given number of workers, returns the queue wait histogram and prints the elapsed time
+    """
+    db_engine = create_database_engine(database_path)
+    db_session_factory = sessionmaker(db_engine, expire_on_commit=False)
+    AbstractBase.metadata.create_all(db_engine)
+    with db_session_factory() as db_session:
+        # away mode regulates heating with the living room and bedroom measures
+        AwayStatusRepository(db_session).set_away_status(datetime.now(), PowerStatus.TURNED_ON)
+        db_session.commit()
+
+    stop = threading.Event()
+    command_bus = CommandBus()
+    nounce_manager = NounceManager(db_session_factory)
+    nounce_manager.load()
+    executor = CommandExecutor(
+        db_session_factory,
+        TransmitScheduler(),
+        command_bus,
+        SlowPublisher(),
+        datetime,
+        stop,
+        nounce_manager,
+        workers=workers
+    )
+    threads = [
+        threading.Thread(target=executor.run),
+        threading.Thread(target=nounce_manager.run, args=(stop,)),
+    ]
+    for thread in threads:
+        thread.start()
+
+    started_at = monotonic()
+    feed(command_bus)
+    command_bus.join()
+    print(f"{workers:2d} worker(s): all commands executed in {monotonic() - started_at:.2f} s")
+
+    stop.set()
+    for _ in range(workers):
+        # wake the idle workers up, so they notice they've been stopped
+        command_bus.put_nowait(None)
+    for thread in threads:
+        thread.join()
+    nounce_manager.close()
+
+    return command_bus.wait_histogram()
+
+
+def print_waits(histogram: Dict[CommandPriority, List[int]]) -> None:
+    """
+    Prints out the queue wait histogram of the critical and background commands
+    """
+    buckets = [f"<={bound * 1000:g}ms" for bound in CommandBus.WAIT_BUCKETS] + [">10000ms"]
+    for priority in (CommandPriority.CRITICAL, CommandPriority.BACKGROUND):
+        print(
+            f"{priority.name:>14}: " +
+            ", ".join(f"{bucket:s} {count:d}" for bucket, count in zip(buckets, histogram[priority]) if count)
+        )
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    print(f"{FRAMES} frames, one every {FRAME_INTERVAL * 1000:g} ms, {CLIENTS} UI clients reconnecting")
+    with tempfile.TemporaryDirectory() as database_directory:
+        print_waits(run(os.path.join(database_directory, "single.db"), 1))
+        print_waits(run(os.path.join(database_directory, "pool.db"), 4))
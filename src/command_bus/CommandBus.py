@@ -0,0 +1,255 @@
+from bisect import bisect_left
+from collections import Counter, deque
+from heapq import heappop, heappush
+from itertools import count
+from queue import Empty, Queue
+from time import monotonic
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Tuple
+from .CommandPriority import CommandPriority
+
+
+class CommandBus(Queue):
+    """
+    Command queue that hands out critical commands before the normal ones, and the normal ones before the background
+    ones, in the order they have been queued within each priority class. Commands that have been waiting get promoted
+    by one class every aging interval, so a steady stream of critical commands never starves the rest. Keeps
+    a histogram of how long the commands have been waiting, per priority class.
+
+    A command with a coalescing key replaces the queued command of the same class and key, if there is one - so only
+    the latest version of the work gets executed. The replacement is queued at the end, after the commands queued
+    after the one it replaces, but it ages as if it had been queued when the replaced one was.
+
+    Commands of the same partition (e.g. of the same device) are handed out in the order they have been queued,
+    whatever their priority class: only the oldest queued command of a partition may be handed out, priority classes
+    and aging only decide between the partitions. Workers executing commands in parallel claim them, so that commands
+    of the same partition are never executed by two workers at once: a command is only handed out to the worker that
+    has claimed its partition already, or once the partition has been released.
+    """
+
+    AGING_INTERVAL = 2.0  # seconds
+    """
+    How long a command has to wait to be promoted by one priority class
+    """
+
+    WAIT_BUCKETS = (0.001, 0.01, 0.1, 1.0, 10.0)  # seconds
+    """
+    Upper bounds of the queue wait histogram buckets, the last bucket has no upper bound
+    """
+
+    def __init__(self, aging_interval: float = AGING_INTERVAL, clock: Callable[[], float] = monotonic):
+        """
+        :param aging_interval: How long a command has to wait to be promoted by one priority class, in seconds
+        :param clock: Source of monotonic time, in seconds
+        """
+        self.aging_interval = aging_interval
+        self.clock = clock
+        self.counters: Counter = Counter()
+        self.coalesced: Counter = Counter()
+        # called whenever something is queued, e.g. to wake up an event loop waiting for it
+        self.on_put: Optional[Callable[[], Any]] = None
+        super().__init__()
+
+    # pylint: disable=W0201
+    def _init(self, maxsize: int) -> None:
+        """
+        Initializes the underlying storage, called by the Queue constructor
+        """
+        # [queued at, command, coalescing key, sequence number, partition, whether it's still queued]
+        # Only the commands that may be handed out (oldest of their partition, or of no partition) are ready, the rest
+        # waits in their partition. Replaced commands are only marked as no longer queued, and skipped once reached.
+        self.__ready: Dict[CommandPriority, List[Tuple[int, List[Any]]]] = {
+            priority: [] for priority in CommandPriority
+        }
+        self.__partitions: Dict[Hashable, Deque[List[Any]]] = {}
+        self.__size = 0
+        self.__sequence = count()
+        self.__keyed: Dict[Tuple[type, Hashable], List[Any]] = {}
+        self.__claims: Dict[Hashable, Hashable] = {}  # partition: claimant
+        self.__waits: Dict[CommandPriority, List[int]] = {
+            priority: [0] * (len(self.WAIT_BUCKETS) + 1) for priority in CommandPriority
+        }
+
+    def _qsize(self) -> int:
+        """
+        Returns the number of queued commands, of all priority classes
+        """
+        return self.__size
+
+    def _put(self, item: Any) -> None:
+        """
+        Queues given command in its priority class, replacing the queued command it coalesces with
+        """
+        key = self.coalescing_key_of(item)
+        queued_at = self.clock()
+        replaced = self.__keyed.get(key) if key is not None else None
+        if replaced is not None:
+            self.__remove(replaced)
+            queued_at = replaced[0]
+            # the replaced command will never be taken off the queue, Queue.put counts it nevertheless
+            self.unfinished_tasks -= 1
+            self.counters["coalesced"] += 1
+            self.coalesced[type(item).__name__] += 1
+        else:
+            self.counters["queued"] += 1
+
+        entry = [queued_at, item, key, next(self.__sequence), self.partition_key_of(item), True]
+        self.__size += 1
+        if entry[4] is None:
+            self.__make_ready(entry)
+        elif entry[4] in self.__partitions:
+            self.__partitions[entry[4]].append(entry)
+        else:
+            self.__partitions[entry[4]] = deque((entry,))
+            self.__make_ready(entry)
+        if key is not None:
+            self.__keyed[key] = entry
+        # Queue.put wakes up a single worker, which may not be the one free to take the command
+        self.not_empty.notify_all()
+        if self.on_put is not None:
+            self.on_put()
+
+    def _get(self) -> Any:
+        """
+        Takes the oldest command of the class with the highest priority, taking aging into account
+        """
+        entry = self.__take(lambda item: True)
+        if entry is None:
+            raise Empty
+
+        return entry[1]
+
+    def claim(
+        self,
+        claimant: Hashable,
+        accept: Optional[Callable[[Any], bool]] = None,
+        block: bool = True,
+        timeout: Optional[float] = None
+    ) -> Any:
+        """
+        Removes and returns the next command that given claimant may execute, waiting for one if necessary, and claims
+        the partition of the command for the claimant until it's released
+        :param claimant: Worker claiming the command
+        :param accept: Only the commands it accepts are claimed, if given
+        :param block: Whether to wait for a command
+        :param timeout: How long to wait for a command, in seconds
+        """
+        def is_eligible(item: Any) -> bool:
+            partition = self.partition_key_of(item)
+            return (
+                (partition is None or self.__claims.get(partition, claimant) == claimant) and
+                (accept is None or accept(item))
+            )
+
+        deadline = None if timeout is None else monotonic() + timeout
+        with self.not_empty:
+            while True:
+                entry = self.__take(is_eligible)
+                if entry is not None:
+                    break
+                if not block or (deadline is not None and deadline <= monotonic()):
+                    raise Empty
+                self.not_empty.wait(None if deadline is None else deadline - monotonic())
+
+            if entry[4] is not None:
+                self.__claims[entry[4]] = claimant
+            self.not_full.notify()
+
+            return entry[1]
+
+    def release(self, claimant: Hashable) -> None:
+        """
+        Releases all the partitions given claimant has claimed
+        """
+        with self.not_empty:
+            self.__claims = {partition: owner for partition, owner in self.__claims.items() if owner != claimant}
+            self.not_empty.notify_all()
+
+    def wait_histogram(self) -> Dict[CommandPriority, List[int]]:
+        """
+        Returns how many commands of each priority class have waited up to each of the WAIT_BUCKETS, and longer
+        """
+        with self.mutex:
+            return {priority: list(waits) for priority, waits in self.__waits.items()}
+
+    @staticmethod
+    def priority_of(item: Any) -> CommandPriority:
+        """
+        Returns the priority class of given command, anything that doesn't declare one is a normal one
+        """
+        return getattr(item, "PRIORITY", CommandPriority.NORMAL)
+
+    @staticmethod
+    def partition_key_of(item: Any) -> Optional[Hashable]:
+        """
+        Returns the partition of given command, or None if it may be executed in parallel with any other command
+        """
+        partition_key = getattr(item, "partition_key", None)
+        return partition_key() if partition_key is not None else None
+
+    @staticmethod
+    def coalescing_key_of(item: Any) -> Optional[Tuple[type, Hashable]]:
+        """
+        Returns the key of given command that is unique among the commands it coalesces with, or None if it never
+        coalesces with any
+        """
+        coalescing_key = getattr(item, "coalescing_key", None)
+        key = coalescing_key() if coalescing_key is not None else None
+
+        return None if key is None else (type(item), key)
+
+    def __take(self, is_eligible: Callable[[Any], bool]) -> Optional[List[Any]]:
+        """
+        Removes and returns the entry of the oldest eligible command of the class with the highest priority, taking
+        aging into account, or None if there are no eligible commands. Only the oldest queued command of a partition
+        is eligible. The mutex needs to be held.
+        """
+        now = self.clock()
+        candidates = []
+        skipped = []  # ready, but not eligible commands, put back once the command to take is known
+        for priority, ready in self.__ready.items():
+            while ready and not (ready[0][1][5] and is_eligible(ready[0][1][1])):
+                if ready[0][1][5]:
+                    skipped.append((priority, ready[0]))
+                heappop(ready)
+            if ready:
+                rank = priority - (now - ready[0][1][0]) / self.aging_interval
+                candidates.append((rank, priority.value, priority))
+
+        entry = None
+        if candidates:
+            _, _, priority = min(candidates)
+            _, entry = heappop(self.__ready[priority])
+            self.__remove(entry)
+            self.__waits[priority][bisect_left(self.WAIT_BUCKETS, now - entry[0])] += 1
+
+        for priority, ready_entry in skipped:
+            heappush(self.__ready[priority], ready_entry)
+
+        return entry
+
+    def __remove(self, entry: List[Any]) -> None:
+        """
+        Marks given entry as no longer queued, and makes the next command of its partition ready if it was the oldest
+        one. The mutex needs to be held.
+        """
+        entry[5] = False
+        self.__size -= 1
+        if entry[2] is not None:
+            del self.__keyed[entry[2]]
+
+        partition = self.__partitions.get(entry[4]) if entry[4] is not None else None
+        if partition is None or partition[0] is not entry:
+            return
+
+        while partition and not partition[0][5]:
+            partition.popleft()
+        if partition:
+            self.__make_ready(partition[0])
+        else:
+            del self.__partitions[entry[4]]
+
+    def __make_ready(self, entry: List[Any]) -> None:
+        """
+        Makes given entry one of those that may be handed out, in the order the commands have been queued
+        """
+        heappush(self.__ready[self.priority_of(entry[1])], (entry[3], entry))
@@ -1,12 +1,17 @@
 import logging
 import traceback
+from collections import Counter
 from datetime import datetime
-from queue import Empty, Queue
-from threading import Event
-from typing import Type
+from queue import Empty
+from threading import Event, Lock, Thread
+from time import monotonic
+from typing import Any, Hashable, Type
 from sqlalchemy.orm import sessionmaker, Session
+from persistence import NounceManager, begin_read_only
+from radio_bus.TransmitScheduler import TransmitScheduler
 from ui.UiPublisher import UiPublisher
 from .commands.AbstractCommand import AbstractCommand
+from .CommandBus import CommandBus
 from .ExecutionContext import ExecutionContext
 
 
@@ -14,45 +19,192 @@ class CommandExecutor:
     """
     Fetches commands from the queue and executes them with given context. Is meant to run in a
     thread.
+
+    Commands are executed in batches: whatever is ready (up to the batch size, waiting no longer than the batch
+    window after the first command) is executed in a single transaction, committed once. Every command is executed
+    in its own savepoint, so a failing command rolls back only what it has done itself.
+
+    Several workers may execute the commands in parallel, each with its own transaction. Commands of the same partition
+    (e.g. of the same device) are never executed by two workers at once, so their order is kept. Transactions that
+    write queue up for the write lock of the database, the ones that only read don't wait for anything.
+    """
+
+    BATCH_SIZE = 16
+    """
+    Maximum number of commands committed in a single transaction
+    """
+
+    BATCH_WINDOW = 0.02  # seconds
+    """
+    How long after the first command of a batch further commands are waited for
+    """
+
+    WORKERS = 1
+    """
+    Default number of workers executing commands in parallel
+    """
+
+    STATISTICS_INTERVAL = 900  # seconds
+    """
+    How often the command bus statistics are logged
     """
 
     def __init__(
         self,
         db_session_factory: sessionmaker[Session],  # pylint: disable=E1136
-        outbound_bus: Queue,
-        command_bus: Queue,
+        outbound_bus: TransmitScheduler,
+        command_bus: CommandBus,
         publisher: UiPublisher,
         time_source: Type[datetime],
-        stop: Event
+        stop: Event,
+        nounce_manager: NounceManager,
+        batch_size: int = BATCH_SIZE,
+        batch_window: float = BATCH_WINDOW,
+        workers: int = WORKERS
     ):
+        """
+        :param batch_size: Maximum number of commands committed in a single transaction, 1 commits every command
+        :param batch_window: How long to wait for further commands of a batch, in seconds
+        :param workers: Number of workers executing commands in parallel
+        """
         self.db_session_factory = db_session_factory
         self.outbound_bus = outbound_bus
         self.command_bus = command_bus
         self.publisher = publisher
         self.time_source = time_source
         self.stop = stop
+        self.nounce_manager = nounce_manager
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.workers = workers
+        self.counters: Counter = Counter()
+        self.__counters_lock = Lock()
+        self.__next_statistics = monotonic() + self.STATISTICS_INTERVAL
 
     def run(self) -> None:
         """
-        Runs the main loop that waits for command to appear on command queue and executes them.
+        Runs the main loop that waits for command to appear on command queue and executes them. With several workers,
+        the other workers are run in their own threads.
+        """
+        threads = [Thread(target=self.__work, args=(worker,)) for worker in range(1, self.workers)]
+        for thread in threads:
+            thread.start()
+
+        self.__work(0)
+        for thread in threads:
+            thread.join()
+
+    def execute_batch(self, command: Any, worker: Hashable = 0) -> None:
+        """
+        Executes given command, and whatever commands given worker may claim within the batch window, in a single
+        transaction. Commands that only read are only batched with each other.
+        """
+        claimed, executed = 1, 0
+        deadline = monotonic() + self.batch_window
+        reads_only = self.reads_only(command)
+        try:
+            # nounces can't be reserved within the transaction, it locks the database against the reservation
+            self.nounce_manager.reserve_ahead()
+        except Exception:
+            # the nounces will be reserved right away if they run out, the batch is executed anyway
+            logging.error(traceback.format_exc())
+
+        try:
+            with self.db_session_factory() as db_session:
+                if reads_only:
+                    begin_read_only(db_session)
+
+                context = ExecutionContext(
+                    db_session,
+                    self.outbound_bus,
+                    self.command_bus,
+                    self.publisher,
+                    datetime,
+                    self.nounce_manager,
+                )
+                while True:
+                    executed += 1
+                    self.__execute(command, db_session, context)
+                    if executed >= self.batch_size:
+                        break
+
+                    try:
+                        command = self.command_bus.claim(
+                            worker,
+                            lambda item: self.reads_only(item) == reads_only,
+                            timeout=max(0.0, deadline - monotonic())
+                        )
+                    except Empty:
+                        break
+                    claimed += 1
+
+                db_session.commit()
+        except Exception:
+            logging.error(traceback.format_exc())
+        finally:
+            # the next commands of the partitions may only be executed once these ones have been committed
+            self.command_bus.release(worker)
+            with self.__counters_lock:
+                self.counters["batches"] += 1
+                self.counters["commands"] += executed
+            # every claimed command is done, whether it has been executed or not
+            for _ in range(claimed):
+                self.command_bus.task_done()
+
+    @staticmethod
+    def reads_only(command: Any) -> bool:
+        """
+        Checks whether given command only reads from the database
+        """
+        return getattr(command, "READS_ONLY", False)
+
+    def __work(self, worker: int) -> None:
+        """
+        Runs the loop of given worker, claiming commands from the command bus and executing them
         """
         while not self.stop.is_set():
+            if worker == 0 and monotonic() >= self.__next_statistics:
+                self.__next_statistics += self.STATISTICS_INTERVAL
+                self.log_statistics()
+
             try:
-                command = self.command_bus.get(timeout=5)
-                if isinstance(command, AbstractCommand):
-                    with self.db_session_factory() as db_session:
-                        command.execute(
-                            ExecutionContext(
-                                db_session,
-                                self.outbound_bus,
-                                self.command_bus,
-                                self.publisher,
-                                datetime,
-                            )
-                        )
-                        db_session.commit()
-                    self.command_bus.task_done()
+                command = self.command_bus.claim(worker, timeout=5)
             except Empty:
                 continue
-            except Exception:
-                logging.error(traceback.format_exc())
+
+            self.execute_batch(command, worker)
+
+    def __execute(self, command: Any, db_session: Session, context: ExecutionContext) -> None:
+        """
+        Executes given command in a savepoint, that is rolled back if the command fails
+        """
+        if not isinstance(command, AbstractCommand):
+            return
+
+        try:
+            with db_session.begin_nested():
+                command.execute(context)
+        except Exception:
+            with self.__counters_lock:
+                self.counters["failed"] += 1
+            logging.error(traceback.format_exc())
+
+    def log_statistics(self) -> None:
+        """
+        Logs how many commands have been executed and coalesced, and how long the commands of each priority class
+        have been waiting on the command bus
+        """
+        logging.info(
+            "Commands: %s; executed: %s; coalesced: %s",
+            ", ".join(f"{name:s}={count:d}" for name, count in sorted(self.command_bus.counters.items())),
+            ", ".join(f"{name:s}={count:d}" for name, count in sorted(self.counters.items())),
+            ", ".join(f"{name:s}={count:d}" for name, count in sorted(self.command_bus.coalesced.items()))
+        )
+        buckets = [f"<={bound * 1000:g}ms" for bound in CommandBus.WAIT_BUCKETS]
+        buckets.append(f">{CommandBus.WAIT_BUCKETS[-1] * 1000:g}ms")
+        for priority, waits in self.command_bus.wait_histogram().items():
+            logging.info(
+                "Command waits, %s: %s",
+                priority.name,
+                ", ".join(f"{bucket:s}={count:d}" for bucket, count in zip(buckets, waits))
+            )
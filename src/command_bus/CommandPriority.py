@@ -0,0 +1,10 @@
+from enum import IntEnum
+
+
+class CommandPriority(IntEnum):
+    """
+    Priority classes of commands, the lower ones are executed first
+    """
+    CRITICAL = 0  # regulation of the devices and nounce requests
+    NORMAL = 1  # persistence of what's been received, sensor and radio housekeeping
+    BACKGROUND = 2  # UI clients
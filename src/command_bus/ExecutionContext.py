@@ -2,6 +2,8 @@ from datetime import datetime
 from queue import Queue
 from typing import Type
 from sqlalchemy.orm import Session
+from persistence import NounceManager
+from radio_bus.TransmitScheduler import TransmitScheduler
 from ui.UiPublisher import UiPublisher
 
 
@@ -13,13 +15,15 @@ class ExecutionContext:
     def __init__(
         self,
         db_session: Session,
-        outbound_bus: Queue,
+        outbound_bus: TransmitScheduler,
         command_bus: Queue,
         publisher: UiPublisher,
-        time_source: Type[datetime]
+        time_source: Type[datetime],
+        nounce_manager: NounceManager
     ):
         self.db_session = db_session
         self.outbound_bus = outbound_bus
         self.command_queue = command_bus
         self.publisher = publisher
         self.time_source = time_source
+        self.nounce_manager = nounce_manager
@@ -1,10 +1,15 @@
+from .CommandBus import CommandBus
 from .CommandExecutor import CommandExecutor
+from .CommandPriority import CommandPriority
 from .commands.EvaluateMeasure import EvaluateMeasure
 from .commands.EvaluateDevice import EvaluateDevice
 from .commands.SaveMeasure import SaveMeasure
+from .commands.SaveMeasures import SaveMeasures
 from .commands.SavePing import SavePing
 from .commands.AbstractCommand import AbstractCommand
 from .commands.InitializeDisplay import InitializeDisplay
 from .commands.UpdateConfiguration import UpdateConfiguration
 from .commands.RecordDeviceStatus import RecordDeviceStatus
 from .commands.RespondNounceRequest import RespondNounceRequest
+from .commands.AssignTransmitSlot import AssignTransmitSlot
+from .commands.AdjustReportingInterval import AdjustReportingInterval
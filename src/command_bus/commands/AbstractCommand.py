@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+from typing import Hashable, Optional
+from ..CommandPriority import CommandPriority
 from ..ExecutionContext import ExecutionContext
 
 
@@ -6,8 +8,33 @@ class AbstractCommand(ABC):
     """
     Defines interface for commands that can be handled by CommandExecutor
     """
+    PRIORITY = CommandPriority.NORMAL
+    """
+    Priority class of the command on the command bus
+    """
+
+    READS_ONLY = False
+    """
+    Whether the command only reads from the database, so it doesn't need to hold the write lock
+    """
+
     @abstractmethod
     def execute(self, context: ExecutionContext) -> None:
         """
         Executes the command
         """
+
+    def coalescing_key(self) -> Optional[Hashable]:
+        """
+        Returns the key under which a queued command of the same class is made pointless by this one, so it can be
+        replaced with this one on the command bus. None means the command never replaces another one.
+        """
+        return None
+
+    def partition_key(self) -> Optional[Hashable]:
+        """
+        Returns the partition of the command (e.g. the device it's about), commands of the same partition are executed
+        one after another, in the order they've been taken off the command bus. None means the command may be executed
+        in parallel with any other one.
+        """
+        return None
@@ -0,0 +1,102 @@
+import logging
+from datetime import timedelta
+from struct import pack
+from typing import Hashable, Iterable, List, Optional, Tuple
+from secrets import MY_ADDRESS
+from domain_types import DeviceKind, PowerStatus
+from persistence import (
+    DeviceStatusRepository,
+    ReportingIntervalRepository,
+    SensorMeasure,
+    ThresholdTemperature,
+)
+from radio_bus import OutboundMessage, SlotSchedule
+from .AbstractCommand import AbstractCommand
+from ..ExecutionContext import ExecutionContext
+
+
+class AdjustReportingInterval(AbstractCommand):
+    """
+    A command that tells the sensor how often to report: often when the temperature is close to any of the thresholds
+    or a device regulated by the sensor is running, rarely when the temperature is in the dead band. The interval is
+    only sent when it changes (or has not been refreshed for a while, in case the previous one got lost).
+    """
+    # all intervals are multiples of the slot cycle, so the sensor keeps to its transmit slot
+    SHORT_INTERVAL = SlotSchedule.REPORTING_INTERVAL
+    MEDIUM_INTERVAL = 3 * SlotSchedule.REPORTING_INTERVAL
+    LONG_INTERVAL = 10 * SlotSchedule.REPORTING_INTERVAL
+    # distance (in degrees) from the nearest threshold within which the sensor reports often / not rarely
+    NEAR_THRESHOLD = 0.5
+    FAR_FROM_THRESHOLD = 1.5
+    REFRESH_AFTER = timedelta(hours=1)
+
+    def __init__(self, measure: SensorMeasure, regulations: List[Tuple[DeviceKind, ThresholdTemperature]]):
+        self.measure = measure
+        self.regulations = regulations
+
+    def execute(self, context: ExecutionContext) -> None:
+        """
+        Execute the command
+        """
+        device_status_repository = DeviceStatusRepository(context.db_session)
+        is_running = any(
+            device_status_repository.get_current_status(device_kind) == PowerStatus.TURNED_ON
+            for (device_kind, _) in self.regulations
+        )
+
+        interval = self.interval_for(
+            self.measure.temperature,
+            (threshold_temperature for (_, threshold_temperature) in self.regulations),
+            is_running
+        )
+
+        interval_repository = ReportingIntervalRepository(context.db_session)
+        now = context.time_source.now()
+        last_sent = interval_repository.get_reporting_interval(self.measure.kind)
+        if last_sent is not None and last_sent.interval == interval and now - last_sent.timestamp < self.REFRESH_AFTER:
+            return
+
+        logging.info("Setting reporting interval of %s to %d s", self.measure.kind.name, interval)
+
+        address = self.measure.kind.value
+        outbound_nounce = context.nounce_manager.next_outbound_nounce(address)
+        context.outbound_bus.put_nowait(
+            OutboundMessage(MY_ADDRESS, address, 0x04, outbound_nounce, pack("<H", interval))
+        )
+        interval_repository.set_reporting_interval(self.measure.kind, interval, now)
+
+    def coalescing_key(self) -> Optional[Hashable]:
+        """
+        Only the interval picked for the newest measure of the sensor is worth sending
+        """
+        return self.measure.kind
+
+    @classmethod
+    def interval_for(cls, temperature: float, thresholds: Iterable[ThresholdTemperature], is_running: bool) -> int:
+        """
+        Returns the reporting interval (in seconds) for the sensor that measured given temperature
+        """
+        if is_running:
+            return cls.SHORT_INTERVAL
+
+        distance = min(
+            (
+                min(abs(temperature - threshold.warm_up_threshold), abs(temperature - threshold.cool_down_threshold))
+                for threshold in thresholds
+            ),
+            default=None
+        )
+
+        if distance is None or distance >= cls.FAR_FROM_THRESHOLD:
+            return cls.LONG_INTERVAL
+
+        if distance >= cls.NEAR_THRESHOLD:
+            return cls.MEDIUM_INTERVAL
+
+        return cls.SHORT_INTERVAL
+
+    def partition_key(self) -> Optional[Hashable]:
+        """
+        Measures of the sensor are executed in order
+        """
+        return self.measure.kind
@@ -0,0 +1,55 @@
+import logging
+from struct import pack
+from time import monotonic
+from typing import Hashable, Optional
+from secrets import MY_ADDRESS
+from radio_bus import OutboundMessage, SlotSchedule
+from .AbstractCommand import AbstractCommand
+from ..ExecutionContext import ExecutionContext
+
+
+class AssignTransmitSlot(AbstractCommand):
+    """
+    Command that tells a node when to transmit: in how many milliseconds its next slot starts, how often (in seconds)
+    the slot repeats for the node and how long (in milliseconds) it is
+    """
+
+    def __init__(self, address: int, schedule: SlotSchedule):
+        self.address = address
+        self.schedule = schedule
+
+    def execute(self, context: ExecutionContext) -> None:
+        """
+        Execute the command
+        """
+        slot = self.schedule.slot_of(self.address)
+        if slot is None:
+            return
+
+        outbound_nounce = context.nounce_manager.next_outbound_nounce(self.address)
+        now = monotonic()
+        delay = self.schedule.next_slot_start(self.address, now) - now
+
+        logging.info(
+            "Assigning slot to %#x: next in %.3f s, every %d s, %.3f s long",
+            self.address,
+            delay,
+            slot.interval,
+            slot.length
+        )
+
+        context.outbound_bus.put_nowait(
+            OutboundMessage(
+                MY_ADDRESS,
+                self.address,
+                0x03,
+                outbound_nounce,
+                pack("<LHH", round(delay * 1000), slot.interval, round(slot.length * 1000))
+            )
+        )
+
+    def partition_key(self) -> Optional[Hashable]:
+        """
+        Slot assignments of the node are executed in order
+        """
+        return self.address
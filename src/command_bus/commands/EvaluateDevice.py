@@ -1,10 +1,11 @@
 import logging
 from datetime import timedelta
-from typing import List, Tuple
+from typing import Hashable, List, Optional, Tuple
 from domain_types import DeviceKind
 from persistence import SensorMeasure, TemperatureRegulationRepository, SensorMeasureRepository, ThresholdTemperature
 from .AbstractCommand import AbstractCommand
 from .RegulateTemperature import RegulateTemperature
+from ..CommandPriority import CommandPriority
 from ..ExecutionContext import ExecutionContext
 
 
@@ -12,6 +13,7 @@ class EvaluateDevice(AbstractCommand):
     """
     A command that queues device evaluation for all measures that are controlling given device
     """
+    PRIORITY = CommandPriority.CRITICAL
 
     def __init__(self, kind: DeviceKind):
         self.kind = kind
@@ -28,14 +30,14 @@ class EvaluateDevice(AbstractCommand):
 
         if len(regulations) == 0:
             # This device is currently not regulated. Make sure it is switched off.
-            from persistence import DevicePingRepository, DeviceStatusRepository, NounceRepository
+            from persistence import DevicePingRepository, DeviceStatusRepository
             from devices import get_device_for_kind
 
             device = get_device_for_kind(
                 self.kind,
                 DevicePingRepository(context.db_session),
                 DeviceStatusRepository(context.db_session),
-                NounceRepository(context.db_session),
+                context.nounce_manager,
                 context.time_source,
                 context.publisher,
                 context.outbound_bus
@@ -67,3 +69,15 @@ class EvaluateDevice(AbstractCommand):
             context.command_queue.put_nowait(
                 RegulateTemperature(self.kind, measure, threshold_temperature)
             )
+
+    def coalescing_key(self) -> Optional[Hashable]:
+        """
+        Evaluation of the device that is still waiting covers any further evaluation of it
+        """
+        return self.kind
+
+    def partition_key(self) -> Optional[Hashable]:
+        """
+        Commands of the device are executed in order
+        """
+        return self.kind
@@ -1,8 +1,11 @@
 from datetime import timedelta
+from typing import Hashable, Optional
 from domain_types import DeviceKind
 from persistence import DeviceControlRepository, SensorMeasure, SensorMeasureRepository, TemperatureRegulationRepository
 from .AbstractCommand import AbstractCommand
+from .AdjustReportingInterval import AdjustReportingInterval
 from .RegulateTemperature import RegulateTemperature
+from ..CommandPriority import CommandPriority
 from ..ExecutionContext import ExecutionContext
 
 
@@ -10,6 +13,7 @@ class EvaluateMeasure(AbstractCommand):
     """
     A command that queues device evaluation for any device controlled by given measure
     """
+    PRIORITY = CommandPriority.CRITICAL
 
     def __init__(self, measure: SensorMeasure):
         self.measure = measure
@@ -30,6 +34,14 @@ class EvaluateMeasure(AbstractCommand):
                     RegulateTemperature(device_kind, self.measure, threshold_temperature)
                 )
 
+        context.command_queue.put_nowait(AdjustReportingInterval(self.measure, regulations))
+
+    def coalescing_key(self) -> Optional[Hashable]:
+        """
+        Only the newest measure of the sensor is worth evaluating
+        """
+        return self.measure.kind
+
     def has_lower_measure_from_other_sensors(self, context: ExecutionContext, device_kind: DeviceKind):
         """
         Checks whether there are any recent measures from sensor other than then one which sources currently evaluated
@@ -54,3 +66,9 @@ class EvaluateMeasure(AbstractCommand):
                 return True
 
         return False
+
+    def partition_key(self) -> Optional[Hashable]:
+        """
+        Measures of the sensor are executed in order
+        """
+        return self.measure.kind
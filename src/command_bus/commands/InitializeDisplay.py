@@ -1,5 +1,4 @@
-import asyncio
-import json
+from typing import Hashable, List, Optional
 from websockets.legacy.protocol import WebSocketCommonProtocol
 from persistence import (
     AwayStatusRepository, SensorMeasureRepository, DevicePingRepository, ThresholdTemperatureRepository,
@@ -11,6 +10,7 @@ from ui import (
     DeviceControlUpdate, AwayStatusUpdate
 )
 from .AbstractCommand import AbstractCommand
+from ..CommandPriority import CommandPriority
 from ..ExecutionContext import ExecutionContext
 
 
@@ -18,72 +18,75 @@ class InitializeDisplay(AbstractCommand):
     """
     A command that initialized a freshly-connected UI client
     """
+    PRIORITY = CommandPriority.BACKGROUND
+    READS_ONLY = True
 
     def __init__(self, websocket: WebSocketCommonProtocol):
         self.websocket = websocket
 
     def execute(self, context: ExecutionContext) -> None:
         """
-        Send all the required data to the client.
+        Send all the required data to the client. The data is read here, while the client is sent to by the UI
+        server, so a slow client doesn't hold up the command.
         """
-        asyncio.run(self.send_away_status(context))
+        messages = [self.away_status(context)]
 
         for measure_kind in MeasureKind:
-            asyncio.run(self.send_measure(measure_kind, context))
+            messages.extend(self.measure(measure_kind, context))
 
         for device_kind in DeviceKind:
-            asyncio.run(self.send_device_status(device_kind, context))
+            messages.extend(self.device_status(device_kind, context))
 
-    async def send_away_status(self, context: ExecutionContext):
+        context.publisher.send(self.websocket, messages)
+
+    @staticmethod
+    def away_status(context: ExecutionContext) -> dict:
         """
-        Send the away statis
+        Returns the away status
         """
-        away_status_repository = AwayStatusRepository(context.db_session)
-        await self.websocket.send(json.dumps(AwayStatusUpdate(away_status_repository.is_away())))
+        return AwayStatusUpdate(AwayStatusRepository(context.db_session).is_away())
 
-    async def send_measure(self, kind: MeasureKind, context: ExecutionContext):
+    @staticmethod
+    def measure(kind: MeasureKind, context: ExecutionContext) -> List[dict]:
         """
-        Send the data for given measure kind
+        Returns the data for given measure kind
         """
         measure = SensorMeasureRepository(context.db_session).get_last_temperature(kind)
 
         if measure is None:
-            return
+            return []
 
-        await self.websocket.send(json.dumps(TemperatureUpdate(measure.timestamp, kind, measure.temperature)))
-        if measure.humidity is None:
-            return
+        messages: List[dict] = [TemperatureUpdate(measure.timestamp, kind, measure.temperature)]
+        if measure.humidity is not None:
+            messages.append(HumidityUpdate(measure.timestamp, kind, measure.humidity))
 
-        await self.websocket.send(json.dumps(HumidityUpdate(measure.timestamp, kind, measure.humidity)))
+        return messages
 
-    async def send_device_status(self, kind: DeviceKind, context: ExecutionContext):
+    @staticmethod
+    def device_status(kind: DeviceKind, context: ExecutionContext) -> List[dict]:
         """
-        Sends the current status of given device kind
+        Returns the current status of given device kind
         """
-        await self.websocket.send(
-            json.dumps(
-                DeviceControlUpdate(
-                    kind,
-                    DeviceControlRepository(context.db_session).get_measures_controlling(kind)
-                )
-            )
-        )
-
         current_status = DeviceStatusRepository(context.db_session).get_current_status(kind)
-        await self.websocket.send(
-            json.dumps(
-                DeviceStatusUpdate(kind, current_status == PowerStatus.TURNED_ON)
-            )
-        )
+        messages: List[dict] = [
+            DeviceControlUpdate(kind, DeviceControlRepository(context.db_session).get_measures_controlling(kind)),
+            DeviceStatusUpdate(kind, current_status == PowerStatus.TURNED_ON),
+        ]
 
         threshold_temperature_repository = ThresholdTemperatureRepository(context.db_session)
         for mode in OperatingMode:
-            await self.websocket.send(
-                json.dumps(
-                    ThresholdTemperatureUpdate(threshold_temperature_repository.get_threshold_temperature(kind, mode))
-                )
+            messages.append(
+                ThresholdTemperatureUpdate(threshold_temperature_repository.get_threshold_temperature(kind, mode))
             )
 
         last_ping = DevicePingRepository(context.db_session).get_last_ping(kind)
         if last_ping is not None:
-            await self.websocket.send(json.dumps(DevicePingReceived(last_ping.kind, last_ping.timestamp)))
+            messages.append(DevicePingReceived(last_ping.kind, last_ping.timestamp))
+
+        return messages
+
+    def partition_key(self) -> Optional[Hashable]:
+        """
+        The UI client is initialized by a single worker at a time
+        """
+        return self.websocket
@@ -1,8 +1,10 @@
 import logging
+from typing import Hashable, Optional
 from persistence import DeviceStatusRepository
 from domain_types import DeviceKind, PowerStatus
 from ui import DeviceStatusUpdate
 from .AbstractCommand import AbstractCommand
+from ..CommandPriority import CommandPriority
 from ..ExecutionContext import ExecutionContext
 
 
@@ -10,6 +12,7 @@ class RecordDeviceStatus(AbstractCommand):
     """
     Command that ensures device status is as received from the device itself
     """
+    PRIORITY = CommandPriority.CRITICAL
 
     def __init__(self, kind: DeviceKind, is_working: bool):
         self.kind = kind
@@ -30,3 +33,9 @@ class RecordDeviceStatus(AbstractCommand):
             logging.info("Device %s was expected to be on, but it is off. Overthrowing status.", self.kind.name)
             status_repository.set_current_status(self.kind, PowerStatus.TURNED_OFF, context.time_source.now())
             context.publisher.publish(DeviceStatusUpdate(self.kind, False))
+
+    def partition_key(self) -> Optional[Hashable]:
+        """
+        Commands of the device are executed in order
+        """
+        return self.kind
@@ -1,12 +1,14 @@
 import logging
 from datetime import timedelta
+from typing import Hashable, Optional
 from devices import get_device_for_kind
 from domain_types import DeviceKind
 from persistence import (
-    DevicePingRepository, DeviceStatusRepository, NounceRepository, SensorMeasure,
+    DevicePingRepository, DeviceStatusRepository, SensorMeasure,
     SensorMeasureRepository, ThresholdTemperature,
 )
 from .AbstractCommand import AbstractCommand
+from ..CommandPriority import CommandPriority
 from ..ExecutionContext import ExecutionContext
 
 
@@ -14,6 +16,7 @@ class RegulateTemperature(AbstractCommand):
     """
     Given the device and measure, determines whether device should be turned on/off
     """
+    PRIORITY = CommandPriority.CRITICAL
     __TARGET_POWER_SAVE_DELTA: int = 15
 
     def __init__(
@@ -34,7 +37,7 @@ class RegulateTemperature(AbstractCommand):
             self.device_kind,
             DevicePingRepository(context.db_session),
             DeviceStatusRepository(context.db_session),
-            NounceRepository(context.db_session),
+            context.nounce_manager,
             context.time_source,
             context.publisher,
             context.outbound_bus
@@ -126,3 +129,9 @@ class RegulateTemperature(AbstractCommand):
                 return True
 
         return False
+
+    def partition_key(self) -> Optional[Hashable]:
+        """
+        Commands of the device are executed in order
+        """
+        return self.device_kind
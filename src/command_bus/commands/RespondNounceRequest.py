@@ -1,15 +1,25 @@
 import logging
+from datetime import timedelta
 from struct import pack
+from typing import Hashable, Optional
 from secrets import MY_ADDRESS
-from persistence import NounceRepository, NounceRequestResponseRepository
+from persistence import NounceRequestResponseRepository
 from radio_bus import OutboundMessage
 from .AbstractCommand import AbstractCommand
+from ..CommandPriority import CommandPriority
 from ..ExecutionContext import ExecutionContext
 
 
 class RespondNounceRequest(AbstractCommand):
     """
-    Class that informs devices about their nounce
+    Class that informs devices about their nounce. Devices that keep rebooting or missing our response ask over and
+    over again - repeated requests are answered by the response that is still waiting to be transmitted, or the one
+    that has been sent just a moment ago.
+    """
+    PRIORITY = CommandPriority.CRITICAL
+    COALESCE_WINDOW = timedelta(seconds=3)
+    """
+    How long after a response further requests from the same device are considered answered by it
     """
 
     def __init__(self, respond_to: int):
@@ -19,9 +29,18 @@ class RespondNounceRequest(AbstractCommand):
         """
         Send nounce information to the device
         """
-        nounce_repository = NounceRepository(context.db_session)
-        outbound_nounce = nounce_repository.next_outbound_nounce(self.respond_to)
-        last_inbound_nounce = nounce_repository.get_last_inbound_nounce(self.respond_to)
+        if context.outbound_bus.has_pending(self.respond_to, 0x00):
+            logging.debug("Nounce response to %#x is waiting to be transmitted already", self.respond_to)
+            return
+
+        nounce_request_response_repository = NounceRequestResponseRepository(context.db_session)
+        last_response = nounce_request_response_repository.get_last_response(self.respond_to)
+        if last_response is not None and context.time_source.now() - last_response.timestamp < self.COALESCE_WINDOW:
+            logging.debug("Nounce response to %#x has been sent just a moment ago", self.respond_to)
+            return
+
+        outbound_nounce = context.nounce_manager.next_outbound_nounce(self.respond_to)
+        last_inbound_nounce = context.nounce_manager.get_last_inbound_nounce(self.respond_to)
 
         logging.info(
             "Responding to nounce request from %#x with inbound: %d, outbound: %d",
@@ -40,10 +59,15 @@ class RespondNounceRequest(AbstractCommand):
             )
         )
 
-        nounce_request_response_repository = NounceRequestResponseRepository(context.db_session)
         nounce_request_response_repository.register(
             self.respond_to,
             context.time_source.now(),
             last_inbound_nounce,
             outbound_nounce
         )
+
+    def partition_key(self) -> Optional[Hashable]:
+        """
+        Nounce replies to the node are executed in order
+        """
+        return self.respond_to
@@ -1,4 +1,5 @@
 import logging
+from typing import Hashable, Optional
 from persistence import SensorMeasure, SensorMeasureRepository
 from ui import TemperatureUpdate, HumidityUpdate
 from .AbstractCommand import AbstractCommand
@@ -34,3 +35,9 @@ class SaveMeasure(AbstractCommand):
             context.publisher.publish(HumidityUpdate(
                 self.measure.timestamp, self.measure.kind, self.measure.humidity)
             )
+
+    def partition_key(self) -> Optional[Hashable]:
+        """
+        Measures of the sensor are executed in order
+        """
+        return self.measure.kind
@@ -0,0 +1,38 @@
+import logging
+from typing import Hashable, List, Optional
+from persistence import SensorMeasure, SensorMeasureRepository
+from ui import TemperatureUpdate, HumidityUpdate
+from .AbstractCommand import AbstractCommand
+from ..ExecutionContext import ExecutionContext
+
+
+class SaveMeasures(AbstractCommand):
+    """
+    A command that saves a batch of measures received in a single message into the database, and publishes
+    the newest of them to UI
+    """
+
+    def __init__(self, measures: List[SensorMeasure]):
+        self.measures = measures
+
+    def execute(self, context: ExecutionContext) -> None:
+        """
+        Executes the command
+        """
+        if not self.measures:
+            return
+
+        newest = max(self.measures, key=lambda measure: measure.timestamp)
+        logging.debug("Saving %d measures of kind: %s", len(self.measures), newest.kind.name)
+
+        SensorMeasureRepository(context.db_session).create_many(self.measures)
+
+        context.publisher.publish(TemperatureUpdate(newest.timestamp, newest.kind, newest.temperature))
+        if newest.humidity is not None:
+            context.publisher.publish(HumidityUpdate(newest.timestamp, newest.kind, newest.humidity))
+
+    def partition_key(self) -> Optional[Hashable]:
+        """
+        Measures of the sensor are executed in order
+        """
+        return self.measures[0].kind if self.measures else None
@@ -1,17 +1,22 @@
 import logging
 from datetime import datetime
+from typing import Hashable, Optional
 
 from persistence import DevicePingRepository
 from domain_types import DeviceKind
 from ui import DevicePingReceived
 from .AbstractCommand import AbstractCommand
+from ..CommandPriority import CommandPriority
 from ..ExecutionContext import ExecutionContext
 
 
 class SavePing(AbstractCommand):
     """
-    Command that saves received device ping in the persistence layer and publishes it to the UI
+    Command that saves received device ping in the persistence layer and publishes it to the UI. It's as critical as
+    the evaluation and regulation of the device that follow it, as they tell whether the device is available by its
+    pings.
     """
+    PRIORITY = CommandPriority.CRITICAL
 
     def __init__(self, kind: DeviceKind, timestamp: datetime):
         self.kind = kind
@@ -26,3 +31,9 @@ class SavePing(AbstractCommand):
         ping_repository = DevicePingRepository(context.db_session)
         ping_repository.create(self.kind, self.timestamp)
         context.publisher.publish(DevicePingReceived(self.kind, self.timestamp))
+
+    def partition_key(self) -> Optional[Hashable]:
+        """
+        Commands of the device are executed in order
+        """
+        return self.kind
@@ -1,4 +1,5 @@
 import logging
+from typing import Hashable, Optional, Tuple
 from persistence import AwayStatusRepository, ThresholdTemperatureRepository, DeviceControlRepository
 from domain_types import DeviceKind, MeasureKind, OperatingMode, PowerStatus
 from ui import ThresholdTemperatureUpdate, DeviceControlUpdate, AwayStatusUpdate
@@ -76,3 +77,32 @@ class UpdateConfiguration(AbstractCommand):
 
         for kind in DeviceKind:
             context.command_queue.put_nowait(EvaluateDevice(kind))
+
+    def coalescing_key(self) -> Optional[Hashable]:
+        """
+        Every update sets what it contains to absolute values, so a newer update of exactly the same settings makes
+        the older one pointless
+        """
+        return (
+            self.data.get("isAway") is not None,
+            self.__settings_of(self.data.get("thresholdTemperature")),
+            self.__settings_of(self.data.get("controlMeasures")),
+        )
+
+    def partition_key(self) -> Optional[Hashable]:
+        """
+        Configuration updates are executed one at a time, in order, so the older one can't overwrite the newer one
+        """
+        return "configuration"
+
+    @staticmethod
+    def __settings_of(section: Optional[dict]) -> Optional[Tuple[Tuple[str, str], ...]]:
+        """
+        Returns the device and operating mode pairs the section of the update contains
+        """
+        if section is None:
+            return None
+
+        return tuple(sorted(
+            (str(device_key), str(mode_key)) for device_key in section for mode_key in section[device_key]
+        ))
@@ -3,7 +3,7 @@ from abc import ABC, abstractmethod
 from datetime import datetime
 from typing import Type
 from domain_types import DeviceKind, PowerStatus
-from persistence import DeviceStatusRepository, DevicePingRepository, NounceRepository
+from persistence import DeviceStatusRepository, DevicePingRepository, NounceManager
 from ui import UiPublisher, DeviceStatusUpdate
 
 
@@ -27,14 +27,14 @@ class AbstractDevice(ABC):
         kind: DeviceKind,
         device_ping_repository: DevicePingRepository,
         device_status_repository: DeviceStatusRepository,
-        nounce_repository: NounceRepository,
+        nounce_manager: NounceManager,
         time_source: Type[datetime],
         publisher: UiPublisher
     ):
         self.kind = kind
         self.device_ping_repository = device_ping_repository
         self.device_status_repository = device_status_repository
-        self.nounce_repository = nounce_repository
+        self.nounce_manager = nounce_manager
         self.time_source = time_source
         self.publisher = publisher
 
@@ -2,7 +2,7 @@ from datetime import datetime
 from queue import Queue
 from typing import Type
 from domain_types import DeviceKind
-from persistence import DevicePingRepository, DeviceStatusRepository, NounceRepository
+from persistence import DevicePingRepository, DeviceStatusRepository, NounceManager
 from ui import UiPublisher
 from .AbstractDevice import AbstractDevice
 from .AirConditioner import AirConditioner
@@ -13,7 +13,7 @@ def get_device_for_kind(
     kind: DeviceKind,
     device_ping_repository: DevicePingRepository,
     device_status_repository: DeviceStatusRepository,
-    nounce_repository: NounceRepository,
+    nounce_manager: NounceManager,
     time_source: Type[datetime],
     publisher: UiPublisher,
     outbound_bus: Queue,
@@ -25,7 +25,7 @@ def get_device_for_kind(
         return AirConditioner(
             device_ping_repository,
             device_status_repository,
-            nounce_repository,
+            nounce_manager,
             time_source,
             publisher,
             outbound_bus
@@ -34,7 +34,7 @@ def get_device_for_kind(
         return Heater(
             device_ping_repository,
             device_status_repository,
-            nounce_repository,
+            nounce_manager,
             time_source,
             publisher,
             outbound_bus
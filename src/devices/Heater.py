@@ -3,7 +3,7 @@ from queue import Queue
 from typing import Type
 from secrets import MY_ADDRESS
 from domain_types import DeviceKind
-from persistence import DevicePingRepository, DeviceStatusRepository, NounceRepository
+from persistence import DevicePingRepository, DeviceStatusRepository, NounceManager
 from radio_bus import OutboundMessage
 from ui import UiPublisher
 from .AbstractDevice import AbstractDevice
@@ -18,7 +18,7 @@ class Heater(AbstractDevice):
         self,
         device_ping_repository: DevicePingRepository,
         device_status_repository: DeviceStatusRepository,
-        nounce_repository: NounceRepository,
+        nounce_manager: NounceManager,
         time_source: Type[datetime],
         publisher: UiPublisher,
         outbound_bus: Queue,
@@ -27,7 +27,7 @@ class Heater(AbstractDevice):
             DeviceKind.HEATING,
             device_ping_repository,
             device_status_repository,
-            nounce_repository,
+            nounce_manager,
             time_source,
             publisher
         )
@@ -79,10 +79,9 @@ class Heater(AbstractDevice):
             MY_ADDRESS,
             DeviceKind.HEATING.value,
             0x01,
-            self.nounce_repository.next_outbound_nounce(DeviceKind.HEATING.value)
+            self.nounce_manager.next_outbound_nounce(DeviceKind.HEATING.value)
         )
         self.outbound_bus.put_nowait(message)
-        self.outbound_bus.put_nowait(message)
 
     def turn_off(self) -> None:
         """
@@ -94,7 +93,6 @@ class Heater(AbstractDevice):
             MY_ADDRESS,
             DeviceKind.HEATING.value,
             0x02,
-            self.nounce_repository.next_outbound_nounce(DeviceKind.HEATING.value)
+            self.nounce_manager.next_outbound_nounce(DeviceKind.HEATING.value)
         )
         self.outbound_bus.put_nowait(message)
-        self.outbound_bus.put_nowait(message)
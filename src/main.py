@@ -1,46 +1,171 @@
+import argparse
 import logging
 from logging.handlers import WatchedFileHandler
 import signal
 import threading
 from datetime import datetime
-from queue import Queue
-from sqlalchemy import create_engine
+from typing import List
 from sqlalchemy.orm import sessionmaker
-from command_bus import CommandExecutor
-from persistence import AbstractBase
-from radio_bus import Radio, RadioController
+from command_bus import CommandBus, CommandExecutor
+from persistence import AbstractBase, NounceManager, ReportingIntervalRepository, create_database_engine
+from radio_bus import (
+    AbstractGateway,
+    CaptureWriter,
+    ChannelMonitor,
+    RADIO_BACKENDS,
+    RadioController,
+    RadioGateway,
+    RateLimiter,
+    TransmitScheduler,
+    UdpGateway,
+    create_radio,
+)
+from runtime import AsyncRuntime
 from ui import UiController
 
+parser = argparse.ArgumentParser(description="Home Climate Controller")
+parser.add_argument(
+    "--capture",
+    help="append every byte received and sent through radio to given capture file; with several radios, every radio "
+         "but the first one captures into the file with its index appended, e.g. <file>.1"
+)
+parser.add_argument(
+    "--radio",
+    action="append",
+    help=f"radio gateway to use, one of: {', '.join(RADIO_BACKENDS)}; hc12 can be followed by the serial device and "
+         "the GPIO pin of SET, e.g. hc12:/dev/ttyUSB0:27; can be given multiple times (default: hc12)"
+)
+parser.add_argument(
+    "--udp",
+    action="append",
+    default=[],
+    help="also receive frames from devices on the network, through UDP on given host:port; can be given multiple times"
+)
+parser.add_argument(
+    "--rate-limit",
+    action="append",
+    default=[],
+    type=RateLimiter.parse_budget,
+    help="how many frames of a traffic class (nounce_request, ping or measure) every sender may send, "
+         "as <class>:<rate per second>:<burst>, e.g. measure:0.1:10; can be given multiple times"
+)
+parser.add_argument("--database", default="/var/lib/infodisplay/database.db", help="path to the SQLite database")
+parser.add_argument(
+    "--guard-interval",
+    type=float,
+    default=ChannelMonitor.GUARD_INTERVAL,
+    help="how long the channel needs to be quiet before transmitting, in seconds"
+)
+parser.add_argument(
+    "--max-deferral",
+    type=float,
+    default=ChannelMonitor.MAX_DEFERRAL,
+    help="how long a transmission can be deferred waiting for a quiet channel, in seconds"
+)
+parser.add_argument(
+    "--batch-size",
+    type=int,
+    default=CommandExecutor.BATCH_SIZE,
+    help="how many commands can be committed in a single transaction, 1 commits every command on its own"
+)
+parser.add_argument(
+    "--batch-window",
+    type=float,
+    default=CommandExecutor.BATCH_WINDOW,
+    help="how long to wait for further commands to commit together with the first one, in seconds"
+)
+parser.add_argument(
+    "--workers",
+    type=int,
+    default=CommandExecutor.WORKERS,
+    help="how many workers execute commands in parallel, commands of the same device, sensor or UI client are never "
+         "executed in parallel"
+)
+parser.add_argument(
+    "--runtime",
+    choices=["threads", "asyncio"],
+    default="threads",
+    help="run radio, commands and UI in a thread each (threads, default), or all of them on a single event loop, "
+         "with database work done in a pool of as many threads as there are workers (asyncio)"
+)
+parser.add_argument("--log-file", default="/var/log/infodisplay.log", help="path to the log file")
+args = parser.parse_args()
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s %(levelname)-8s %(message)s',
     datefmt='%Y-%m-%d %H:%M:%S',
-    handlers=[WatchedFileHandler("/var/log/infodisplay.log")]
+    handlers=[WatchedFileHandler(args.log_file)]
 )
 logging.getLogger('websockets.server').setLevel(logging.WARNING)
 logging.getLogger('websockets.protocol').setLevel(logging.WARNING)
 
 stop = threading.Event()
-command_bus: Queue = Queue()
-outbound_bus: Queue = Queue()
-radio = Radio("/dev/serial0", 17)
-db_engine = create_engine("sqlite:////var/lib/infodisplay/database.db")
+command_bus = CommandBus()
+outbound_bus = TransmitScheduler()
+radios = args.radio or ["hc12"]
+captures = [
+    CaptureWriter(args.capture if index == 0 else f"{args.capture:s}.{index:d}") if args.capture is not None else None
+    for index in range(len(radios))
+]
+gateways: List[AbstractGateway] = [
+    RadioGateway(spec, create_radio(spec, capture), ChannelMonitor(args.guard_interval, args.max_deferral))
+    for spec, capture in zip(radios, captures)
+]
+for endpoint in args.udp:
+    host, port = endpoint.rsplit(":", 1)
+    gateways.append(UdpGateway(f"udp:{endpoint:s}", host, int(port)))
+db_engine = create_database_engine(args.database)
 db_session_factory = sessionmaker(db_engine, expire_on_commit=False)
 
-radio.setup_device()
+for gateway in gateways:
+    if isinstance(gateway, RadioGateway):
+        gateway.radio.setup_device()
 AbstractBase.metadata.create_all(db_engine)
+nounce_manager = NounceManager(db_session_factory)
+nounce_manager.load()
+with db_session_factory() as db_session:
+    reporting_intervals = {
+        reporting_interval.kind.value: reporting_interval.interval
+        for reporting_interval in ReportingIntervalRepository(db_session).get_reporting_intervals()
+    }
 
 ui_controller = UiController(8010, command_bus, stop)
-radio_controller = RadioController(radio, outbound_bus, command_bus, datetime, stop, db_session_factory)
-executor = CommandExecutor(db_session_factory, outbound_bus, command_bus, ui_controller, datetime, stop)
+radio_controller = RadioController(
+    gateways,
+    outbound_bus,
+    command_bus,
+    datetime,
+    stop,
+    nounce_manager,
+    RateLimiter({**RateLimiter.DEFAULT_BUDGETS, **dict(args.rate_limit)}),
+    reporting_intervals
+)
+executor = CommandExecutor(
+    db_session_factory,
+    outbound_bus,
+    command_bus,
+    ui_controller,
+    datetime,
+    stop,
+    nounce_manager,
+    args.batch_size,
+    args.batch_window,
+    args.workers
+)
 
-radio_thread = threading.Thread(target=radio_controller.run)
-command_thread = threading.Thread(target=executor.run)
-ui_thread = threading.Thread(target=ui_controller.run)
+if args.runtime == "asyncio":
+    runtime = AsyncRuntime(radio_controller, executor, ui_controller, nounce_manager, stop)
+    threads = [threading.Thread(target=runtime.run)]
+else:
+    threads = [threading.Thread(target=radio_controller.run_receiver, args=(gateway,)) for gateway in gateways]
+    threads.append(threading.Thread(target=radio_controller.run_transmitter))
+    threads.append(threading.Thread(target=executor.run))
+    threads.append(threading.Thread(target=ui_controller.run))
+    threads.append(threading.Thread(target=nounce_manager.run, args=(stop,)))
 
-radio_thread.start()
-command_thread.start()
-ui_thread.start()
+for thread in threads:
+    thread.start()
 
 
 # pylint: disable=W0613
@@ -55,6 +180,11 @@ def sig_handler(signum, frame):
 signal.signal(signal.SIGTERM, sig_handler)
 signal.signal(signal.SIGINT, sig_handler)
 
-radio_thread.join()
-command_thread.join()
-ui_thread.join()
+for thread in threads:
+    thread.join()
+# nothing uses the nounces anymore, write all of them down
+nounce_manager.close()
+
+for capture in captures:
+    if capture is not None:
+        capture.close()
@@ -0,0 +1,40 @@
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+BUSY_TIMEOUT = 5000  # milliseconds
+"""
+How long a transaction waits for the write lock held by another one, before it fails
+"""
+
+
+def create_database_engine(database_path: str) -> Engine:
+    """
+    Creates the engine of the SQLite database at given path.
+
+    The driver's own transaction handling is turned off, and every transaction is begun explicitly instead, so that
+    savepoints work as expected: releasing a savepoint doesn't commit the whole transaction. Transactions take the
+    write lock right away (BEGIN IMMEDIATE), waiting for it if another connection holds it, so that concurrent writers
+    queue up rather than fail halfway through. The database is in WAL mode, so reading never waits for writers, and
+    read-only transactions (see begin_read_only) never wait at all.
+    """
+    engine = create_engine(f"sqlite:///{database_path:s}")
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, _connection_record) -> None:
+        dbapi_connection.isolation_level = None
+        dbapi_connection.execute("PRAGMA journal_mode=WAL")
+        dbapi_connection.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT:d}")
+
+    @event.listens_for(engine, "begin")
+    def on_begin(connection) -> None:
+        connection.exec_driver_sql("BEGIN " + connection.get_execution_options().get("sqlite_begin", "IMMEDIATE"))
+
+    return engine
+
+
+def begin_read_only(db_session: Session) -> None:
+    """
+    Begins the transaction of given session without taking the write lock, nothing may be written within it
+    """
+    db_session.connection(execution_options={"sqlite_begin": "DEFERRED"})
@@ -0,0 +1,292 @@
+import logging
+import traceback
+from collections import Counter
+from threading import Event, Lock
+from typing import Dict, List, Optional
+from sqlalchemy.orm import Session, sessionmaker
+from domain_types import DeviceKind, MeasureKind
+from .repositories.NounceRepository import NounceRepository
+
+
+class NounceManager:
+    """
+    Keeps inbound and outbound nounces of all the devices in memory, shared by the radio and command threads, so that
+    neither validating an inbound frame nor sending an outbound one needs any SQL.
+
+    Inbound nounces are persisted as high-water marks: the persisted inbound nounce is at least as high as any nounce
+    that has been accepted, and a nounce above it is only accepted once a new mark, the recovery margin above it, is
+    written down. Accepting the nounces below the mark doesn't write anything. After a crash the inbound nounces resume
+    at the marks, never accepting a frame we may have accepted before.
+
+    Outbound nounces are reserved in blocks, hi/lo style: the persisted outbound nounce is the highest one reserved,
+    and it's written down before any nounce above the previous one is handed out. After a crash the outbound nounces
+    resume right after the reserved block, so they are never reused. Devices that fall behind resynchronize with
+    a nounce request. On clean shutdown the nounces are written down exactly, so no block is skipped.
+
+    Blocks and marks are reserved ahead, on load for all the known devices and by the write-behind process once half
+    of a block or of the margin is used up, so neither accepting nor handing out a nounce usually writes anything.
+    Outbound nounces are handed out in the middle of command transactions, that lock the database against any other
+    write, so the command executor reserves ahead as well, before it begins a transaction. Reserving a block right
+    away, when there is none left, never holds up the nounces of the other devices.
+    """
+
+    FLUSH_INTERVAL = 5  # seconds
+    """
+    How often the changed nounces are written down
+    """
+
+    RECOVERY_MARGIN = 64
+    """
+    How far ahead of the inbound nounces in use the persisted marks are reserved. Once half of that is used up by any of
+    the devices, the next mark is written down without waiting for the flush interval.
+    """
+
+    OUTBOUND_BLOCK = 256
+    """
+    How many outbound nounces are reserved with a single write
+    """
+
+    KNOWN_OWNERS = frozenset(kind.value for kinds in (DeviceKind, MeasureKind) for kind in kinds)
+    """
+    Addresses of the devices that outbound nounces are reserved for on load, even if they haven't been used yet
+    """
+
+    def __init__(
+        self,
+        db_session_factory: sessionmaker[Session],  # pylint: disable=E1136
+        recovery_margin: int = RECOVERY_MARGIN,
+        outbound_block: int = OUTBOUND_BLOCK
+    ):
+        """
+        :param db_session_factory: Factory of sessions to load and write down the nounces with
+        :param recovery_margin: How far ahead of the inbound nounces in use the persisted marks are reserved
+        :param outbound_block: How many outbound nounces are reserved with a single write
+        """
+        self.db_session_factory = db_session_factory
+        self.recovery_margin = recovery_margin
+        self.outbound_block = outbound_block
+        self.counters: Counter = Counter()
+        self.__lock = Lock()
+        self.__write_lock = Lock()  # always taken before the lock, never after
+        self.__flush_requested = Event()
+        self.__nounces: Optional[Dict[int, List[int]]] = None  # owner: [inbound, outbound]
+        self.__marks: Dict[int, int] = {}  # owner: highest inbound that may be accepted
+        self.__reserved: Dict[int, int] = {}  # owner: highest outbound
+
+    def load(self) -> None:
+        """
+        Loads the persisted nounces, unless they have been loaded already, and moves them forward if the application
+        hasn't been shut down cleanly
+        """
+        with self.__lock:
+            self.__load()
+
+    def get_last_inbound_nounce(self, owner: int) -> int:
+        """
+        Returns most recently recorded inbound nounce of given device
+        """
+        with self.__lock:
+            return self.__nounces_of(owner)[0]
+
+    def register_inbound_nounce(self, owner: int, value: int) -> None:
+        """
+        Records the inbound nounce of given device. A nounce above the persisted mark is written down first, so it's
+        never accepted again after a crash.
+        """
+        with self.__lock:
+            nounces = self.__nounces_of(owner)
+            if value <= self.__marks[owner]:
+                nounces[0] = value
+                self.__track(owner)
+                return
+
+        with self.__write_lock:
+            with self.__lock:
+                is_marked = value <= self.__marks[owner]
+            if not is_marked:
+                logging.warning(
+                    "Inbound nounce %d of %#x is past the persisted mark, writing it down right away",
+                    value,
+                    owner
+                )
+                self.__write_down({owner: value + self.recovery_margin}, {})
+            with self.__lock:
+                nounces[0] = value
+
+    def next_outbound_nounce(self, owner: int) -> int:
+        """
+        Returns next nounce for outbound communication with given device
+        """
+        with self.__lock:
+            nounces = self.__nounces_of(owner)
+            if nounces[1] < self.__reserved.get(owner, 0):
+                nounces[1] += 1
+                self.__track(owner)
+                return nounces[1]
+
+        # nounces of the other devices may still be handed out while the block is being reserved
+        with self.__write_lock:
+            while True:
+                with self.__lock:
+                    if nounces[1] < self.__reserved.get(owner, 0):
+                        nounces[1] += 1
+                        self.__track(owner)
+                        return nounces[1]
+                    highest = nounces[1] + self.outbound_block
+
+                logging.warning("No outbound nounces reserved for %#x, reserving them right away", owner)
+                self.__write_down({}, {owner: highest})
+
+    def flush(self) -> None:
+        """
+        Writes down the next inbound mark for the devices that have used up half of the margin, and reserves the next
+        block of outbound nounces for the devices that have used up half of the reserved one
+        """
+        with self.__write_lock:
+            self.__flush()
+
+    def reserve_ahead(self) -> None:
+        """
+        Does what flush does, unless the nounces are being written down already - in which case it doesn't wait for
+        that. Meant to be called before a transaction begins, so that nothing needs to be reserved within it.
+        """
+        if not self.__write_lock.acquire(blocking=False):  # pylint: disable=R1732
+            return
+
+        try:
+            self.__flush()
+        finally:
+            self.__write_lock.release()
+
+    def run(self, stop: Event) -> None:
+        """
+        Runs the write-behind process. This is meant to be run in a separate thread, as it's blocking.
+        """
+        while not stop.is_set():
+            self.__flush_requested.wait(self.FLUSH_INTERVAL)
+            try:
+                self.flush()
+            except Exception:
+                logging.error(traceback.format_exc())
+
+    def close(self) -> None:
+        """
+        Writes down all the nounces exactly and marks them as complete, giving back what's left of the inbound margins
+        and of the reserved outbound blocks. Nothing may use the nounces after that.
+        """
+        with self.__write_lock, self.__lock, self.db_session_factory() as db_session:
+            nounce_repository = NounceRepository(db_session)
+            for owner, nounces in (self.__nounces or {}).items():
+                if nounces[0] != self.__marks.get(owner, 0):
+                    nounce_repository.get_nounce(owner).inbound = nounces[0]
+                    self.__marks[owner] = nounces[0]
+                if nounces[1] != self.__reserved.get(owner, 0):
+                    nounce_repository.get_nounce(owner).outbound = nounces[1]
+                    self.__reserved[owner] = nounces[1]
+
+            nounce_repository.set_clean(True)
+            db_session.commit()
+
+    def __flush(self) -> None:
+        """
+        Writes down the inbound marks and reserves the outbound blocks that are running out, the write lock needs to
+        be held
+        """
+        with self.__lock:
+            marks = {
+                owner: nounces[0] + self.recovery_margin
+                for owner, nounces in (self.__nounces or {}).items()
+                if self.__is_nearing_mark(owner)
+            }
+            reserved = {
+                owner: nounces[1] + self.outbound_block
+                for owner, nounces in (self.__nounces or {}).items()
+                if self.__is_running_out(owner)
+            }
+            self.__flush_requested.clear()
+
+        if marks or reserved:
+            self.__write_down(marks, reserved)
+
+    def __load(self) -> Dict[int, List[int]]:
+        """
+        Loads the persisted nounces, unless they have been loaded already, the lock needs to be held
+        """
+        if self.__nounces is not None:
+            return self.__nounces
+
+        with self.db_session_factory() as db_session:
+            nounce_repository = NounceRepository(db_session)
+            if not nounce_repository.is_clean():
+                logging.warning(
+                    "Nounces have not been written down on shutdown, resuming inbound ones at the persisted marks and "
+                    "outbound ones after the reserved blocks"
+                )
+
+            nounces = {nounce.owner: [nounce.inbound, nounce.outbound] for nounce in nounce_repository.get_all()}
+            for owner in nounces.keys() | self.KNOWN_OWNERS:
+                nounce = nounce_repository.get_nounce(owner)
+                nounces.setdefault(owner, [nounce.inbound, nounce.outbound])
+                nounce.inbound = self.__marks[owner] = nounces[owner][0] + self.recovery_margin
+                nounce.outbound = self.__reserved[owner] = nounces[owner][1] + self.outbound_block
+                self.counters["reservations"] += 1
+
+            # until closed, the nounces in use may get ahead of the persisted ones
+            nounce_repository.set_clean(False)
+            db_session.commit()
+
+        self.__nounces = nounces
+        return nounces
+
+    def __nounces_of(self, owner: int) -> List[int]:
+        """
+        Returns inbound and outbound nounce of given device, the lock needs to be held
+        """
+        all_nounces = self.__load()
+        nounces = all_nounces.get(owner)
+        if nounces is None:
+            nounces = all_nounces[owner] = [0, 0]
+            self.__marks.setdefault(owner, 0)
+
+        return nounces
+
+    def __write_down(self, marks: Dict[int, int], reserved: Dict[int, int]) -> None:
+        """
+        Writes down given inbound marks and highest reserved outbound nounces, the write lock needs to be held and
+        the lock must not be, so that nounces below the persisted ones can be used in the meantime
+        """
+        with self.db_session_factory() as db_session:
+            nounce_repository = NounceRepository(db_session)
+            for owner, inbound in marks.items():
+                nounce_repository.get_nounce(owner).inbound = inbound
+            for owner, outbound in reserved.items():
+                nounce_repository.get_nounce(owner).outbound = outbound
+            db_session.commit()
+
+        with self.__lock:
+            self.__marks.update(marks)
+            self.__reserved.update(reserved)
+
+        self.counters["flushes"] += 1
+        self.counters["rows"] += len(marks.keys() | reserved.keys())
+        self.counters["reservations"] += len(marks.keys() | reserved.keys())
+
+    def __track(self, owner: int) -> None:
+        """
+        Requests writing down the nounces early, if the device is getting close to the persisted inbound mark, or is
+        running out of the reserved outbound nounces
+        """
+        if self.__is_nearing_mark(owner) or self.__is_running_out(owner):
+            self.__flush_requested.set()
+
+    def __is_nearing_mark(self, owner: int) -> bool:
+        """
+        Checks whether the device has used up half of the inbound margin, the lock needs to be held
+        """
+        return (self.__marks.get(owner, 0) - self.__nounces_of(owner)[0]) * 2 <= self.recovery_margin
+
+    def __is_running_out(self, owner: int) -> bool:
+        """
+        Checks whether the device has used up half of the reserved outbound nounces, the lock needs to be held
+        """
+        return (self.__reserved.get(owner, 0) - self.__nounces_of(owner)[1]) * 2 <= self.outbound_block
@@ -1,2 +1,4 @@
 from .models import *
 from .repositories import *
+from .DatabaseFactory import begin_read_only, create_database_engine
+from .NounceManager import NounceManager
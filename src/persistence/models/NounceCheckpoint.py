@@ -0,0 +1,13 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from .AbstractBase import AbstractBase
+
+
+class NounceCheckpoint(AbstractBase):
+    """
+    Tells whether the nounces have been written down completely on shutdown, or whether the application has been
+    running (or crashed) since, so the persisted nounces may be behind the ones in use.
+    """
+
+    __tablename__ = "nounce_checkpoint"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    clean: Mapped[bool]
@@ -1,4 +1,5 @@
 from datetime import datetime
+from sqlalchemy import Index
 from sqlalchemy.orm import Mapped, mapped_column
 from .AbstractBase import AbstractBase
 
@@ -15,6 +16,10 @@ class NounceRequestResponseLog(AbstractBase):
     responded_inbound_nounce: Mapped[int]
     responded_outbound_nounce: Mapped[int]
 
+    __table_args__ = (
+        Index('nounce_request_response_log_by_owner_idx', "owner", "timestamp"),
+    )
+
     def __init__(self, owner: int, timestamp: datetime, responded_inbound_nounce: int, responded_outbound_nounce: int):
         super().__init__(
             owner=owner,
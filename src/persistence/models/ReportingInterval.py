@@ -0,0 +1,17 @@
+from datetime import datetime
+from sqlalchemy.orm import mapped_column, Mapped
+from domain_types import MeasureKind
+from .AbstractBase import AbstractBase
+
+
+class ReportingInterval(AbstractBase):
+    """
+    Represents the reporting interval most recently sent to a sensor
+    """
+    __tablename__ = "reporting_interval"
+    kind: Mapped[MeasureKind] = mapped_column(primary_key=True)
+    interval: Mapped[int]
+    timestamp: Mapped[datetime]
+
+    def __init__(self, kind: MeasureKind, interval: int, timestamp: datetime):
+        super().__init__(kind=kind, interval=interval, timestamp=timestamp)
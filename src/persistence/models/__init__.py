@@ -6,3 +6,6 @@ from .SensorMeasure import SensorMeasure
 from .ThresholdTemperature import ThresholdTemperature
 from .AwayStatus import AwayStatus
 from .NounceRequestResponseLog import NounceRequestResponseLog
+from .ReportingInterval import ReportingInterval
+from .Nounce import Nounce
+from .NounceCheckpoint import NounceCheckpoint
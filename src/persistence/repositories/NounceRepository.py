@@ -1,4 +1,6 @@
+from typing import List
 from persistence.models.Nounce import Nounce
+from persistence.models.NounceCheckpoint import NounceCheckpoint
 from ._AbstractRepository import AbstractRepository
 
 
@@ -39,3 +41,27 @@ class NounceRepository(AbstractRepository):
         nounce.outbound += 1
 
         return nounce.outbound
+
+    def get_all(self) -> List[Nounce]:
+        """
+        Returns current nounces of all the devices
+        """
+        return self._session.query(Nounce).all()
+
+    def is_clean(self) -> bool:
+        """
+        Checks whether the nounces have been completely written down on shutdown (or have never been used at all)
+        """
+        checkpoint = self._session.get(NounceCheckpoint, 1)
+        return checkpoint is None or checkpoint.clean
+
+    def set_clean(self, clean: bool) -> None:
+        """
+        Records whether the nounces have been completely written down
+        """
+        checkpoint = self._session.get(NounceCheckpoint, 1)
+        if checkpoint is None:
+            self._session.add(NounceCheckpoint(id=1, clean=clean))
+            return
+
+        checkpoint.clean = clean
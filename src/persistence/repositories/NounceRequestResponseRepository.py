@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Optional
 from persistence.models import NounceRequestResponseLog
 from ._AbstractRepository import AbstractRepository
 
@@ -15,3 +16,15 @@ class NounceRequestResponseRepository(AbstractRepository):
         self._session.add(
             NounceRequestResponseLog(owner, timestamp, inbound_nounce, outbound_nounce)
         )
+
+    def get_last_response(self, owner: int) -> Optional[NounceRequestResponseLog]:
+        """
+        Returns the most recent response sent to given device, if any
+        """
+        return (
+            self._session
+            .query(NounceRequestResponseLog)
+            .filter(NounceRequestResponseLog.owner == owner)
+            .order_by(NounceRequestResponseLog.timestamp.desc())
+            .first()
+        )
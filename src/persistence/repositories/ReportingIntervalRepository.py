@@ -0,0 +1,35 @@
+from datetime import datetime
+from typing import List, Optional
+from persistence.models import ReportingInterval
+from domain_types import MeasureKind
+from ._AbstractRepository import AbstractRepository
+
+
+class ReportingIntervalRepository(AbstractRepository):
+    """
+    Repository for reporting intervals sent to sensors
+    """
+
+    def get_reporting_interval(self, kind: MeasureKind) -> Optional[ReportingInterval]:
+        """
+        Returns the reporting interval most recently sent to the sensor of given kind, if any
+        """
+        return self._session.get(ReportingInterval, kind)
+
+    def get_reporting_intervals(self) -> List[ReportingInterval]:
+        """
+        Returns the reporting intervals most recently sent to all the sensors
+        """
+        return self._session.query(ReportingInterval).all()
+
+    def set_reporting_interval(self, kind: MeasureKind, interval: int, timestamp: datetime):
+        """
+        Records the reporting interval that has been sent to the sensor of given kind
+        """
+        reporting_interval = self.get_reporting_interval(kind)
+        if reporting_interval is None:
+            self._session.add(ReportingInterval(kind, interval, timestamp))
+            return
+
+        reporting_interval.interval = interval
+        reporting_interval.timestamp = timestamp
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from persistence.models import SensorMeasure
 from domain_types import MeasureKind
 from ._AbstractRepository import AbstractRepository
@@ -17,6 +17,13 @@ class SensorMeasureRepository(AbstractRepository):
         self._session.add(measure)
         return measure
 
+    def create_many(self, measures: List[SensorMeasure]) -> List[SensorMeasure]:
+        """
+        Creates new measurement records, inserted together in a single batch
+        """
+        self._session.add_all(measures)
+        return measures
+
     def get_last_temperature(self, kind: MeasureKind, max_age: Optional[datetime] = None) -> Optional[SensorMeasure]:
         """
         Returns the last temperature of given kind
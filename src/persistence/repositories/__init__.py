@@ -7,3 +7,4 @@ from .NounceRepository import NounceRepository
 from .AwayStatusRepository import AwayStatusRepository
 from .TemperatureRegulationRepository import TemperatureRegulationRepository
 from .NounceRequestResponseRepository import NounceRequestResponseRepository
+from .ReportingIntervalRepository import ReportingIntervalRepository
@@ -0,0 +1,54 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+from .radio.FrameParser import Frame
+from .radio.Framing import Framing
+from .radio.OutboundMessage import OutboundMessage
+
+
+class AbstractGateway(ABC):
+    """
+    Transport through which the controller talks to the devices. Gateways only move already framed buffers around,
+    authentication, nounce validation and dispatching is the same no matter how the frame has arrived.
+    """
+
+    def __init__(self, name: str):
+        """
+        :param name: Name of the gateway used in logs
+        """
+        self.name = name
+
+    @abstractmethod
+    def receive(self) -> List[Frame]:
+        """
+        Waits a while for frames to arrive and returns them, possibly none
+        """
+
+    @abstractmethod
+    def send(self, msg: OutboundMessage, framing: Framing) -> None:
+        """
+        Sends the message in given framing
+        """
+
+    async def send_async(self, msg: OutboundMessage, framing: Framing) -> None:
+        """
+        Sends the message in given framing from an event loop, without blocking it for longer than writing takes
+        """
+        self.send(msg, framing)
+
+    def fileno(self) -> Optional[int]:
+        """
+        Returns the file descriptor that becomes readable when frames arrive, if the gateway can be waited on that way
+        """
+        return None
+
+    def heard(self, address: int, origin: Any) -> None:
+        """
+        Registers that an authentic frame from given address has arrived from given origin
+        """
+
+    @property
+    @abstractmethod
+    def counters(self) -> Dict[str, int]:
+        """
+        Returns the statistics of the gateway
+        """
@@ -0,0 +1,143 @@
+import logging
+import statistics
+from collections import Counter, deque
+from threading import Lock
+from time import monotonic
+from typing import Deque, Dict, NamedTuple, Optional
+from persistence import NounceManager
+from .TransmitScheduler import TransmitScheduler
+from .radio.OutboundMessage import OutboundMessage
+
+
+class PendingCommand(NamedTuple):
+    """
+    Actuator command that hasn't been confirmed by the device yet
+    """
+    message: OutboundMessage
+    commanded_at: float
+    attempts: int
+    retry_at: float
+
+
+class ActuatorReconciler:
+    """
+    Keeps track of the state the devices are meant to be in, as set by the turn on / off commands transmitted to
+    them. A device confirms the command with its next ping, which reports whether it's working. Until that happens,
+    every ping that reports the other state causes the command to be transmitted again, with exponential backoff.
+    Every retransmission is signed with a fresh nounce, as the device rejects anything older than the last nounce it
+    has accepted from us.
+    """
+
+    TURN_ON = 0x01
+    TURN_OFF = 0x02
+
+    INITIAL_BACKOFF = 2  # seconds
+    """
+    How long after a transmission a disagreeing ping is still considered to be in flight
+    """
+
+    MAX_BACKOFF = 120  # seconds
+    """
+    Upper limit of the time between retransmissions
+    """
+
+    LATENCY_SAMPLES = 100
+    """
+    How many command to confirmation latencies are kept for statistics
+    """
+
+    def __init__(self, outbound_bus: TransmitScheduler, nounce_manager: NounceManager):
+        self.outbound_bus = outbound_bus
+        self.nounce_manager = nounce_manager
+        self.counters: Counter = Counter()
+        self.latencies: Deque[float] = deque(maxlen=self.LATENCY_SAMPLES)
+        self.__desired: Dict[int, bool] = {}
+        self.__pending: Dict[int, PendingCommand] = {}
+        self.__lock = Lock()
+
+    def desired_state(self, address: int) -> Optional[bool]:
+        """
+        Returns whether the device at given address is meant to be working, or None if it has never been commanded
+        """
+        with self.__lock:
+            return self.__desired.get(address)
+
+    def is_pending(self, address: int) -> bool:
+        """
+        Checks whether the last command transmitted to given address still awaits confirmation
+        """
+        with self.__lock:
+            return address in self.__pending
+
+    def transmitted(self, msg: OutboundMessage) -> None:
+        """
+        Registers a message that has just been written to the radio
+        """
+        if msg.command not in (self.TURN_ON, self.TURN_OFF):
+            return
+
+        with self.__lock:
+            pending = self.__pending.get(msg.to_address)
+            if pending is not None and pending.message.encoded_data == msg.encoded_data:
+                # retransmission, the command is still awaiting confirmation since it was first sent
+                return
+
+            now = monotonic()
+            self.__desired[msg.to_address] = msg.command == self.TURN_ON
+            self.__pending[msg.to_address] = PendingCommand(msg, now, 1, now + self.INITIAL_BACKOFF)
+            self.counters["commanded"] += 1
+
+    def reported(self, address: int, is_working: bool) -> bool:
+        """
+        Registers the state reported by the device at given address. Returns True if the device is being reconciled,
+        meaning its report must not override the recorded status.
+        """
+        with self.__lock:
+            pending = self.__pending.get(address)
+            if pending is None:
+                return False
+
+            now = monotonic()
+            if is_working == self.__desired[address]:
+                del self.__pending[address]
+                self.latencies.append(now - pending.commanded_at)
+                self.counters["confirmed"] += 1
+                logging.info(
+                    "Device %#x confirmed the command after %.1f s and %d transmissions",
+                    address,
+                    now - pending.commanded_at,
+                    pending.attempts
+                )
+                return True
+
+            if now >= pending.retry_at:
+                backoff = min(self.INITIAL_BACKOFF * 2 ** pending.attempts, self.MAX_BACKOFF)
+                retry = OutboundMessage(
+                    pending.message.from_address,
+                    address,
+                    pending.message.command,
+                    self.nounce_manager.next_outbound_nounce(address),
+                    pending.message.data
+                )
+                self.__pending[address] = pending._replace(
+                    message=retry,
+                    attempts=pending.attempts + 1,
+                    retry_at=now + backoff
+                )
+                self.outbound_bus.put_nowait(retry)
+                self.counters["retransmitted"] += 1
+                logging.warning(
+                    "Device %#x reports it is %s, retransmitting command (attempt %d)",
+                    address,
+                    "on" if is_working else "off",
+                    pending.attempts + 1
+                )
+
+            return True
+
+    def median_latency(self) -> Optional[float]:
+        """
+        Returns the median time, in seconds, from a command to its confirmation, or None if nothing was confirmed yet
+        """
+        with self.__lock:
+            return statistics.median(self.latencies) if self.latencies else None
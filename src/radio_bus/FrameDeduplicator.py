@@ -0,0 +1,41 @@
+from collections import OrderedDict
+from time import monotonic
+from typing import Callable, Tuple
+from .radio.InboundMessage import InboundMessage
+
+
+class FrameDeduplicator:
+    """
+    Recognizes copies of the same frame heard by more than one gateway. Copies arrive within milliseconds of each
+    other, so a frame is only remembered for a short window - a frame with the same sender and nounce received later
+    than that is a replay, and it's up to nounce validation to reject it.
+    """
+
+    WINDOW = 2.0  # seconds
+    """
+    Default time for which a frame is remembered
+    """
+
+    def __init__(self, window: float = WINDOW, clock: Callable[[], float] = monotonic):
+        """
+        :param window: Time for which a frame is remembered, in seconds
+        :param clock: Source of monotonic time, in seconds
+        """
+        self.window = window
+        self.clock = clock
+        self.__seen: OrderedDict[Tuple[int, int], float] = OrderedDict()
+
+    def is_duplicate(self, msg: InboundMessage) -> bool:
+        """
+        Checks whether a copy of given message has been seen within the window, and remembers the message otherwise
+        """
+        now = self.clock()
+        while self.__seen and next(iter(self.__seen.values())) <= now - self.window:
+            self.__seen.popitem(last=False)
+
+        key = (msg.from_address, msg.nounce)
+        if key in self.__seen:
+            return True
+
+        self.__seen[key] = now
+        return False
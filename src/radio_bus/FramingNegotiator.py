@@ -0,0 +1,30 @@
+import logging
+from typing import Dict
+from .radio.Framing import Framing
+from .radio.InboundMessage import InboundMessage
+
+
+class FramingNegotiator:
+    """
+    Decides which framing to use when transmitting to each of the addresses. Every device understands the nibble-split
+    framing, so it's used until the device proves it understands COBS by sending an authentic COBS frame itself. The
+    framing follows the last authentic frame received, so a device that's been flashed back to the old firmware gets
+    the nibble-split framing again.
+    """
+
+    def __init__(self) -> None:
+        self.__framings: Dict[int, Framing] = {}
+
+    def observe(self, msg: InboundMessage) -> None:
+        """
+        Registers the framing of an authentic message
+        """
+        if self.__framings.get(msg.from_address, Framing.NIBBLE) != msg.framing:
+            logging.info("Switching framing of %#x to %s", msg.from_address, msg.framing.name)
+            self.__framings[msg.from_address] = msg.framing
+
+    def framing_for(self, address: int) -> Framing:
+        """
+        Returns the framing to transmit to given address in
+        """
+        return self.__framings.get(address, Framing.NIBBLE)
@@ -0,0 +1,134 @@
+import logging
+from collections import Counter
+from typing import Optional
+from secrets import MY_ADDRESS
+from persistence import NounceManager
+from .FrameDeduplicator import FrameDeduplicator
+from .PayloadRegistry import PayloadRegistry
+from .RateLimiter import RateLimiter
+from .radio.InboundMessage import InboundMessage
+
+
+class InboundValidator:
+    """
+    Validates inbound messages in stages ordered from the cheapest check to the most expensive one, so that
+    messages that get rejected anyway don't pay for hashing or looking nounces up. Counts how many messages
+    were rejected at each of the stages. Copies of the same frame heard by several gateways are dropped before nounce
+    validation, so they don't look like replays. The budget of the sender is only charged for authentic frames that
+    haven't been seen before, so neither spoofed frames nor copies and replays of genuine ones can use it up (but for
+    nounce requests, that are never checked for replays).
+    """
+
+    def __init__(
+        self,
+        registry: PayloadRegistry,
+        nounce_manager: NounceManager,
+        deduplicator: Optional[FrameDeduplicator] = None,
+        rate_limiter: Optional[RateLimiter] = None
+    ):
+        self.registry = registry
+        self.nounce_manager = nounce_manager
+        self.deduplicator = deduplicator if deduplicator is not None else FrameDeduplicator()
+        self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter()
+        self.counters: Counter = Counter()
+
+    def validate(self, msg: InboundMessage) -> Optional[InboundMessage]:
+        """
+        Returns given inbound message only if it's valid
+        """
+        self.counters["received"] += 1
+
+        stages = (
+            self.__check_header,
+            self.__check_authenticity,
+            self.__check_duplicate,
+            self.__check_nounce,
+            self.__check_rate,
+        )
+        for stage in stages:
+            rejection = stage(msg)
+            if rejection is not None:
+                self.counters[rejection] += 1
+                return None
+
+        self.counters["accepted"] += 1
+        return msg
+
+    def __check_header(self, msg: InboundMessage) -> Optional[str]:
+        """
+        Checks whether message is meant for us and comes from someone we know, looking at the header only
+        """
+        if msg.is_malformed:
+            logging.debug("Ignoring message that is too short to hold a header")
+            return "malformed"
+
+        if msg.to_address != MY_ADDRESS:
+            logging.debug('Ignoring message from %#x to %#x', msg.from_address, msg.to_address)
+            return "foreign"
+
+        if msg.from_address not in self.registry.senders:
+            logging.debug('Ignoring message %#x from unknown sender %#x', msg.command, msg.from_address)
+            return "unknown_sender"
+
+        if self.registry.get(msg.from_address, msg.command) is None:
+            logging.debug('Ignoring unknown message %#x from %#x', msg.command, msg.from_address)
+            return "unknown_command"
+
+        return None
+
+    @staticmethod
+    def __check_authenticity(msg: InboundMessage) -> Optional[str]:
+        """
+        Checks whether message has been sent by someone who knows the key
+        """
+        if not msg.is_authentic():
+            logging.warning(
+                "Received message %#x from %#x, but it could not be authenticated",
+                msg.command,
+                msg.from_address
+            )
+            return "unauthenticated"
+
+        return None
+
+    def __check_duplicate(self, msg: InboundMessage) -> Optional[str]:
+        """
+        Checks whether message is a copy of an authentic message that has been received by another gateway
+        """
+        if self.deduplicator.is_duplicate(msg):
+            logging.debug("Ignoring copy of message %#x from %#x", msg.command, msg.from_address)
+            return "duplicate"
+
+        return None
+
+    def __check_nounce(self, msg: InboundMessage) -> Optional[str]:
+        """
+        Checks whether message hasn't been repeated and registers its nounce as used
+        """
+        if msg.command == 0x00:
+            # This message is nounce request, don't validate against repetition
+            return None
+
+        if not msg.is_valid(self.nounce_manager.get_last_inbound_nounce(msg.from_address)):
+            logging.warning(
+                "Received message %#x from %#x, but its nounce %d has been used before",
+                msg.command,
+                msg.from_address,
+                msg.nounce
+            )
+            return "replayed"
+
+        self.nounce_manager.register_inbound_nounce(msg.from_address, msg.nounce)
+
+        return None
+
+    def __check_rate(self, msg: InboundMessage) -> Optional[str]:
+        """
+        Checks whether the sender hasn't used up its budget for messages of this kind
+        """
+        schema = self.registry.get(msg.from_address, msg.command)
+        if schema is not None and not self.rate_limiter.allow(msg.from_address, schema.traffic_class):
+            logging.debug("Dropping message %#x from %#x, it's over its rate limit", msg.command, msg.from_address)
+            return "rate_limited"
+
+        return None
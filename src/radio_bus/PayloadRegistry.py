@@ -0,0 +1,98 @@
+import logging
+from datetime import datetime
+from struct import Struct
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional, Set, Tuple
+from .TrafficClass import TrafficClass
+from .radio.InboundMessage import InboundMessage
+
+PayloadHandler = Callable[[InboundMessage, Tuple[Any, ...], datetime], Iterable[Any]]
+"""
+Turns the message, values unpacked from its payload and the time it has been received at into commands. Payloads of
+repeated layouts are unpacked into a tuple of records, each of them being a tuple of values.
+"""
+
+
+class PayloadSchema(NamedTuple):
+    """
+    Describes the payload of a message with given command sent by given address
+    """
+    layout: Optional[Struct]  # None if the payload is not interpreted at all
+    handler: PayloadHandler
+    repeated: bool = False  # whether the payload is any number (but at least one) of records of the layout
+    traffic_class: Optional[TrafficClass] = None  # None if the message is not rate limited
+
+
+class PayloadRegistry:
+    """
+    Keeps the schemas of all the messages we're able to handle, keyed by sender address and command, so that
+    every inbound message is dispatched to its handler with a single lookup.
+    """
+
+    def __init__(self) -> None:
+        self.__schemas: Dict[Tuple[int, int], PayloadSchema] = {}
+        self.senders: Set[int] = set()
+
+    def register(
+        self,
+        from_address: int,
+        command: int,
+        layout: Optional[str],
+        handler: PayloadHandler,
+        repeated: bool = False,
+        traffic_class: Optional[TrafficClass] = None
+    ) -> None:
+        """
+        Registers the schema of message with given command sent by given address. Layout is a struct format
+        of the payload, the payload must match its size exactly - or be a multiple of it, if the layout is repeated.
+        Traffic class tells which budget of the sender the message uses up.
+        """
+        self.__schemas[(from_address, command)] = PayloadSchema(
+            Struct(layout) if layout is not None else None,
+            handler,
+            repeated,
+            traffic_class
+        )
+        self.senders.add(from_address)
+
+    def get(self, from_address: int, command: int) -> Optional[PayloadSchema]:
+        """
+        Returns the schema of message with given command sent by given address, if there is any
+        """
+        return self.__schemas.get((from_address, command))
+
+    def dispatch(self, msg: InboundMessage, received_at: datetime) -> Iterable[Any]:
+        """
+        Unpacks the payload of given message and returns the commands its handler creates
+        """
+        schema = self.__schemas.get((msg.from_address, msg.command))
+        if schema is None:
+            return ()
+
+        if schema.layout is None:
+            return schema.handler(msg, (), received_at)
+
+        payload = msg.extended_bytes_view
+        if schema.repeated:
+            if len(payload) == 0 or len(payload) % schema.layout.size != 0:
+                logging.warning(
+                    "Ignoring message %#x from %#x: expected a multiple of %d bytes, got %d",
+                    msg.command,
+                    msg.from_address,
+                    schema.layout.size,
+                    len(payload)
+                )
+                return ()
+
+            return schema.handler(msg, tuple(schema.layout.iter_unpack(payload)), received_at)
+
+        if len(payload) != schema.layout.size:
+            logging.warning(
+                "Ignoring message %#x from %#x: expected %d bytes, got %d",
+                msg.command,
+                msg.from_address,
+                schema.layout.size,
+                len(payload)
+            )
+            return ()
+
+        return schema.handler(msg, schema.layout.unpack_from(payload), received_at)
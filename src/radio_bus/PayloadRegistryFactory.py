@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Any, List, Tuple
+from domain_types import DeviceKind, MeasureKind
+from persistence import SensorMeasure
+from .ActuatorReconciler import ActuatorReconciler
+from .PayloadRegistry import PayloadRegistry
+from .TrafficClass import TrafficClass
+from .radio.InboundMessage import InboundMessage
+
+
+def create_payload_registry(reconciler: ActuatorReconciler) -> PayloadRegistry:
+    """
+    Returns registry with schemas of all the messages sent by known devices and sensors
+    """
+    registry = PayloadRegistry()
+
+    for address in [kind.value for kind in DeviceKind] + [kind.value for kind in MeasureKind]:
+        registry.register(address, 0x00, None, handle_nounce_request, traffic_class=TrafficClass.NOUNCE_REQUEST)
+
+    for device_kind in DeviceKind:
+        registry.register(
+            device_kind.value,
+            0x01,
+            "?",
+            partial(handle_ping, reconciler),
+            traffic_class=TrafficClass.PING
+        )
+
+    measure = TrafficClass.MEASURE
+    registry.register(MeasureKind.LIVING_ROOM.value, 0x01, "<fff", handle_indoor_measure, traffic_class=measure)
+    registry.register(MeasureKind.BEDROOM.value, 0x01, "<fff", handle_indoor_measure, traffic_class=measure)
+    registry.register(MeasureKind.OUTDOOR.value, 0x01, "<ff", handle_outdoor_measure, traffic_class=measure)
+
+    # batches of readings buffered by the sensor, each with the number of seconds it was taken before sending
+    registry.register(MeasureKind.LIVING_ROOM.value, 0x02, "<Hfff", handle_indoor_measures, True, measure)
+    registry.register(MeasureKind.BEDROOM.value, 0x02, "<Hfff", handle_indoor_measures, True, measure)
+    registry.register(MeasureKind.OUTDOOR.value, 0x02, "<Hff", handle_outdoor_measures, True, measure)
+
+    return registry
+
+
+def handle_nounce_request(msg: InboundMessage, _values: Tuple[Any, ...], _received_at: datetime) -> List[Any]:
+    """
+    Handles nounce request from device
+    """
+    from command_bus import RespondNounceRequest
+    return [RespondNounceRequest(msg.from_address)]
+
+
+def handle_ping(
+    reconciler: ActuatorReconciler,
+    msg: InboundMessage,
+    values: Tuple[Any, ...],
+    received_at: datetime
+) -> List[Any]:
+    """
+    Handles ping message from device. The reported status is recorded only if the device isn't being reconciled
+    with a command sent to it, otherwise the ping is the confirmation (or lack of it) of that command.
+    """
+    from command_bus import EvaluateDevice, RecordDeviceStatus, SavePing
+
+    device_kind = DeviceKind(msg.from_address)
+    [is_working] = values
+    commands: List[Any] = []
+    if not reconciler.reported(msg.from_address, is_working):
+        commands.append(RecordDeviceStatus(device_kind, is_working))
+
+    commands.append(SavePing(device_kind, received_at))
+    commands.append(EvaluateDevice(device_kind))
+    return commands
+
+
+def handle_indoor_measure(msg: InboundMessage, values: Tuple[Any, ...], received_at: datetime) -> List[Any]:
+    """
+    Handles indoor measure
+    """
+    from command_bus import EvaluateMeasure, SaveMeasure
+
+    [temperature, humidity, voltage] = values
+    measure = SensorMeasure(received_at, MeasureKind(msg.from_address), temperature, humidity, voltage)
+    return [SaveMeasure(measure), EvaluateMeasure(measure)]
+
+
+def handle_outdoor_measure(msg: InboundMessage, values: Tuple[Any, ...], received_at: datetime) -> List[Any]:
+    """
+    Handles outdoor measure
+    """
+    from command_bus import SaveMeasure
+
+    [temperature, voltage] = values
+    return [SaveMeasure(SensorMeasure(received_at, MeasureKind(msg.from_address), temperature, None, voltage))]
+
+
+def handle_indoor_measures(msg: InboundMessage, values: Tuple[Any, ...], received_at: datetime) -> List[Any]:
+    """
+    Handles a batch of indoor measures, only the newest of them is evaluated
+    """
+    from command_bus import EvaluateMeasure, SaveMeasures
+
+    kind = MeasureKind(msg.from_address)
+    measures = [
+        SensorMeasure(received_at - timedelta(seconds=age), kind, temperature, humidity, voltage)
+        for [age, temperature, humidity, voltage] in values
+    ]
+    newest = max(measures, key=lambda measure: measure.timestamp)
+    return [SaveMeasures(measures), EvaluateMeasure(newest)]
+
+
+def handle_outdoor_measures(msg: InboundMessage, values: Tuple[Any, ...], received_at: datetime) -> List[Any]:
+    """
+    Handles a batch of outdoor measures
+    """
+    from command_bus import SaveMeasures
+
+    kind = MeasureKind(msg.from_address)
+    return [SaveMeasures([
+        SensorMeasure(received_at - timedelta(seconds=age), kind, temperature, None, voltage)
+        for [age, temperature, voltage] in values
+    ])]
@@ -2,213 +2,211 @@ import logging
 import traceback
 from datetime import datetime
 from queue import Empty, Queue
-from struct import unpack
-from threading import Event
-from typing import Optional, Type
-from secrets import MY_ADDRESS
-from sqlalchemy.orm import Session, sessionmaker
-from domain_types import DeviceKind, MeasureKind
-from persistence import NounceRepository, SensorMeasure
+from threading import Event, Lock
+from time import monotonic
+from typing import Any, Dict, Optional, Sequence, Type
+from domain_types import MeasureKind
+from persistence import NounceManager
+from .AbstractGateway import AbstractGateway
+from .ActuatorReconciler import ActuatorReconciler
+from .FramingNegotiator import FramingNegotiator
+from .InboundValidator import InboundValidator
+from .PayloadRegistryFactory import create_payload_registry
+from .RateLimiter import RateLimiter
+from .SlotSchedule import SlotSchedule
+from .SlotTracker import SlotTracker
+from .TransmitScheduler import TransmitScheduler
+from .radio.FrameParser import Frame
 from .radio.InboundMessage import InboundMessage
 from .radio.OutboundMessage import OutboundMessage
-from .radio.Radio import Radio
-from .radio.MessageStartMarker import MESSAGE_START_MARKER
 
 
 class RadioController:
     """
-    Class that is responsible for receiving and interpreting data through radio.
+    Class that is responsible for receiving and interpreting data through radio gateways, as well as transmitting
+    outbound messages. Every gateway receives independently, while transmitting goes through the gateway that has
+    most recently heard the recipient. Actuator commands are reconciled with the status devices report in their pings.
+    """
+
+    STATISTICS_INTERVAL = 900  # seconds
+    """
+    How often statistics of received and transmitted frames are logged
     """
 
     def __init__(
         self,
-        radio: Radio,
-        outbound_bus: Queue,
+        gateways: Sequence[AbstractGateway],
+        outbound_bus: TransmitScheduler,
         command_bus: Queue,
         time_source: Type[datetime],
         stop: Event,
-        db_session_factory: sessionmaker[Session]  # pylint: disable=E1136
+        nounce_manager: NounceManager,
+        rate_limiter: Optional[RateLimiter] = None,
+        reporting_intervals: Optional[Dict[int, int]] = None
     ):
-        self.radio = radio
+        """
+        :param reporting_intervals: Reporting intervals most recently sent to the sensors, in seconds, keyed by their
+        addresses; sensors missing here are expected to report every cycle
+        """
+        if not gateways:
+            raise ValueError("At least one gateway is needed")
+
+        self.gateways = gateways
         self.outbound_bus = outbound_bus
         self.command_bus = command_bus
         self.time_source = time_source
         self.stop = stop
-        self.db_session_factory = db_session_factory
+        self.nounce_manager = nounce_manager
+        self.reconciler = ActuatorReconciler(outbound_bus, nounce_manager)
+        self.registry = create_payload_registry(self.reconciler)
+        self.validator = InboundValidator(self.registry, nounce_manager, rate_limiter=rate_limiter)
+        self.framings = FramingNegotiator()
+        self.outbound_bus.framing_for = self.framings.framing_for
+        # only sensors report on a schedule, actuators ping whenever they please and aren't told otherwise
+        reporting_intervals = reporting_intervals or {}
+        self.slots = SlotTracker(
+            SlotSchedule(
+                {
+                    kind.value: reporting_intervals.get(kind.value, SlotSchedule.REPORTING_INTERVAL)
+                    for kind in MeasureKind
+                    if kind.value in self.registry.senders
+                },
+                cycle=SlotSchedule.REPORTING_INTERVAL
+            )
+        )
+        self.__routes: Dict[int, AbstractGateway] = {}
+        self.__lock = Lock()
+        self.__next_statistics = monotonic() + self.STATISTICS_INTERVAL
 
-    def run(self) -> None:
+    def run_receiver(self, gateway: AbstractGateway) -> None:
         """
-        Run the receiving process. This is meant to be run in a separate thread, as it's blocking
+        Run the receiving process of given gateway. This is meant to be run in a separate thread for each of the
+        gateways, as it's blocking. Receiving never waits on the outbound bus, so frames are read off the UART as soon
+        as they arrive.
         """
         while not self.stop.is_set():
+            self.receive(gateway)
+
+    def receive(self, gateway: AbstractGateway) -> None:
+        """
+        Receives whatever given gateway has got and handles the frames completed by it. Doesn't wait for anything when
+        the gateway has got something already, e.g. once its file descriptor is readable.
+        """
+        try:
+            frames = gateway.receive()
+        except Exception:
+            logging.error(traceback.format_exc())
+            return
+
+        for frame in frames:
             try:
-                inbound = self.get_validated_message()
-                if inbound is not None:
-                    self.handle_nounce_request(inbound)
-                    self.handle_ping(inbound)
-                    self.handle_indoor_measure(inbound)
-                    self.handle_outdoor_measure(inbound)
-
-                outbound = self.outbound_bus.get(timeout=3)
-                if isinstance(outbound, OutboundMessage):
-                    self.radio.send(outbound)
-                    self.outbound_bus.task_done()
-            except Empty:
-                continue
+                self.handle_frame(frame, gateway)
             except Exception:
                 logging.error(traceback.format_exc())
 
-    def get_validated_message(self) -> Optional[InboundMessage]:
+    def handle_frame(self, frame: Frame, gateway: AbstractGateway) -> None:
         """
-        Attempts to receive an inbound message from radio returns it only if it's valid
+        Validates and handles a single frame received by given gateway, whatever its transport is. Gateways receive
+        concurrently, so frames are handled one at a time.
         """
-        msg = self.get_next_message()
+        with self.__lock:
+            self.__handle_frame(frame, gateway)
 
-        if msg is None:
-            return None
-
-        if msg.to_address != MY_ADDRESS:
-            logging.info(
-                'Ignoring message from %#x to %#x (with %d bytes)',
-                msg.from_address,
-                msg.to_address,
-                msg.extended_bytes_length
-            )
-            return None
-
-        if msg.command == 0x00 and msg.is_valid(-1):
-            # This message is nounce request, don't validate against repetition
-            return msg
-
-        with self.db_session_factory() as db_session:
-            nounce_repository = NounceRepository(db_session)
-            if not msg.is_valid(nounce_repository.get_last_inbound_nounce(msg.from_address)):
-                logging.warning(
-                    "Received message %#x from %#x, but it could not be authenticated",
-                    msg.command,
-                    msg.from_address
-                )
-                return None
-
-            nounce_repository.register_inbound_nounce(msg.from_address, msg.nounce)
-            db_session.commit()
-        return msg
-
-    def get_next_message(self) -> Optional[InboundMessage]:
+    def __handle_frame(self, frame: Frame, gateway: AbstractGateway) -> None:
         """
-        Attempts to receive an inbound message from radio
+        Validates and handles a single frame received by given gateway
         """
-        self.radio.serial.timeout = 1
-        while True:
-            marker = self.radio.serial.read(1)
-
-            if len(marker) == 0:
-                # timeout waiting for marker
-                return None
-
-            if marker == MESSAGE_START_MARKER:
-                # start marker received, continue
-                break
-
-        self.radio.serial.timeout = 5
-        size = self.radio.serial.read(1)
-        if len(size) != 1:
-            logging.warning("Message start received, but then timed out on waiting for message size")
-            # timeout on reading the message length
-            return None
-
-        size = int.from_bytes(size, byteorder="little", signed=False)
-        msg = InboundMessage.receive_from_radio(self.radio, size)
-        if msg is None:
-            logging.warning("Unable to read message of size %d from radio", size)
-            return None
-
-        return msg
-
-    def handle_nounce_request(self, msg: InboundMessage) -> None:
+        inbound = self.validator.validate(InboundMessage(frame.data, frame.framing))
+        if inbound is not None:
+            if self.__routes.get(inbound.from_address) is not gateway:
+                logging.info("Routing messages to %#x through %s", inbound.from_address, gateway.name)
+                self.__routes[inbound.from_address] = gateway
+            gateway.heard(inbound.from_address, frame.origin)
+
+            self.framings.observe(inbound)
+            for command in self.registry.dispatch(inbound, self.time_source.now()):
+                self.command_bus.put_nowait(command)
+
+            # nodes asking for nounces are (re)starting, they'll get their slot once they're done with that
+            if inbound.command != 0x00 and self.slots.observe(inbound.from_address, monotonic()):
+                from command_bus import AssignTransmitSlot
+                self.command_bus.put_nowait(AssignTransmitSlot(inbound.from_address, self.slots.schedule))
+
+    def gateway_for(self, address: int) -> AbstractGateway:
         """
-        Handle message, if it is a nounce request from device
+        Returns the gateway that has most recently heard given address, or the first one if none has
         """
-        if msg.command != 0x00:
-            return
-
-        from command_bus import RespondNounceRequest
-        self.command_bus.put_nowait(RespondNounceRequest(msg.from_address))
+        return self.__routes.get(address, self.gateways[0])
 
-    def handle_ping(self, msg: InboundMessage) -> None:
+    def run_transmitter(self) -> None:
         """
-        Handle message, if it is a ping message from device
+        Run the transmitting process. This is meant to be run in a separate thread, as it's blocking. Messages are
+        written to the radio as soon as they appear on the outbound bus and the channel is quiet, independently of
+        the receiving process. Radio gateways share the frequency, so a single transmitter serves all of them.
         """
-        if msg.from_address not in [DeviceKind.HEATING.value, DeviceKind.COOLING.value] or msg.command != 0x01:
-            return
-
-        if msg.extended_bytes_length != 1:
-            logging.warning(
-                "Ignoring message %#x from %#x: expected 1 byte, got %d",
-                msg.command,
-                msg.from_address,
-                msg.extended_bytes_length
-            )
-            return
-
-        device_kind = DeviceKind(msg.from_address)
-        [is_working] = unpack('?', msg.extended_bytes)
-        from command_bus import RecordDeviceStatus
-        self.command_bus.put_nowait(RecordDeviceStatus(device_kind, is_working))
-
-        from command_bus import SavePing
-        self.command_bus.put_nowait(SavePing(device_kind, self.time_source.now()))
+        while not self.stop.is_set():
+            if monotonic() >= self.__next_statistics:
+                self.__next_statistics += self.STATISTICS_INTERVAL
+                self.log_statistics()
 
-        from command_bus import EvaluateDevice
-        self.command_bus.put_nowait(EvaluateDevice(device_kind))
+            try:
+                self.transmit(self.outbound_bus.get(timeout=1))
+                self.outbound_bus.task_done()
+            except Empty:
+                continue
+            except Exception:
+                logging.error(traceback.format_exc())
 
-    def handle_indoor_measure(self, msg: InboundMessage) -> None:
+    def transmit(self, outbound: Any) -> None:
         """
-        Handle message, if it is indoor measure
+        Sends given message taken off the outbound bus through the gateway that has most recently heard its recipient
         """
-        if msg.from_address not in [MeasureKind.LIVING_ROOM.value, MeasureKind.BEDROOM.value] or msg.command != 0x01:
-            return
+        if isinstance(outbound, OutboundMessage):
+            self.gateway_for(outbound.to_address).send(outbound, self.framings.framing_for(outbound.to_address))
+            self.reconciler.transmitted(outbound)
+            self.slots.transmitted(outbound)
 
-        if msg.extended_bytes_length != 12:
-            logging.warning(
-                "Ignoring message %#x from %#x: expected 12 bytes, got %d",
-                msg.command,
-                msg.from_address,
-                msg.extended_bytes_length
+    async def transmit_async(self, outbound: Any) -> None:
+        """
+        Sends given message taken off the outbound bus like transmit does, without blocking the event loop while the
+        channel is busy
+        """
+        if isinstance(outbound, OutboundMessage):
+            await self.gateway_for(outbound.to_address).send_async(
+                outbound,
+                self.framings.framing_for(outbound.to_address)
             )
-            return
-
-        [temperature, humidity, voltage] = unpack("<fff", msg.extended_bytes)
-        measure = SensorMeasure(
-            self.time_source.now(), MeasureKind(msg.from_address), temperature, humidity, voltage
-        )
-
-        from command_bus import SaveMeasure
-        self.command_bus.put_nowait(SaveMeasure(measure))
+            self.reconciler.transmitted(outbound)
+            self.slots.transmitted(outbound)
 
-        from command_bus import EvaluateMeasure
-        self.command_bus.put_nowait(EvaluateMeasure(measure))
-
-    def handle_outdoor_measure(self, msg: InboundMessage) -> None:
+    def log_statistics(self) -> None:
         """
-        Handle message, if it is outdoor measure
+        Logs how many inbound frames have been received and at which stage they were rejected
         """
-        if msg.from_address != MeasureKind.OUTDOOR.value or msg.command != 0x01:
-            return
-
-        if msg.extended_bytes_length != 8:
-            logging.warning(
-                "Ignoring message %#x from %#x: expected 8 bytes, got %d",
-                msg.command,
-                msg.from_address,
-                msg.extended_bytes_length
+        logging.info(
+            "Inbound frames: %s; rate limited: %s",
+            ", ".join(f"{stage:s}={count:d}" for stage, count in sorted(self.validator.counters.items())),
+            ", ".join(f"{name:s}={count:d}" for name, count in sorted(self.validator.rate_limiter.counters.items()))
+        )
+        for gateway in self.gateways:
+            logging.info(
+                "Gateway %s: %s",
+                gateway.name,
+                ", ".join(f"{name:s}={count:d}" for name, count in sorted(gateway.counters.items()))
             )
-            return
-
-        [temperature, voltage] = unpack("<ff", msg.extended_bytes)
-        measure = SensorMeasure(
-            self.time_source.now(), MeasureKind(msg.from_address), temperature, None, voltage
+        logging.info(
+            "Outbound frames: %s; queue depth: %d, airtime: %.2f s/min",
+            ", ".join(f"{name:s}={count:d}" for name, count in sorted(self.outbound_bus.counters.items())),
+            self.outbound_bus.qsize(),
+            self.outbound_bus.airtime_per_minute()
+        )
+        logging.info(
+            "Inbound slots: %s",
+            ", ".join(f"{name:s}={count:d}" for name, count in sorted(self.slots.counters.items()))
+        )
+        median_latency = self.reconciler.median_latency()
+        logging.info(
+            "Actuator commands: %s; median confirmation latency: %s",
+            ", ".join(f"{name:s}={count:d}" for name, count in sorted(self.reconciler.counters.items())),
+            "n/a" if median_latency is None else f"{median_latency:.1f} s"
         )
-
-        from command_bus import SaveMeasure
-        self.command_bus.put_nowait(SaveMeasure(measure))
@@ -0,0 +1,32 @@
+import logging
+from typing import Optional
+from .capture.CaptureWriter import CaptureWriter
+from .radio.AbstractRadio import AbstractRadio
+from .radio.Radio import Radio
+from .virtual.Hc12Emulator import Hc12Emulator
+from .virtual.PtySerial import PtySerial
+from .virtual.VirtualRadio import VirtualRadio
+
+RADIO_BACKENDS = ("hc12", "pty", "emulator")
+
+
+def create_radio(spec: str, capture: Optional[CaptureWriter] = None) -> AbstractRadio:
+    """
+    Creates the radio for given spec, which is the backend optionally followed by its settings:
+    - hc12[:<serial device>[:<GPIO pin of SET>]] is the HC-12 adapter attached to the serial port and GPIO, by default
+      /dev/serial0 and pin 17,
+    - pty is a pseudo-terminal, the other end of which acts as the air,
+    - emulator is an emulated HC-12 adapter that transmits over a pseudo-terminal.
+    """
+    backend, *settings = spec.split(":")
+    if backend == "hc12" and len(settings) <= 2:
+        serial_device = settings[0] if settings else "/dev/serial0"
+        set_pin = int(settings[1]) if len(settings) > 1 else 17
+        return Radio(serial_device, set_pin, capture)
+
+    if backend not in RADIO_BACKENDS or settings:
+        raise ValueError(f"Unknown radio {spec}")
+
+    pty = PtySerial(AbstractRadio.READ_TIMEOUT)
+    logging.info('Virtual radio (%s) is on the air at %s', backend, pty.device)
+    return VirtualRadio(Hc12Emulator(pty) if backend == "emulator" else pty, capture)
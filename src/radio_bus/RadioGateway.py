@@ -0,0 +1,66 @@
+from typing import Dict, List, Optional
+from .AbstractGateway import AbstractGateway
+from .radio.AbstractRadio import AbstractRadio
+from .radio.ChannelMonitor import ChannelMonitor
+from .radio.FrameParser import Frame, FrameParser
+from .radio.Framing import Framing
+from .radio.OutboundMessage import OutboundMessage
+
+
+class RadioGateway(AbstractGateway):
+    """
+    A radio through which the controller talks to the devices within its range. Every radio gateway has its own
+    stream of bytes to parse and its own view of the channel.
+    """
+
+    def __init__(self, name: str, radio: AbstractRadio, channel: Optional[ChannelMonitor] = None):
+        """
+        :param name: Name of the gateway used in logs
+        :param radio: The radio of the gateway
+        :param channel: Listen-before-talk for the radio, with default settings if not given
+        """
+        super().__init__(name)
+        self.radio = radio
+        self.parser = FrameParser()
+        self.channel = channel if channel is not None else ChannelMonitor()
+
+    def receive(self) -> List[Frame]:
+        """
+        Receives whatever the radio has got and returns the frames completed by it
+        """
+        data = self.radio.receive()
+        frames = self.parser.feed(data)
+        self.channel.observe(len(data), self.parser.in_frame)
+
+        return frames
+
+    def send(self, msg: OutboundMessage, framing: Framing) -> None:
+        """
+        Sends the message as soon as the channel is quiet
+        """
+        self.channel.wait_until_quiet()
+        self.radio.send(msg, framing)
+
+    async def send_async(self, msg: OutboundMessage, framing: Framing) -> None:
+        """
+        Sends the message as soon as the channel is quiet, waiting for it without blocking the event loop
+        """
+        await self.channel.wait_until_quiet_async()
+        self.radio.send(msg, framing)
+
+    def fileno(self) -> Optional[int]:
+        """
+        Returns the file descriptor of the serial port of the radio, if it has one
+        """
+        return self.radio.fileno()
+
+    @property
+    def counters(self) -> Dict[str, int]:
+        """
+        Returns the statistics of the byte stream and the channel
+        """
+        return {
+            "resynchronizations": self.parser.resynchronizations,
+            "discarded_bytes": self.parser.discarded_bytes,
+            **self.channel.counters,
+        }
@@ -0,0 +1,68 @@
+from collections import Counter
+from time import monotonic
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+from .TokenBucket import TokenBucket
+from .TrafficClass import TrafficClass
+
+
+class Budget(NamedTuple):
+    """
+    How many frames of a traffic class a single sender may send: rate per second in the long run and the burst
+    """
+    rate: float
+    burst: int
+
+
+class RateLimiter:
+    """
+    Limits how many frames of each traffic class every sender may send, with a token bucket per sender and class.
+    A rebooting or misbehaving node flooding the channel then can't starve handling frames of the others. Traffic
+    classes without a budget are not limited.
+    """
+
+    DEFAULT_BUDGETS: Dict[TrafficClass, Budget] = {
+        TrafficClass.NOUNCE_REQUEST: Budget(1 / 60, 5),
+        TrafficClass.PING: Budget(1 / 5, 10),
+        TrafficClass.MEASURE: Budget(1 / 10, 10),
+    }
+
+    def __init__(
+        self,
+        budgets: Optional[Dict[TrafficClass, Budget]] = None,
+        clock: Callable[[], float] = monotonic
+    ):
+        """
+        :param budgets: Budget of each traffic class, the default ones if not given
+        :param clock: Source of monotonic time, in seconds
+        """
+        self.budgets = budgets if budgets is not None else self.DEFAULT_BUDGETS
+        self.clock = clock
+        self.counters: Counter = Counter()
+        self.__buckets: Dict[Tuple[int, TrafficClass], TokenBucket] = {}
+
+    def allow(self, address: int, traffic_class: Optional[TrafficClass]) -> bool:
+        """
+        Checks whether a frame of given traffic class sent by given address fits in its budget, and uses the budget up
+        """
+        if traffic_class is None or traffic_class not in self.budgets:
+            return True
+
+        now = self.clock()
+        bucket = self.__buckets.get((address, traffic_class))
+        if bucket is None:
+            budget = self.budgets[traffic_class]
+            bucket = self.__buckets[(address, traffic_class)] = TokenBucket(budget.rate, budget.burst, now)
+
+        if bucket.take(now):
+            return True
+
+        self.counters[traffic_class.value] += 1
+        return False
+
+    @staticmethod
+    def parse_budget(spec: str) -> Tuple[TrafficClass, Budget]:
+        """
+        Parses the budget given as <traffic class>:<rate per second>:<burst>, e.g. measure:0.1:10
+        """
+        traffic_class, rate, burst = spec.split(":")
+        return TrafficClass(traffic_class), Budget(float(rate), int(burst))
@@ -0,0 +1,105 @@
+from math import ceil
+from time import monotonic
+from typing import Dict, NamedTuple, Optional
+
+
+class Slot(NamedTuple):
+    """
+    Time slot assigned to a single node
+    """
+    offset: float  # seconds since the start of the cycle
+    length: float  # seconds
+    interval: int  # seconds between the node's transmissions, a multiple of the cycle
+
+
+class SlotSchedule:
+    """
+    Divides the channel time into cycles as long as the shortest reporting interval, and every cycle into evenly spread
+    slots, one for each of the nodes. A node reporting less often uses its slot only in every n-th cycle.
+    """
+
+    REPORTING_INTERVAL = 60  # seconds
+    """
+    Default interval between reports of a single node
+    """
+
+    SLOT_LENGTH = 0.25  # seconds
+    """
+    Default length of a slot - airtime of a typical frame, plus margin for clock drift and transmit queueing
+    """
+
+    def __init__(
+        self,
+        intervals: Dict[int, int],
+        slot_length: float = SLOT_LENGTH,
+        epoch: Optional[float] = None,
+        cycle: Optional[int] = None
+    ):
+        """
+        :param intervals: Reporting intervals of the nodes, in seconds, keyed by their addresses
+        :param slot_length: Length of every slot, in seconds
+        :param epoch: Monotonic time at which the first cycle starts, now if not given
+        :param cycle: Length of the cycle, in seconds, the shortest of the intervals if not given
+        """
+        if not intervals:
+            raise ValueError("Slot schedule needs at least one node")
+
+        self.cycle = min(intervals.values()) if cycle is None else cycle
+        self.slot_length = slot_length
+        self.epoch = monotonic() if epoch is None else epoch
+        self.spacing = self.cycle / len(intervals)
+        if self.spacing < slot_length:
+            raise ValueError(f"{len(intervals):d} slots of {slot_length:.3f} s don't fit in {self.cycle:d} s cycle")
+
+        # intervals are rounded to whole cycles, so that a node always transmits in the same part of the cycle
+        self.__owners = sorted(intervals)
+        self.__slots = {
+            address: Slot(index * self.spacing, slot_length, self.__round_interval(intervals[address]))
+            for index, address in enumerate(self.__owners)
+        }
+
+    def slot_of(self, address: int) -> Optional[Slot]:
+        """
+        Returns the slot assigned to given address, if there is any
+        """
+        return self.__slots.get(address)
+
+    def set_interval(self, address: int, interval: int) -> None:
+        """
+        Changes the reporting interval of given address, if it's got a slot. The slot itself stays where it is.
+        """
+        slot = self.__slots.get(address)
+        if slot is not None:
+            self.__slots[address] = slot._replace(interval=self.__round_interval(interval))
+
+    def slot_at(self, at: float) -> Optional[int]:
+        """
+        Returns the address owning the slot that given time falls in, or None if it falls between the slots
+        """
+        phase = (at - self.epoch) % self.cycle
+        index = int(phase // self.spacing)
+        if index < len(self.__owners) and phase - index * self.spacing < self.slot_length:
+            return self.__owners[index]
+
+        return None
+
+    def is_in_slot(self, address: int, at: float) -> bool:
+        """
+        Checks whether given time falls in the slot of given address, in a cycle the address is meant to use
+        """
+        slot = self.__slots.get(address)
+        return slot is not None and (at - self.epoch - slot.offset) % slot.interval < slot.length
+
+    def next_slot_start(self, address: int, now: float) -> float:
+        """
+        Returns the time the next slot of given address starts at
+        """
+        slot = self.__slots[address]
+        start = self.epoch + slot.offset
+        return start + max(0, ceil((now - start) / slot.interval)) * slot.interval
+
+    def __round_interval(self, interval: int) -> int:
+        """
+        Rounds given interval to whole cycles
+        """
+        return self.cycle * max(1, round(interval / self.cycle))
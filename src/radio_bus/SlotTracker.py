@@ -0,0 +1,66 @@
+from collections import Counter
+from struct import unpack
+from typing import Dict
+from .SlotSchedule import SlotSchedule
+from .radio.OutboundMessage import OutboundMessage
+
+
+class SlotTracker:
+    """
+    Keeps track of the slots inbound frames arrive in, and decides when a node needs to be told about its slot -
+    when it transmits outside of it. Nodes that don't keep to their slots after a few assignments are considered
+    to be running firmware that doesn't support slots, and are left alone. Reporting intervals sent to the nodes
+    are fed into the schedule, and a node that keeps to its slot is fine whichever cycle it uses the slot in - the
+    slot is reserved for it in every cycle, and the node keeps its own phase when told to report less often.
+    """
+
+    ADJUST_REPORTING_INTERVAL = 0x04
+
+    MAX_ASSIGNMENTS = 3
+    """
+    How many times in a row a node is assigned its slot before giving up
+    """
+
+    def __init__(self, schedule: SlotSchedule):
+        self.schedule = schedule
+        self.counters: Counter = Counter()
+        self.__assignments: Dict[int, int] = {}
+        self.__assigned_at: Dict[int, float] = {}
+
+    def observe(self, address: int, at: float) -> bool:
+        """
+        Registers a frame from given address that has arrived at given time. Returns True if the node should be
+        assigned its slot.
+        """
+        slot = self.schedule.slot_of(address)
+        if slot is None:
+            self.counters["unscheduled"] += 1
+            return False
+
+        if self.schedule.slot_at(at) == address:
+            self.counters["in_slot"] += 1
+            self.__assignments[address] = 0
+            return False
+
+        owner = self.schedule.slot_at(at)
+        self.counters["between_slots" if owner is None else "in_foreign_slot"] += 1
+
+        assignments = self.__assignments.get(address, 0)
+        if assignments >= self.MAX_ASSIGNMENTS:
+            return False
+
+        if address in self.__assigned_at and at - self.__assigned_at[address] < slot.interval:
+            # the last assignment hasn't had a chance to take effect yet
+            return False
+
+        self.__assignments[address] = assignments + 1
+        self.__assigned_at[address] = at
+        self.counters["assigned"] += 1
+        return True
+
+    def transmitted(self, msg: OutboundMessage) -> None:
+        """
+        Registers a message that has just been written to the radio
+        """
+        if msg.command == self.ADJUST_REPORTING_INTERVAL and msg.data is not None and len(msg.data) == 2:
+            self.schedule.set_interval(msg.to_address, unpack("<H", msg.data)[0])
@@ -0,0 +1,28 @@
+class TokenBucket:
+    """
+    Token bucket that refills at a steady rate up to its capacity, so it allows bursts of given size, but no more than
+    the rate in the long run
+    """
+
+    def __init__(self, rate: float, burst: int, now: float):
+        """
+        :param rate: Tokens added per second
+        :param burst: Capacity of the bucket
+        :param now: Current monotonic time, in seconds
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = now
+
+    def take(self, now: float) -> bool:
+        """
+        Takes a token out of the bucket, if there is any
+        """
+        self.tokens = min(float(self.burst), self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        if self.tokens < 1:
+            return False
+
+        self.tokens -= 1
+        return True
@@ -0,0 +1,10 @@
+from enum import Enum
+
+
+class TrafficClass(Enum):
+    """
+    Kinds of inbound traffic that are rate limited separately
+    """
+    NOUNCE_REQUEST = "nounce_request"
+    PING = "ping"
+    MEASURE = "measure"
@@ -0,0 +1,218 @@
+from collections import Counter, deque
+from queue import Empty, Queue
+from time import monotonic
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional, Tuple
+from .radio.Framing import Framing
+from .radio.OutboundMessage import OutboundMessage
+
+
+class ScheduledFrame(NamedTuple):
+    """
+    Outbound message waiting in the transmit scheduler
+    """
+    due: float
+    priority: int
+    sequence: int
+    message: Any
+
+
+class TransmitScheduler(Queue):
+    """
+    Outbound bus that decides which message goes on the air next. Actuator commands go before anything else and
+    nounce replies go last. A queued on / off command is dropped when a newer one for the same device is queued, and
+    repeats of an identical frame are spaced out rather than sent back to back. Keeps track of the airtime spent.
+    """
+
+    BAUDRATE = 4800
+    """
+    Baudrate of the radio, 10 bits on the air per byte (8N1)
+    """
+
+    REPEAT_SPACING = 0.5  # seconds
+    """
+    Default time between transmissions of an identical frame
+    """
+
+    PRIORITY_ACTUATOR = 0
+    PRIORITY_DEFAULT = 1
+    PRIORITY_NOUNCE_REPLY = 2
+
+    ACTUATOR_COMMANDS = (0x01, 0x02)
+    """
+    Turn on and turn off commands, the newer one always supersedes the older
+    """
+
+    def __init__(self, repeat_spacing: float = REPEAT_SPACING):
+        """
+        :param repeat_spacing: Time between transmissions of an identical frame, in seconds
+        """
+        self.repeat_spacing = repeat_spacing
+        self.counters: Counter = Counter()
+        # called whenever something is queued, e.g. to wake up an event loop waiting for it
+        self.on_put: Optional[Callable[[], Any]] = None
+        # framing each of the addresses is transmitted in, replaced by whoever negotiates it
+        self.framing_for: Callable[[int], Framing] = lambda address: Framing.NIBBLE
+        super().__init__()
+
+    # pylint: disable=W0201
+    def _init(self, maxsize: int) -> None:
+        """
+        Initializes the underlying storage, called by the Queue constructor
+        """
+        self.__frames: List[ScheduledFrame] = []
+        self.__sequence = 0
+        self.__last_due: Dict[bytes, float] = {}
+        self.__airtime_log: Deque[Tuple[float, float]] = deque()
+
+    def _qsize(self) -> int:
+        """
+        Returns the number of queued frames, including repeats that aren't due yet
+        """
+        return len(self.__frames)
+
+    def _put(self, item: Any) -> None:
+        """
+        Schedules given message, dropping the frames it supersedes
+        """
+        now = monotonic()
+        priority = self.PRIORITY_DEFAULT
+        due = now
+
+        if isinstance(item, OutboundMessage):
+            if any(self.__supersedes(frame.message, item) for frame in self.__frames):
+                # a retransmission of a command that has been superseded already, Queue.put counts it nevertheless
+                self.unfinished_tasks -= 1
+                self.counters["superseded"] += 1
+                return
+
+            priority = self.priority_of(item)
+            superseded = [frame for frame in self.__frames if self.__supersedes(item, frame.message)]
+            if superseded:
+                self.__frames = [frame for frame in self.__frames if frame not in superseded]
+                # dropped frames will never be taken off the queue, so they're done already
+                self.unfinished_tasks -= len(superseded)
+                self.counters["superseded"] += len(superseded)
+
+            self.__last_due = {data: at for data, at in self.__last_due.items() if at + self.repeat_spacing > now}
+            if item.encoded_data in self.__last_due:
+                due = self.__last_due[item.encoded_data] + self.repeat_spacing
+                self.counters["repeated"] += 1
+            self.__last_due[item.encoded_data] = due
+
+        self.__sequence += 1
+        self.__frames.append(ScheduledFrame(due, priority, self.__sequence, item))
+        self.counters["queued"] += 1
+        if self.on_put is not None:
+            self.on_put()
+
+    def _get(self) -> Any:
+        """
+        Takes the most important of the frames that are due
+        """
+        now = monotonic()
+        frame = min(
+            (frame for frame in self.__frames if frame.due <= now),
+            key=lambda frame: (frame.priority, frame.sequence)
+        )
+        self.__frames.remove(frame)
+
+        if isinstance(frame.message, OutboundMessage):
+            framing = self.framing_for(frame.message.to_address)
+            self.__airtime_log.append((now, self.airtime(frame.message, framing)))
+
+        return frame.message
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        """
+        Removes and returns the next message that is due, waiting for one if necessary
+        """
+        deadline = None if timeout is None else monotonic() + timeout
+        with self.not_empty:
+            while True:
+                now = monotonic()
+                wait = self.__time_to_next_due(now)
+                if wait is not None and wait <= 0:
+                    break
+                if not block:
+                    raise Empty
+                if deadline is not None:
+                    if deadline <= now:
+                        raise Empty
+                    wait = deadline - now if wait is None else min(wait, deadline - now)
+                self.not_empty.wait(wait)
+
+            item = self._get()
+            self.not_full.notify()
+            return item
+
+    def next_due_in(self) -> Optional[float]:
+        """
+        Returns how long until the earliest of the queued messages is due, or None if there are no messages at all
+        """
+        with self.mutex:
+            return self.__time_to_next_due(monotonic())
+
+    def has_pending(self, to_address: int, command: int) -> bool:
+        """
+        Checks whether a message with given command to given address is waiting to be transmitted
+        """
+        with self.mutex:
+            return any(
+                isinstance(frame.message, OutboundMessage) and
+                frame.message.to_address == to_address and
+                frame.message.command == command
+                for frame in self.__frames
+            )
+
+    def airtime_per_minute(self) -> float:
+        """
+        Returns the airtime, in seconds, of the frames taken off the queue within the last minute
+        """
+        with self.mutex:
+            threshold = monotonic() - 60
+            while self.__airtime_log and self.__airtime_log[0][0] < threshold:
+                self.__airtime_log.popleft()
+
+            return sum(airtime for _, airtime in self.__airtime_log)
+
+    @classmethod
+    def airtime(cls, msg: OutboundMessage, framing: Framing = Framing.NIBBLE) -> float:
+        """
+        Returns the time, in seconds, it takes to transmit given message in given framing
+        """
+        return len(msg.encoded_for(framing)) * 10 / cls.BAUDRATE
+
+    @classmethod
+    def priority_of(cls, msg: OutboundMessage) -> int:
+        """
+        Returns the transmit priority of given message, lower goes first
+        """
+        if msg.command in cls.ACTUATOR_COMMANDS:
+            return cls.PRIORITY_ACTUATOR
+        if msg.command == 0x00:
+            return cls.PRIORITY_NOUNCE_REPLY
+
+        return cls.PRIORITY_DEFAULT
+
+    def __supersedes(self, newer: Any, older: Any) -> bool:
+        """
+        Checks whether the newer message makes the older one pointless to transmit. Outbound nounces only ever
+        grow, so they tell which of the commands has been issued later.
+        """
+        return (
+            isinstance(newer, OutboundMessage) and
+            isinstance(older, OutboundMessage) and
+            newer.command in self.ACTUATOR_COMMANDS and
+            older.command in self.ACTUATOR_COMMANDS and
+            newer.to_address == older.to_address and
+            newer.nounce > older.nounce
+        )
+
+    def __time_to_next_due(self, now: float) -> Optional[float]:
+        """
+        Returns how long until the earliest frame is due, or None if there are no frames at all
+        """
+        if not self.__frames:
+            return None
+
+        return min(frame.due for frame in self.__frames) - now
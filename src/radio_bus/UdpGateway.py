@@ -0,0 +1,95 @@
+import logging
+import socket
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+from .AbstractGateway import AbstractGateway
+from .radio.AbstractRadio import AbstractRadio
+from .radio.FrameParser import Frame, FrameParser
+from .radio.Framing import Framing
+from .radio.OutboundMessage import OutboundMessage
+
+
+class UdpGateway(AbstractGateway):
+    """
+    Gateway for devices on the local network, e.g. Wi-Fi sensors. Every datagram carries whole frames, framed the same
+    way as they are on air, so the devices can share the firmware with the radio ones. Messages to a device are sent
+    to wherever its last authentic frame has come from.
+    """
+
+    MAX_DATAGRAM = 2048  # bytes
+
+    def __init__(self, name: str, host: str, port: int):
+        """
+        :param name: Name of the gateway used in logs
+        :param host: Address to listen on, e.g. 127.0.0.1 or 0.0.0.0
+        :param port: Port to listen on, 0 picks a free one
+        """
+        super().__init__(name)
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind((host, port))
+        self.socket.settimeout(AbstractRadio.READ_TIMEOUT)
+        self.__peers: Dict[int, Tuple[str, int]] = {}
+        self.__counters: Counter = Counter()
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """
+        Returns the address and port the gateway listens on
+        """
+        return self.socket.getsockname()
+
+    def receive(self) -> List[Frame]:
+        """
+        Receives a single datagram and returns the frames it carries. A frame that doesn't fit in the datagram is
+        discarded, datagrams don't continue each other.
+        """
+        try:
+            data, origin = self.socket.recvfrom(self.MAX_DATAGRAM)
+        except socket.timeout:
+            return []
+
+        parser = FrameParser()
+        frames = [frame._replace(origin=origin) for frame in parser.feed(data)]
+        self.__counters["datagrams"] += 1
+        self.__counters["discarded_bytes"] += parser.discarded_bytes
+        self.__counters["truncated"] += 1 if parser.in_frame else 0
+
+        return frames
+
+    def send(self, msg: OutboundMessage, framing: Framing) -> None:
+        """
+        Sends the message to wherever its recipient has been heard from
+        """
+        peer = self.__peers.get(msg.to_address)
+        if peer is None:
+            logging.warning("Dropping message to %#x, it hasn't been heard through %s yet", msg.to_address, self.name)
+            self.__counters["unroutable"] += 1
+            return
+
+        self.socket.sendto(msg.encoded_for(framing), peer)
+
+    def fileno(self) -> Optional[int]:
+        """
+        Returns the file descriptor of the socket
+        """
+        return self.socket.fileno()
+
+    def heard(self, address: int, origin: Any) -> None:
+        """
+        Registers that an authentic frame from given address has come from given peer
+        """
+        if origin is not None:
+            self.__peers[address] = origin
+
+    @property
+    def counters(self) -> Dict[str, int]:
+        """
+        Returns the statistics of datagrams received and messages that could not be sent
+        """
+        return dict(self.__counters)
+
+    def close(self) -> None:
+        """
+        Closes the socket
+        """
+        self.socket.close()
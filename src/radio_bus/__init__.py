@@ -1,5 +1,27 @@
+from .radio.AbstractRadio import AbstractRadio
 from .radio.Radio import Radio
 from .radio.InboundMessage import InboundMessage
 from .radio.OutboundMessage import OutboundMessage
 from .radio.MessageStartMarker import MESSAGE_START_MARKER
+from .radio.Framing import COBS_FRAMING_MARKER, Framing
+from .radio.ChannelMonitor import ChannelMonitor
+from .ActuatorReconciler import ActuatorReconciler
+from .FrameDeduplicator import FrameDeduplicator
+from .AbstractGateway import AbstractGateway
+from .RadioGateway import RadioGateway
+from .UdpGateway import UdpGateway
+from .TrafficClass import TrafficClass
+from .TokenBucket import TokenBucket
+from .RateLimiter import Budget, RateLimiter
 from .RadioController import RadioController
+from .TransmitScheduler import TransmitScheduler
+from .SlotSchedule import Slot, SlotSchedule
+from .SlotTracker import SlotTracker
+from .capture.CaptureWriter import CaptureWriter
+from .capture.CaptureReader import CaptureReader, CaptureRecord
+from .capture.ReplayRadio import ReplayRadio
+from .virtual.LoopbackSerial import LoopbackSerial
+from .virtual.PtySerial import PtySerial
+from .virtual.Hc12Emulator import Hc12Emulator
+from .virtual.VirtualRadio import VirtualRadio
+from .RadioFactory import RADIO_BACKENDS, create_radio
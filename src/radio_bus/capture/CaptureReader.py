@@ -0,0 +1,39 @@
+import mmap
+from typing import Iterator, NamedTuple
+from .CaptureWriter import CaptureWriter
+
+
+class CaptureRecord(NamedTuple):
+    """
+    A chunk of bytes received or sent through radio
+    """
+    timestamp_ns: int
+    direction: int
+    data: bytes
+
+
+class CaptureReader:
+    """
+    Reads records of a capture file. The file is memory-mapped, so records are read as they are iterated through
+    rather than loading the whole file up front.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def __iter__(self) -> Iterator[CaptureRecord]:
+        with open(self.path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if data[:len(CaptureWriter.MAGIC)] != CaptureWriter.MAGIC:
+                raise ValueError(f"{self.path:s} is not a radio capture file")
+
+            header = CaptureWriter.CHUNK_HEADER
+            offset = len(CaptureWriter.MAGIC)
+            while offset + header.size <= len(data):
+                timestamp_ns, direction, length = header.unpack_from(data, offset)
+                offset += header.size
+                if offset + length > len(data):
+                    # the last record has been cut short, e.g. by a crash while writing
+                    break
+
+                yield CaptureRecord(timestamp_ns, direction, data[offset:offset + length])
+                offset += length
@@ -0,0 +1,41 @@
+from struct import Struct
+from threading import Lock
+from time import monotonic_ns
+
+
+class CaptureWriter:
+    """
+    Appends raw bytes received and sent through radio into a capture file. The file starts with a magic header,
+    followed by records made of a chunk header (monotonic timestamp in nanoseconds, direction and length) and the
+    chunk of bytes itself.
+    """
+
+    MAGIC = b'HC12CAP1'
+    CHUNK_HEADER = Struct("<QBH")
+
+    RECEIVED = 0
+    SENT = 1
+
+    def __init__(self, path: str):
+        self.__lock = Lock()
+        self.__file = open(path, "ab")  # pylint: disable=R1732
+        if self.__file.tell() == 0:
+            self.__file.write(self.MAGIC)
+            self.__file.flush()
+
+    def write(self, direction: int, data: bytes) -> None:
+        """
+        Appends a chunk of bytes that has been received or sent just now. The chunk is flushed to the operating
+        system immediately, so it survives a crash of the application.
+        """
+        header = self.CHUNK_HEADER.pack(monotonic_ns(), direction, len(data))
+        with self.__lock:
+            self.__file.write(header + data)
+            self.__file.flush()
+
+    def close(self) -> None:
+        """
+        Closes the capture file
+        """
+        with self.__lock:
+            self.__file.close()
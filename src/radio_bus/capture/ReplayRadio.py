@@ -0,0 +1,115 @@
+from threading import Event
+from time import monotonic, sleep
+from typing import Iterable, Optional
+from .CaptureReader import CaptureReader, CaptureRecord
+from .CaptureWriter import CaptureWriter
+from ..radio.AbstractRadio import AbstractRadio
+
+
+class ReplaySerial:
+    """
+    Serial port that returns the bytes received in a capture, at the pace they've been originally received at
+    (scaled by given speed), and discards everything that's written to it.
+    """
+
+    def __init__(self, records: Iterable[CaptureRecord], speed: float, timeout: float):
+        """
+        :param records: Records of the capture to replay, only received chunks are replayed
+        :param speed: How many times faster than originally received the bytes are replayed, 0 for no delays at all
+        :param timeout: How long reading waits for the first byte to arrive
+        """
+        self.timeout = timeout
+        self.speed = speed
+        self.finished = Event()
+        self.bytes_written = 0
+        self.__records = (record for record in records if record.direction == CaptureWriter.RECEIVED)
+        self.__next: Optional[CaptureRecord] = next(self.__records, None)
+        self.__pending = b''
+        self.__started_at = monotonic()
+        self.__first_timestamp_ns = self.__next.timestamp_ns if self.__next is not None else 0
+
+    @property
+    def in_waiting(self) -> int:
+        """
+        Returns the number of bytes that can be read without waiting
+        """
+        if len(self.__pending) == 0 and self.__next is not None and self.__due(self.__next) <= monotonic():
+            self.__advance()
+
+        return len(self.__pending)
+
+    def read(self, size: int = 1) -> bytes:
+        """
+        Reads up to given number of bytes, waiting up to the timeout for the first one to arrive
+        """
+        deadline = monotonic() + self.timeout
+        while len(self.__pending) == 0:
+            if self.__next is None:
+                # nothing more to replay, behave like an idle line
+                self.finished.set()
+                sleep(self.timeout)
+                return b''
+
+            due = self.__due(self.__next)
+            if due > deadline:
+                sleep(max(0.0, deadline - monotonic()))
+                return b''
+
+            sleep(max(0.0, due - monotonic()))
+            self.__advance()
+
+        chunk = self.__pending[:size]
+        self.__pending = self.__pending[size:]
+        return chunk
+
+    def write(self, data: bytes) -> int:
+        """
+        Discards written bytes
+        """
+        self.bytes_written += len(data)
+        return len(data)
+
+    def __due(self, record: CaptureRecord) -> float:
+        """
+        Returns the monotonic time at which given record should be replayed
+        """
+        if self.speed <= 0:
+            return 0.0
+
+        return self.__started_at + (record.timestamp_ns - self.__first_timestamp_ns) / 1e9 / self.speed
+
+    def __advance(self) -> None:
+        """
+        Makes the next record available for reading
+        """
+        if self.__next is not None:
+            self.__pending = self.__next.data
+            self.__next = next(self.__records, None)
+
+
+class ReplayRadio(AbstractRadio):
+    """
+    Radio that replays the bytes received in a capture file instead of receiving them over the air
+    """
+
+    def __init__(self, capture_path: str, speed: float):
+        """
+        :param str capture_path: A path to the capture file to replay
+        :param float speed: How many times faster than originally received the bytes are replayed, 0 for no delays
+        """
+        super().__init__(ReplaySerial(CaptureReader(capture_path), speed, self.READ_TIMEOUT))
+
+    def setup_device(self) -> None:
+        """
+        There's no device to set up
+        """
+
+    def _enter_command_mode(self) -> None:
+        """
+        There's no command mode to enter
+        """
+
+    def _exit_command_mode(self) -> None:
+        """
+        There's no command mode to exit
+        """
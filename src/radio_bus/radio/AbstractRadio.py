@@ -0,0 +1,91 @@
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+from .Framing import Framing
+from .OutboundMessage import OutboundMessage
+from ..capture.CaptureWriter import CaptureWriter
+
+
+class AbstractRadio(ABC):
+    """
+    Radio that sends and receives raw bytes through a serial port, optionally capturing all of them into
+    a capture file.
+    """
+
+    READ_TIMEOUT = 1  # seconds
+    """
+    How long receiving waits for the first byte to arrive
+    """
+
+    def __init__(self, serial: Any, capture: Optional[CaptureWriter] = None):
+        """
+        :param serial: An open serial port, or anything that behaves like one
+        :param capture: A capture file to tee every received and sent byte into
+        """
+        self.serial = serial
+        self.capture = capture
+
+    def setup_device(self) -> None:
+        """
+        Sets up the device before it can be used.
+        """
+        self._enter_command_mode()
+
+        # flush buffers just in case
+        self.serial.flushInput()
+        self.serial.flushOutput()
+
+        # Set the desired modes and log the output
+        self.serial.write(b'AT+C003\r')
+        logging.info('Radio setup: %s', self.serial.readline().decode().strip())
+        self.serial.write(b'AT+FU3\r')
+        logging.info('Radio setup: %s', self.serial.readline().decode().strip())
+        self.serial.write(b'AT+P8\r')
+        logging.info('Radio setup: %s', self.serial.readline().decode().strip())
+        self.serial.write(b'AT+B4800\r')
+        logging.info('Radio setup: %s', self.serial.readline().decode().strip())
+
+        self._exit_command_mode()
+
+        # again, flush the buffers just in case
+        self.serial.flushInput()
+        self.serial.flushOutput()
+
+    @abstractmethod
+    def _enter_command_mode(self) -> None:
+        """
+        Switches the device to the mode in which it accepts AT commands
+        """
+
+    @abstractmethod
+    def _exit_command_mode(self) -> None:
+        """
+        Switches the device back to the mode in which it transmits whatever it's given
+        """
+
+    def receive(self) -> bytes:
+        """
+        Returns all the bytes that have been received so far in a single read. If there are none, waits up to
+        the read timeout for the first one to arrive.
+        """
+        data = self.serial.read(self.serial.in_waiting or 1)
+        if self.capture is not None and len(data) > 0:
+            self.capture.write(CaptureWriter.RECEIVED, data)
+
+        return data
+
+    def fileno(self) -> Optional[int]:
+        """
+        Returns the file descriptor of the serial port, if it has one that can be waited on for bytes to arrive
+        """
+        fileno = getattr(self.serial, "fileno", None)
+        return None if fileno is None else fileno()
+
+    def send(self, msg: OutboundMessage, framing: Framing = Framing.NIBBLE) -> None:
+        """
+        Sends given outbound message through radio, in given framing
+        """
+        data = msg.encoded_for(framing)
+        self.serial.write(data)
+        if self.capture is not None:
+            self.capture.write(CaptureWriter.SENT, data)
@@ -0,0 +1,105 @@
+import asyncio
+from collections import Counter
+from threading import Lock
+from time import monotonic, sleep
+from typing import Callable, Iterator
+
+
+class ChannelMonitor:
+    """
+    Listen-before-talk for the half-duplex HC-12 link. Keeps track of what's being received, so that transmission
+    can be deferred until the channel has been quiet for a guard interval. Transmitting over somebody else's frame
+    would make both of them lost.
+    """
+
+    GUARD_INTERVAL = 0.05  # seconds
+    """
+    Default time the channel needs to be quiet for before we transmit
+    """
+
+    MAX_DEFERRAL = 1.0  # seconds
+    """
+    Default limit of how long a transmission can be deferred, after that it's forced onto a busy channel
+    """
+
+    FRAME_TIMEOUT = 0.6  # seconds
+    """
+    Airtime of the longest possible frame. A frame that's still in progress after that long has lost its tail.
+    """
+
+    def __init__(
+        self,
+        guard_interval: float = GUARD_INTERVAL,
+        max_deferral: float = MAX_DEFERRAL,
+        clock: Callable[[], float] = monotonic
+    ):
+        """
+        :param guard_interval: Time the channel needs to be quiet for before we transmit, in seconds
+        :param max_deferral: Limit of how long a transmission can be deferred, in seconds
+        :param clock: Source of monotonic time, in seconds
+        """
+        self.guard_interval = guard_interval
+        self.max_deferral = max_deferral
+        self.clock = clock
+        self.counters: Counter = Counter()
+        self.__last_activity = float("-inf")
+        self.__in_frame = False
+        self.__lock = Lock()
+
+    def observe(self, received: int, in_frame: bool) -> None:
+        """
+        Registers the outcome of a single receive - how many bytes have been received and whether the stream parser
+        is in the middle of a frame afterwards
+        """
+        if received > 0:
+            with self.__lock:
+                self.__last_activity = self.clock()
+                self.__in_frame = in_frame
+
+    def quiet_in(self) -> float:
+        """
+        Returns how long until the channel is considered quiet, 0 if it's quiet already
+        """
+        with self.__lock:
+            since = self.clock() - self.__last_activity
+            if self.__in_frame and since < self.FRAME_TIMEOUT:
+                return max(self.FRAME_TIMEOUT, self.guard_interval) - since
+
+            return max(0.0, self.guard_interval - since)
+
+    def wait_until_quiet(self) -> None:
+        """
+        Blocks until the channel is quiet, or until the maximum deferral has passed
+        """
+        for delay in self.deferrals():
+            sleep(delay)
+
+    async def wait_until_quiet_async(self) -> None:
+        """
+        Waits until the channel is quiet, or until the maximum deferral has passed, without blocking the event loop
+        """
+        for delay in self.deferrals():
+            await asyncio.sleep(delay)
+
+    def deferrals(self) -> Iterator[float]:
+        """
+        Yields how long to wait before looking at the channel again, until it's quiet or the maximum deferral has
+        passed, and counts the outcome
+        """
+        quiet_in = self.quiet_in()
+        if quiet_in <= 0:
+            self.counters["clear"] += 1
+            return
+
+        deadline = self.clock() + self.max_deferral
+        while quiet_in > 0:
+            remaining = deadline - self.clock()
+            if remaining <= 0:
+                self.counters["forced"] += 1
+                return
+
+            # poll, as activity that happens meanwhile extends the wait
+            yield min(quiet_in, remaining, self.guard_interval)
+            quiet_in = self.quiet_in()
+
+        self.counters["deferred"] += 1
@@ -0,0 +1,46 @@
+# Consistent overhead byte stuffing (COBS), that ensures the start marker never occurs inside the message. The message
+# is split at every zero byte into blocks, and each block is prefixed with its length plus one, which also stands for
+# the zero byte that follows it. A block can't be longer than 254 bytes, so the overhead is one byte per 254 bytes of
+# the message at most, and a single byte for a typical, short message. COBS removes zero bytes, so the output is
+# inverted to remove the start marker (0xFF) instead.
+
+_MAX_BLOCK = 254
+_INVERT = bytes(b ^ 0xFF for b in range(256))
+
+
+def encode(message: bytes) -> bytes:
+    """
+    Encodes given message, so that it can be sent through radio
+    """
+    encoded = bytearray()
+    for block in message.split(b'\x00'):
+        while len(block) >= _MAX_BLOCK:
+            # full-length block, with no zero byte implied after it
+            encoded.append(_MAX_BLOCK + 1)
+            encoded += block[:_MAX_BLOCK]
+            block = block[_MAX_BLOCK:]
+
+        encoded.append(len(block) + 1)
+        encoded += block
+
+    return bytes(encoded.translate(_INVERT))
+
+
+def decode(data: bytes) -> bytes:
+    """
+    Decodes data received through radio back into the message. Raises ValueError if data is not a valid encoding.
+    """
+    data = data.translate(_INVERT)
+    message = bytearray()
+    position = 0
+    while position < len(data):
+        code = data[position]
+        if code == 0 or position + code > len(data):
+            raise ValueError(f"Invalid COBS block length {code:d} at {position:d}")
+
+        message += data[position + 1:position + code]
+        position += code
+        if code <= _MAX_BLOCK and position < len(data):
+            message.append(0)
+
+    return bytes(message)
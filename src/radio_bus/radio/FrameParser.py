@@ -0,0 +1,87 @@
+import logging
+from typing import Any, List, NamedTuple
+from .Framing import COBS_FRAMING_MARKER, Framing
+from .MessageStartMarker import MESSAGE_START_MARKER
+
+
+class Frame(NamedTuple):
+    """
+    Encoded message received through radio, along with the framing it has been received in and where it has come
+    from, if the gateway tells its peers apart
+    """
+    framing: Framing
+    data: bytes
+    origin: Any = None
+
+
+class FrameParser:
+    """
+    Incremental parser that splits the byte stream received from radio into frames. Every frame starts with the
+    start marker, followed by a single byte holding the size of the frame and then the encoded message itself.
+    COBS frames have the COBS framing marker between the start marker and the size.
+    """
+
+    def __init__(self) -> None:
+        # Bytes received, but not yet emitted as a frame. The buffer is reused for the whole lifetime of the parser,
+        # deleting from its front just moves the start offset, so consumed frames don't cause reallocation.
+        self.__buffer = bytearray()
+        self.discarded_bytes = 0
+        self.resynchronizations = 0
+
+    @property
+    def in_frame(self) -> bool:
+        """
+        Checks whether a frame has started, but hasn't been completed yet
+        """
+        return len(self.__buffer) > 0
+
+    def feed(self, data: bytes) -> List[Frame]:
+        """
+        Appends received bytes to the stream and returns all the frames that have been completed by them, with the
+        start marker, framing marker and size byte stripped.
+        """
+        buffer = self.__buffer
+        buffer += data
+        frames = []
+
+        while True:
+            start = buffer.find(MESSAGE_START_MARKER)
+            if start < 0:
+                # no frame has started yet, whatever we've got is line noise
+                self.discarded_bytes += len(buffer)
+                del buffer[:]
+                break
+
+            if start > 0:
+                self.discarded_bytes += start
+                del buffer[:start]
+
+            header_length = 3 if buffer[1:2] == COBS_FRAMING_MARKER else 2
+            if len(buffer) < header_length:
+                # waiting for the size byte
+                break
+
+            end = header_length + buffer[header_length - 1]
+            restart = buffer.find(MESSAGE_START_MARKER, 1, end)
+            if restart > 0:
+                # Start marker never occurs inside the encoded message, so the frame we've been receiving got cut
+                # short. Drop it and start over with the frame that begins at the marker.
+                logging.warning(
+                    "Frame of size %d interrupted after %d bytes, resynchronizing",
+                    end - header_length,
+                    restart
+                )
+                self.resynchronizations += 1
+                self.discarded_bytes += restart
+                del buffer[:restart]
+                continue
+
+            if len(buffer) < end:
+                # waiting for the rest of the frame
+                break
+
+            framing = Framing.COBS if header_length == 3 else Framing.NIBBLE
+            frames.append(Frame(framing, bytes(buffer[header_length:end])))
+            del buffer[:end]
+
+        return frames
@@ -0,0 +1,15 @@
+from enum import Enum
+
+COBS_FRAMING_MARKER = b'\xFE'
+"""
+Follows the start marker in COBS frames, where a frame in nibble-split framing has its size. Nibble-split messages
+are never that long, so the two can't be confused.
+"""
+
+
+class Framing(Enum):
+    """
+    How the message is encoded inside a radio frame
+    """
+    NIBBLE = 0  # start marker, size, nibble-split message - the original framing, supported by every device
+    COBS = 1  # start marker, COBS framing marker, size, COBS-encoded message
@@ -1,9 +1,10 @@
-from __future__ import annotations
 from hashlib import blake2s
-from struct import unpack
+from struct import Struct
 from typing import Optional
 from secrets import HMAC_KEY
-from .Radio import Radio
+from .CobsCodec import decode as cobs_decode
+from .NibbleCodec import decode as nibble_decode
+from .Framing import Framing
 
 
 class InboundMessage:
@@ -11,68 +12,110 @@ class InboundMessage:
     Represents an incoming radio message
     """
 
-    def __init__(self, data: bytes):
+    HEADER_LENGTH = 23
+    """
+    Length of the decoded header: MAC (16 bytes), nounce (4 bytes), from address, to address and command
+    """
+
+    __HEADER = Struct("<LBBB")
+    __HMAC = blake2s(key=HMAC_KEY, digest_size=16)
+    """
+    Keyed hash template, copied for every message rather than keyed again
+    """
+
+    def __init__(self, data: bytes, framing: Framing = Framing.NIBBLE):
         """
-        Creates inbound message out of decoded bytes
+        Creates inbound message out of encoded bytes. Only the header of a nibble-split message is decoded up front,
+        the rest of the message is decoded and authenticated once it's needed.
         """
-        result = bytearray()
-
-        i = 0
-        while i < len(data):
-            if data[i] & 0x80 and i < len(data) - 1:
-                result.append(
-                    ((data[i] & 0x0F) << 4) | (data[i + 1])
-                )
-                i += 1
-            else:
-                result.append(data[i])
-
-            i += 1
+        self.__data = data
+        self.__message: Optional[bytes] = None
+        self.__is_hmac_valid: Optional[bool] = None
+        self.framing = framing
 
-        self.__is_hmac_valid: bool
         self.nounce: int
-        self.fromAddress: int
-        self.toAddress: int
+        self.from_address: int
+        self.to_address: int
         self.command: int
-        self.extended_bytes: bytes
-        self.extended_bytes_length: int
-
-        if len(result) >= 23:
-            blake = blake2s(key=HMAC_KEY, digest_size=16)
-            blake.update(result[16:])
-
-            self.__is_hmac_valid = blake.digest() == result[:16]
-            [self.nounce] = unpack("<L", result[16:20])
-            self.from_address = result[20]
-            self.to_address = result[21]
-            self.command = result[22]
-            self.extended_bytes = bytes(result[23:])
-            self.extended_bytes_length = len(self.extended_bytes)
+        self.is_malformed: bool
+
+        if framing == Framing.COBS:
+            # COBS blocks can span the whole message, there's no telling where the header ends
+            try:
+                header = self.__decoded_message()
+            except ValueError:
+                header = bytes()
+        else:
+            # every decoded byte takes at most two encoded bytes
+            header = nibble_decode(data[:2 * self.HEADER_LENGTH])
+
+        if len(header) >= self.HEADER_LENGTH:
+            [self.nounce, self.from_address, self.to_address, self.command] = self.__HEADER.unpack_from(header, 16)
+            self.is_malformed = False
         else:
-            self.__is_hmac_valid = False
             self.nounce = 0
             self.from_address = 0
             self.to_address = 0
             self.command = 0
-            self.extended_bytes = bytes()
-            self.extended_bytes_length = 0
+            self.is_malformed = True
+
+    @property
+    def extended_bytes(self) -> bytes:
+        """
+        Returns the data sent along with the command
+        """
+        if self.is_malformed:
+            return bytes()
+
+        return self.__decoded_message()[self.HEADER_LENGTH:]
+
+    @property
+    def extended_bytes_view(self) -> memoryview:
+        """
+        Returns the data sent along with the command without copying it
+        """
+        if self.is_malformed:
+            return memoryview(bytes())
+
+        return memoryview(self.__decoded_message())[self.HEADER_LENGTH:]
+
+    @property
+    def extended_bytes_length(self) -> int:
+        """
+        Returns the length of the data sent along with the command
+        """
+        return len(self.extended_bytes)
+
+    def is_authentic(self) -> bool:
+        """
+        Confirms message is authenticated, i.e. it has been sent by a party that knows the key
+        """
+        if self.__is_hmac_valid is None:
+            if self.is_malformed:
+                self.__is_hmac_valid = False
+            else:
+                message = self.__decoded_message()
+                blake = self.__HMAC.copy()
+                blake.update(message[16:])
+                self.__is_hmac_valid = blake.digest() == message[:16]
+
+        return self.__is_hmac_valid
 
     def is_valid(self, last_inbound_nounce: int):
         """
         Confirms message is authenticated, valid and hasn't been repeated (monotonically increasing nounce
         hasn't been used before)
         """
-        return self.__is_hmac_valid and last_inbound_nounce < self.nounce
+        return self.is_authentic() and last_inbound_nounce < self.nounce
 
-    @staticmethod
-    def receive_from_radio(radio: Radio, size: int) -> Optional[InboundMessage]:
+    def __decoded_message(self) -> bytes:
         """
-        Attempts to get a message of given size from radio interface
+        Returns the whole decoded message
         """
-        radio.serial.timeout = 10
-        message = radio.serial.read(size)
-
-        if len(message) != size:
-            return None
+        if self.__message is None:
+            if self.framing == Framing.COBS:
+                self.__message = cobs_decode(self.__data)
+            else:
+                self.__message = nibble_decode(self.__data)
 
-        return InboundMessage(message)
+        return self.__message
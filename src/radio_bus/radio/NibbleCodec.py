@@ -0,0 +1,82 @@
+# Encoding that ensures the start marker never occurs inside the message. Every byte with the highest bit set is split
+# across two bytes with only 4 low bits set on each, and the first of them is flagged with "10" on the highest bits,
+# which doesn't collide with the start marker, but informs the receiver that both need to be joined back.
+#
+# Both directions work on whole messages through precomputed translation tables, so the work is done in a handful of
+# C-level calls instead of a Python loop over every single byte.
+import re
+
+# Encoding: first byte of the pair (or the byte itself, if it doesn't need splitting) and the second byte of the pair.
+# Bytes that don't need splitting get a filler second byte, which never occurs in encoded data and is removed at
+# the end.
+_FILLER = 0xFF
+_FIRST_BYTE = bytes(b if b < 0x80 else (b >> 4) | 0x80 for b in range(256))
+_SECOND_BYTE = bytes(_FILLER if b < 0x80 else b & 0x0F for b in range(256))
+
+# Decoding: flagged byte marks that the following byte is its second half. The flagged byte brings 4 high bits,
+# the following one brings 4 low bits.
+_FLAGGED = bytes(0xFF if b & 0x80 else 0x00 for b in range(256))
+_LOW_BITS_MASK = bytes(0x0F if b & 0x80 else 0x00 for b in range(256))
+_HIGH_BITS = bytes((b & 0x0F) << 4 if b & 0x80 else b for b in range(256))
+# Byte that is never encoded (any flagged byte carries 4 bits only), or flagged byte that isn't followed by its second
+# half - which only happens in corrupted data
+_MALFORMED = re.compile(b'[\x90-\xff]|[\x80-\x8f](?![\x00-\x0f])')
+
+
+def encode(message: bytes) -> bytes:
+    """
+    Encodes given message, so that it can be sent through radio
+    """
+    if message.isascii():
+        # highest bit is not set on any byte, we can leave whole message unencoded
+        return bytes(message)
+
+    # interleave first and second bytes of each pair, then drop the second bytes that are not needed
+    encoded = bytearray(2 * len(message))
+    encoded[0::2] = message.translate(_FIRST_BYTE)
+    encoded[1::2] = message.translate(_SECOND_BYTE)
+    return bytes(encoded.translate(None, bytes((_FILLER,))))
+
+
+def decode(data: bytes) -> bytes:
+    """
+    Decodes data received through radio back into the message
+    """
+    if data.isascii():
+        # there are no flagged bytes, data is the message itself
+        return bytes(data)
+
+    if _MALFORMED.search(data) is not None:
+        # pairs don't line up, so they can't be merged all at once
+        return _decode_bytewise(data)
+
+    # Bytes are processed as big integers, so that bitwise operations work on all the bytes at once. Every byte that
+    # follows a flagged one is the second half of a pair, it's marked with the filler to be removed once merged.
+    length = len(data)
+    second_halves = int.from_bytes(b'\x00' + data[:-1].translate(_FLAGGED), "big")
+    filler = bytes((_FILLER,))
+
+    high_bits = (int.from_bytes(data, "big") | second_halves).to_bytes(length, "big").translate(_HIGH_BITS, filler)
+    low_bits = (
+        (int.from_bytes(data[1:] + b'\x00', "big") & int.from_bytes(data.translate(_LOW_BITS_MASK), "big"))
+        | second_halves
+    ).to_bytes(length, "big").translate(None, filler)
+
+    return (int.from_bytes(high_bits, "big") | int.from_bytes(low_bits, "big")).to_bytes(len(high_bits), "big")
+
+
+def _decode_bytewise(data: bytes) -> bytes:
+    """
+    Decodes data byte by byte - a flagged byte is joined with whatever byte follows it, if there is any
+    """
+    message = bytearray()
+    i = 0
+    while i < len(data):
+        if data[i] & 0x80 and i < len(data) - 1:
+            message.append(((data[i] & 0x0F) << 4) | data[i + 1])
+            i += 1
+        else:
+            message.append(data[i])
+        i += 1
+
+    return bytes(message)
@@ -2,6 +2,9 @@ from hashlib import blake2s
 from struct import pack
 from typing import Optional
 from secrets import HMAC_KEY
+from .CobsCodec import encode as cobs_encode
+from .NibbleCodec import encode as nibble_encode
+from .Framing import COBS_FRAMING_MARKER, Framing
 from .MessageStartMarker import MESSAGE_START_MARKER
 
 
@@ -17,6 +20,11 @@ class OutboundMessage:
         command = min(command, 255)
         # narrow nounce down to 4 bytes in length (unsigned), as this is the maximum that we can send
         nounce = min(nounce, 4294967295)
+        self.from_address = from_address
+        self.to_address = to_address
+        self.command = command
+        self.nounce = nounce
+        self.data = data
 
         message = bytearray()
         message.extend(pack("<L", nounce))
@@ -29,24 +37,24 @@ class OutboundMessage:
         if data is not None and len(data) < 100:
             message.extend(data)
 
-        encoded_data = bytearray()
-        encoded_data.extend(MESSAGE_START_MARKER)  # every message starts with message start marker
-        encoded_data.append(0)  # reserved for message size
-
         blake = blake2s(key=HMAC_KEY, digest_size=16)
         blake.update(message)
+        self.__message = blake.digest() + message
+        self.__cobs_encoded_data: Optional[bytes] = None
+
+        # every message starts with message start marker, followed by the message size
+        encoded = nibble_encode(self.__message)
+        self.encoded_data = MESSAGE_START_MARKER + bytes((len(encoded),)) + encoded
 
-        for b in blake.digest() + message:
-            if b & 0x80:
-                # Highest bit is set, let's split this byte across two bytes with only 4 low bits set on each, to ensure
-                # start marker doesn't occur anywhere in the data stream. Then flag first byte with "10" on highest bits
-                # which doesn't collide with start marker, but can inform consumer those need to be joined when reading.
-                encoded_data.append((b >> 4) | 0x80)
-                encoded_data.append(b & 0x0F)
+    def encoded_for(self, framing: Framing) -> bytes:
+        """
+        Returns the frame to send through radio in given framing
+        """
+        if framing == Framing.NIBBLE:
+            return self.encoded_data
 
-            else:
-                # highest bit is not set, we can leave value unencoded
-                encoded_data.append(b)
+        if self.__cobs_encoded_data is None:
+            encoded = cobs_encode(self.__message)
+            self.__cobs_encoded_data = MESSAGE_START_MARKER + COBS_FRAMING_MARKER + bytes((len(encoded),)) + encoded
 
-        encoded_data[1] = len(encoded_data) - 2  # minus start marker and the byte for size
-        self.encoded_data = bytes(encoded_data)
+        return self.__cobs_encoded_data
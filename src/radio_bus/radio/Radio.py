@@ -1,29 +1,31 @@
-import logging
 from time import sleep
+from typing import Optional
 # pylint: disable=E0401,E0611
 from serial import Serial  # type: ignore
 # pylint: disable=E0401
 from RPi import GPIO  # type: ignore
-from .OutboundMessage import OutboundMessage
+from .AbstractRadio import AbstractRadio
+from ..capture.CaptureWriter import CaptureWriter
 
 
-class Radio:
+class Radio(AbstractRadio):
     """
     Class responsible for handling radio communication over HC-12 adapter available
     as UART device in the system.
     """
 
-    def __init__(self, serial_device: str, gpio_service_pin: int):
+    def __init__(self, serial_device: str, gpio_service_pin: int, capture: Optional[CaptureWriter] = None):
         """
         :param str serial_device: A path to the serial device which represents HC-12 device
         :param int gpio_service_pin: A GPIO pit that connects to HC-12 service PIN
+        :param capture: A capture file to tee every received and sent byte into
         """
-        self.serial = Serial(serial_device, baudrate=4800, timeout=None)
+        super().__init__(Serial(serial_device, baudrate=4800, timeout=self.READ_TIMEOUT), capture)
         self.__gpio_service_pin = gpio_service_pin
 
-    def setup_device(self) -> None:
+    def _enter_command_mode(self) -> None:
         """
-        Sets up the device before it can be used.
+        Pulls the HC-12 service pin low, which switches it to the command mode
         """
         GPIO.setmode(GPIO.BCM)
         GPIO.setwarnings(False)
@@ -32,31 +34,10 @@ class Radio:
         # entering config mode may last 40 milliseconds
         sleep(0.04)
 
-        # flush buffers just in case
-        self.serial.flushInput()
-        self.serial.flushOutput()
-
-        # Set the desired modes and log the output
-        self.serial.write(b'AT+C003\r')
-        logging.info('Radio setup: %s', self.serial.readline().decode().strip())
-        self.serial.write(b'AT+FU3\r')
-        logging.info('Radio setup: %s', self.serial.readline().decode().strip())
-        self.serial.write(b'AT+P8\r')
-        logging.info('Radio setup: %s', self.serial.readline().decode().strip())
-        self.serial.write(b'AT+B4800\r')
-        logging.info('Radio setup: %s', self.serial.readline().decode().strip())
-
-        GPIO.output(17, GPIO.HIGH)
-
-        # exiting config mode may last 80 milliseconds
-        sleep(0.08)
-
-        # again, flush the buffers just in case
-        self.serial.flushInput()
-        self.serial.flushOutput()
-
-    def send(self, msg: OutboundMessage) -> None:
+    def _exit_command_mode(self) -> None:
         """
-        Sends given outbound message through radio
+        Pulls the HC-12 service pin high, which switches it back to the transparent mode
         """
-        self.serial.write(msg.encoded_data)
+        GPIO.output(self.__gpio_service_pin, GPIO.HIGH)
+        # exiting config mode may last 80 milliseconds
+        sleep(0.08)
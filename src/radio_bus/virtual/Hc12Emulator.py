@@ -0,0 +1,132 @@
+import re
+from typing import Any, Dict
+
+_POWER_LEVELS = ["-1", "+2", "+5", "+8", "+11", "+14", "+17", "+20"]
+
+
+class Hc12Emulator:
+    """
+    Serial port that behaves like an HC-12 adapter. In the command mode it answers AT commands the same way the
+    adapter does and remembers the settings, otherwise it passes all the bytes through to the given transport,
+    which plays the role of the air.
+    """
+
+    def __init__(self, air: Any):
+        """
+        :param air: A serial-like transport that carries the bytes transmitted in the transparent mode
+        """
+        self.air = air
+        self.command_mode = False
+        self.settings: Dict[str, str] = {"baudrate": "9600", "channel": "001", "mode": "3", "power": "8"}
+        self.__command = bytearray()
+        self.__responses = bytearray()
+
+    @property
+    def timeout(self) -> float:
+        """
+        Returns the read timeout of the underlying transport
+        """
+        return self.air.timeout
+
+    def set_command_mode(self, enabled: bool) -> None:
+        """
+        Emulates pulling the service pin low (command mode) or high (transparent mode)
+        """
+        self.command_mode = enabled
+        self.__command.clear()
+
+    @property
+    def in_waiting(self) -> int:
+        """
+        Returns the number of bytes that can be read without waiting
+        """
+        if len(self.__responses) > 0:
+            return len(self.__responses)
+
+        return self.air.in_waiting
+
+    def read(self, size: int = 1) -> bytes:
+        """
+        Reads pending responses to AT commands, or bytes received over the air
+        """
+        if len(self.__responses) > 0:
+            chunk = bytes(self.__responses[:size])
+            del self.__responses[:size]
+            return chunk
+
+        return self.air.read(size)
+
+    def readline(self) -> bytes:
+        """
+        Reads the next response to an AT command, or the next line received over the air
+        """
+        if len(self.__responses) > 0:
+            end = self.__responses.find(b'\n') + 1 or len(self.__responses)
+            line = bytes(self.__responses[:end])
+            del self.__responses[:end]
+            return line
+
+        return self.air.readline()
+
+    def write(self, data: bytes) -> int:
+        """
+        Interprets given data as AT commands in the command mode, or transmits it over the air otherwise
+        """
+        if not self.command_mode:
+            return self.air.write(data)
+
+        self.__command.extend(data)
+        while b'\r' in self.__command:
+            end = self.__command.find(b'\r')
+            command = self.__command[:end].decode(errors="replace").strip()
+            del self.__command[:end + 1]
+            self.__responses.extend(self.execute(command).encode() + b'\r\n')
+
+        return len(data)
+
+    def execute(self, command: str) -> str:
+        """
+        Returns the adapter's response to given AT command
+        """
+        # pylint: disable=R0911
+        if command == "AT":
+            return "OK"
+        if command == "AT+V":
+            return "www.hc01.com HC-12_V2.4"
+        if command == "AT+DEFAULT":
+            self.settings = {"baudrate": "9600", "channel": "001", "mode": "3", "power": "8"}
+            return "OK+DEFAULT"
+        if command == "AT+RX":
+            return "\r\n".join([
+                "OK+B" + self.settings["baudrate"],
+                "OK+RC" + self.settings["channel"],
+                "OK+RP:" + _POWER_LEVELS[int(self.settings["power"]) - 1] + "dBm",
+                "OK+FU" + self.settings["mode"],
+            ])
+
+        match = re.fullmatch(r"AT\+(B|C|FU|P)(\d+)", command)
+        if match is None:
+            return "ERROR"
+
+        name = {"B": "baudrate", "C": "channel", "FU": "mode", "P": "power"}[match.group(1)]
+        self.settings[name] = match.group(2)
+        return "OK+" + match.group(1) + match.group(2)
+
+    def reset_input_buffer(self) -> None:
+        """
+        Discards pending responses and everything that has been received and not read yet
+        """
+        self.__responses.clear()
+        self.air.reset_input_buffer()
+
+    def flushInput(self) -> None:  # pylint: disable=C0103
+        """
+        Alias of reset_input_buffer, to match the pyserial interface
+        """
+        self.reset_input_buffer()
+
+    def flushOutput(self) -> None:  # pylint: disable=C0103
+        """
+        Flushes the underlying transport
+        """
+        self.air.flushOutput()
@@ -0,0 +1,93 @@
+from threading import Condition
+from time import monotonic
+from typing import Optional, Tuple
+
+
+class LoopbackSerial:
+    """
+    In-process serial port. Whatever is written to it is delivered to its peer, as if both ends were connected
+    with a wire (or both radios were on the same channel).
+    """
+
+    def __init__(self, timeout: float):
+        """
+        :param timeout: How long reading waits for the first byte to arrive
+        """
+        self.timeout = timeout
+        self.peer: Optional[LoopbackSerial] = None
+        self.__buffer = bytearray()
+        self.__condition = Condition()
+
+    @staticmethod
+    def pair(timeout: float) -> Tuple['LoopbackSerial', 'LoopbackSerial']:
+        """
+        Creates two serial ports connected to each other
+        """
+        first, second = LoopbackSerial(timeout), LoopbackSerial(timeout)
+        first.peer, second.peer = second, first
+        return first, second
+
+    @property
+    def in_waiting(self) -> int:
+        """
+        Returns the number of bytes that can be read without waiting
+        """
+        with self.__condition:
+            return len(self.__buffer)
+
+    def read(self, size: int = 1) -> bytes:
+        """
+        Reads up to given number of bytes, waiting up to the timeout for the first one to arrive
+        """
+        with self.__condition:
+            self.__condition.wait_for(lambda: len(self.__buffer) > 0, self.timeout)
+            chunk = bytes(self.__buffer[:size])
+            del self.__buffer[:size]
+            return chunk
+
+    def readline(self) -> bytes:
+        """
+        Reads up to and including the next line feed, waiting up to the timeout for it to arrive
+        """
+        deadline = monotonic() + self.timeout
+        with self.__condition:
+            self.__condition.wait_for(lambda: b'\n' in self.__buffer, max(0.0, deadline - monotonic()))
+            end = self.__buffer.find(b'\n') + 1 or len(self.__buffer)
+            line = bytes(self.__buffer[:end])
+            del self.__buffer[:end]
+            return line
+
+    def write(self, data: bytes) -> int:
+        """
+        Delivers given data to the peer, if there is one
+        """
+        if self.peer is not None:
+            self.peer.deliver(data)
+
+        return len(data)
+
+    def deliver(self, data: bytes) -> None:
+        """
+        Makes given data available for reading from this end
+        """
+        with self.__condition:
+            self.__buffer.extend(data)
+            self.__condition.notify_all()
+
+    def reset_input_buffer(self) -> None:
+        """
+        Discards everything that has been received and not read yet
+        """
+        with self.__condition:
+            self.__buffer.clear()
+
+    def flushInput(self) -> None:  # pylint: disable=C0103
+        """
+        Alias of reset_input_buffer, to match the pyserial interface
+        """
+        self.reset_input_buffer()
+
+    def flushOutput(self) -> None:  # pylint: disable=C0103
+        """
+        Writes are delivered immediately, so there's nothing to flush
+        """
@@ -0,0 +1,88 @@
+import fcntl
+import os
+import pty
+import select
+import struct
+import termios
+import tty
+from time import monotonic
+
+
+class PtySerial:
+    """
+    Serial port backed by a pseudo-terminal. The controller talks through the master end, and the other end is
+    available as a regular tty device, so any external process (a simulator, a second controller, or just a shell)
+    can act as the air.
+    """
+
+    def __init__(self, timeout: float):
+        """
+        :param timeout: How long reading waits for the first byte to arrive
+        """
+        self.timeout = timeout
+        self.__master, self.__slave = pty.openpty()
+        # no echo, no line discipline - bytes go through unchanged
+        tty.setraw(self.__slave)
+        self.device = os.ttyname(self.__slave)
+
+    @property
+    def in_waiting(self) -> int:
+        """
+        Returns the number of bytes that can be read without waiting
+        """
+        return struct.unpack("i", fcntl.ioctl(self.__master, termios.FIONREAD, b"\0\0\0\0"))[0]
+
+    def read(self, size: int = 1) -> bytes:
+        """
+        Reads up to given number of bytes, waiting up to the timeout for the first one to arrive
+        """
+        readable, _, _ = select.select([self.__master], [], [], self.timeout)
+        if not readable:
+            return b''
+
+        return os.read(self.__master, size)
+
+    def readline(self) -> bytes:
+        """
+        Reads up to and including the next line feed, waiting up to the timeout for it to arrive
+        """
+        deadline = monotonic() + self.timeout
+        line = bytearray()
+        while not line.endswith(b'\n'):
+            readable, _, _ = select.select([self.__master], [], [], max(0.0, deadline - monotonic()))
+            if not readable:
+                break
+            line.extend(os.read(self.__master, 1))
+
+        return bytes(line)
+
+    def write(self, data: bytes) -> int:
+        """
+        Writes given data to the other end of the pseudo-terminal
+        """
+        return os.write(self.__master, data)
+
+    def reset_input_buffer(self) -> None:
+        """
+        Discards everything that has been received and not read yet
+        """
+        while self.in_waiting > 0:
+            os.read(self.__master, self.in_waiting)
+
+    def flushInput(self) -> None:  # pylint: disable=C0103
+        """
+        Alias of reset_input_buffer, to match the pyserial interface
+        """
+        self.reset_input_buffer()
+
+    def flushOutput(self) -> None:  # pylint: disable=C0103
+        """
+        Writes are passed to the pseudo-terminal immediately, so there's nothing to flush
+        """
+
+    def close(self) -> None:
+        """
+        Closes both ends of the pseudo-terminal
+        """
+        os.close(self.__master)
+        os.close(self.__slave)
@@ -0,0 +1,28 @@
+from .Hc12Emulator import Hc12Emulator
+from ..radio.AbstractRadio import AbstractRadio
+
+
+class VirtualRadio(AbstractRadio):
+    """
+    Radio that works without the HC-12 hardware. It's given a virtual serial port - LoopbackSerial, PtySerial
+    or Hc12Emulator - in place of the real one.
+    """
+
+    def setup_device(self) -> None:
+        """
+        Sets up the emulated adapter. Plain transports have nobody to answer AT commands, so they're left alone.
+        """
+        if isinstance(self.serial, Hc12Emulator):
+            super().setup_device()
+
+    def _enter_command_mode(self) -> None:
+        """
+        Switches the emulated adapter to the command mode
+        """
+        self.serial.set_command_mode(True)
+
+    def _exit_command_mode(self) -> None:
+        """
+        Switches the emulated adapter back to the transparent mode
+        """
+        self.serial.set_command_mode(False)
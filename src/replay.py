@@ -0,0 +1,120 @@
+import argparse
+import logging
+import os
+import tempfile
+import threading
+from datetime import datetime
+from time import monotonic, sleep
+from typing import Any, List
+from sqlalchemy.orm import sessionmaker
+from command_bus import CommandBus, CommandExecutor
+from persistence import AbstractBase, NounceManager, create_database_engine
+from radio_bus import RadioController, RadioGateway, RateLimiter, ReplayRadio, TransmitScheduler
+
+
+class NullPublisher:
+    """
+    Publisher for when there are no UI clients to publish to
+    """
+
+    def publish(self, message: dict) -> None:
+        """
+        Discards the message
+        """
+
+    def send(self, websocket: Any, messages: List[dict]) -> None:
+        """
+        Discards the messages
+        """
+
+
+parser = argparse.ArgumentParser(
+    description="Replays radio capture through the controller against a fresh database held in memory"
+)
+parser.add_argument("capture", help="capture file to replay")
+parser.add_argument(
+    "--speed",
+    type=float,
+    default=0,
+    help="how many times faster than recorded to replay, e.g. 1 or 100; 0 (default) replays as fast as possible"
+)
+parser.add_argument("--log-level", default="WARNING", help="logging level of the controller")
+args = parser.parse_args()
+
+logging.basicConfig(level=args.log_level, format='%(asctime)s %(levelname)-8s %(message)s')
+
+
+def replay(database_path: str) -> None:
+    """
+    Replays the capture against a database at given path and prints out the statistics
+    """
+    stop = threading.Event()
+    command_bus = CommandBus()
+    outbound_bus = TransmitScheduler()
+    radio = ReplayRadio(args.capture, args.speed)
+    db_engine = create_database_engine(database_path)
+    db_session_factory = sessionmaker(db_engine, expire_on_commit=False)
+    AbstractBase.metadata.create_all(db_engine)
+    nounce_manager = NounceManager(db_session_factory)
+    nounce_manager.load()
+
+    gateway = RadioGateway(args.capture, radio)
+    # replaying faster than recorded would trip the rate limits, so there are none
+    radio_controller = RadioController(
+        [gateway],
+        outbound_bus,
+        command_bus,
+        datetime,
+        stop,
+        nounce_manager,
+        RateLimiter({})
+    )
+    executor = CommandExecutor(
+        db_session_factory,
+        outbound_bus,
+        command_bus,
+        NullPublisher(),
+        datetime,
+        stop,
+        nounce_manager
+    )
+    threads = [
+        threading.Thread(target=radio_controller.run_receiver, args=(gateway,)),
+        threading.Thread(target=radio_controller.run_transmitter),
+        threading.Thread(target=executor.run),
+        threading.Thread(target=nounce_manager.run, args=(stop,)),
+    ]
+
+    started_at = monotonic()
+    for thread in threads:
+        thread.start()
+
+    # replay is done once the capture is exhausted and every command it caused has been executed
+    radio.serial.finished.wait()
+    while command_bus.unfinished_tasks > 0 or outbound_bus.unfinished_tasks > 0:
+        sleep(0.01)
+    elapsed = monotonic() - started_at
+
+    stop.set()
+    for thread in threads:
+        thread.join()
+    nounce_manager.close()
+
+    print_statistics(radio_controller, radio, elapsed)
+
+
+def print_statistics(radio_controller: RadioController, radio: ReplayRadio, elapsed: float) -> None:
+    """
+    Prints out the statistics of the replay
+    """
+    counters = radio_controller.validator.counters
+    print(f"Replayed in {elapsed:.3f} s at speed {args.speed:g}")
+    print(", ".join(f"{stage:s}: {count:d}" for stage, count in sorted(counters.items())))
+    print(f"Throughput: {counters['received'] / elapsed:.1f} frames/s, {counters['accepted'] / elapsed:.1f} accepted/s")
+    print(f"Sent {radio.serial.bytes_written:d} bytes in response")
+
+
+# Radio and command threads need their own connections to the same database, which a private in-memory database
+# can't provide - keep the database file in RAM-backed storage instead, where available.
+with tempfile.TemporaryDirectory(dir="/dev/shm" if os.path.isdir("/dev/shm") else None) as database_directory:
+    replay(os.path.join(database_directory, "replay.db"))
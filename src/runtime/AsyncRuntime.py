@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from queue import Empty
+from typing import List, Set
+from command_bus import CommandExecutor
+from persistence import NounceManager
+from radio_bus import RadioController
+from ui import UiController
+
+
+class AsyncRuntime:
+    """
+    Runs the radio gateways, the command bus and the UI server on a single event loop, instead of a thread each.
+    Gateways are read whenever their file descriptor becomes readable and the outbound bus is waited on until
+    something is queued or due, so nothing polls with a timeout. Commands are executed by the command executor in
+    a bounded pool of threads, as the database is blocking - as many as there are workers. Gateways without a file
+    descriptor (e.g. replayed captures) and the nounce write-behind keep running in threads of their own.
+    """
+
+    def __init__(
+        self,
+        radio_controller: RadioController,
+        executor: CommandExecutor,
+        ui_controller: UiController,
+        nounce_manager: NounceManager,
+        stop: threading.Event
+    ):
+        self.radio_controller = radio_controller
+        self.executor = executor
+        self.ui_controller = ui_controller
+        self.nounce_manager = nounce_manager
+        self.stop = stop
+
+    def run(self) -> None:
+        """
+        Runs the event loop until the stop event is set. This is blocking, so it's meant to be run in a separate
+        thread, or in the main one once everything else has been started.
+        """
+        asyncio.run(self.serve())
+
+    async def serve(self) -> None:
+        """
+        Serves the radio gateways, the command bus and the UI clients until the stop event is set
+        """
+        loop = asyncio.get_running_loop()
+        stopped, commands_ready, outbound_ready = asyncio.Event(), asyncio.Event(), asyncio.Event()
+        self.executor.command_bus.on_put = lambda: loop.call_soon_threadsafe(commands_ready.set)
+        self.radio_controller.outbound_bus.on_put = lambda: loop.call_soon_threadsafe(outbound_ready.set)
+
+        threads = [threading.Thread(target=self.nounce_manager.run, args=(self.stop,))]
+        readers: List[int] = []
+        for gateway in self.radio_controller.gateways:
+            fileno = gateway.fileno()
+            if fileno is None:
+                threads.append(threading.Thread(target=self.radio_controller.run_receiver, args=(gateway,)))
+            else:
+                loop.add_reader(fileno, self.radio_controller.receive, gateway)
+                readers.append(fileno)
+        for thread in threads:
+            thread.start()
+
+        try:
+            await asyncio.gather(
+                self.__wait_for_stop(stopped, commands_ready, outbound_ready),
+                self.ui_controller.start_server(stopped),
+                self.__execute_commands(stopped, commands_ready),
+                self.__transmit(stopped, outbound_ready),
+                self.__log_statistics(stopped),
+            )
+        finally:
+            # whatever has ended the loop, everything else has to stop as well
+            self.stop.set()
+            for fileno in readers:
+                loop.remove_reader(fileno)
+            for thread in threads:
+                thread.join()
+            self.executor.command_bus.on_put = None
+            self.radio_controller.outbound_bus.on_put = None
+
+    async def __wait_for_stop(self, *events: asyncio.Event) -> None:
+        """
+        Waits for the stop event, that may be set from any thread, and sets given events once it's set
+        """
+        await asyncio.get_running_loop().run_in_executor(None, self.stop.wait)
+        for event in events:
+            event.set()
+
+    async def __execute_commands(self, stopped: asyncio.Event, ready: asyncio.Event) -> None:
+        """
+        Hands the commands out to the workers as soon as they are queued and there is a worker free to claim them,
+        every worker executing its batch in the pool of database threads
+        """
+        loop = asyncio.get_running_loop()
+        idle = list(range(self.executor.workers))
+        busy: Set[asyncio.Future] = set()
+
+        def done(worker: int, batch: asyncio.Future) -> None:
+            idle.append(worker)
+            busy.discard(batch)
+            # partitions of the batch have been released, commands waiting for them may be claimed now
+            ready.set()
+
+        with ThreadPoolExecutor(self.executor.workers, thread_name_prefix="db") as db_executor:
+            while not stopped.is_set():
+                ready.clear()
+                while idle:
+                    try:
+                        command = self.executor.command_bus.claim(idle[-1], block=False)
+                    except Empty:
+                        break
+
+                    worker = idle.pop()
+                    batch = loop.run_in_executor(db_executor, self.executor.execute_batch, command, worker)
+                    busy.add(batch)
+                    batch.add_done_callback(partial(done, worker))
+                await ready.wait()
+
+            if busy:
+                await asyncio.wait(busy)
+
+    async def __transmit(self, stopped: asyncio.Event, ready: asyncio.Event) -> None:
+        """
+        Transmits the messages of the outbound bus as soon as they are due, waiting for the quiet channel without
+        blocking the event loop
+        """
+        outbound_bus = self.radio_controller.outbound_bus
+        while not stopped.is_set():
+            ready.clear()
+            try:
+                outbound = outbound_bus.get_nowait()
+            except Empty:
+                try:
+                    # repeats of a frame are only due a while after they've been queued
+                    await asyncio.wait_for(ready.wait(), outbound_bus.next_due_in())
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                await self.radio_controller.transmit_async(outbound)
+            except Exception:
+                logging.error(traceback.format_exc())
+            outbound_bus.task_done()
+
+    async def __log_statistics(self, stopped: asyncio.Event) -> None:
+        """
+        Logs the statistics of the radio and of the command bus every once in a while
+        """
+        while not stopped.is_set():
+            try:
+                await asyncio.wait_for(stopped.wait(), RadioController.STATISTICS_INTERVAL)
+            except asyncio.TimeoutError:
+                self.radio_controller.log_statistics()
+                self.executor.log_statistics()
@@ -0,0 +1 @@
+from .AsyncRuntime import AsyncRuntime
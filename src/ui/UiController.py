@@ -4,7 +4,7 @@ import asyncio
 import traceback
 from queue import Queue
 from threading import Event
-from typing import List
+from typing import List, Optional
 import websockets.server
 from websockets.legacy.protocol import broadcast, WebSocketCommonProtocol
 
@@ -19,12 +19,34 @@ class UiController:
         self.command_bus = command_bus
         self.stop = stop
         self.listeners: List = []
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
 
     def publish(self, message: dict):
         """
-        Publish information to all connected customers
+        Publish information to all connected customers. Can be called from any thread, the message is broadcast from
+        the event loop of the server.
         """
-        broadcast(self.listeners, json.dumps(message))
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(broadcast, self.listeners, json.dumps(message))
+
+    def send(self, websocket: WebSocketCommonProtocol, messages: List[dict]) -> None:
+        """
+        Sends given messages to a single customer, in order. Can be called from any thread, doesn't wait for the
+        messages to be sent.
+        """
+        if self.loop is not None:
+            asyncio.run_coroutine_threadsafe(self.send_all(websocket, messages), self.loop)
+
+    @staticmethod
+    async def send_all(websocket: WebSocketCommonProtocol, messages: List[dict]) -> None:
+        """
+        Sends given messages to a single customer, one after another
+        """
+        try:
+            for message in messages:
+                await websocket.send(json.dumps(message))
+        except Exception:
+            logging.error(traceback.format_exc())
 
     async def handle_new_listener(self, websocket: WebSocketCommonProtocol):
         """
@@ -47,11 +69,17 @@ class UiController:
         self.listeners.remove(websocket)
         logging.info("Consumer dropped, number of consumers %d", len(self.listeners))
 
-    async def start_server(self):
+    async def start_server(self, stopped: Optional[asyncio.Event] = None):
         """
-        Starts the websocket server that handles UI clients.
+        Starts the websocket server that handles UI clients, until stopped is set if given, or until the stop event
+        is set otherwise.
         """
+        self.loop = asyncio.get_running_loop()
         async with websockets.server.serve(self.handle_new_listener, "", self.port):
+            if stopped is not None:
+                await stopped.wait()
+                return
+
             while not self.stop.is_set():
                 await asyncio.sleep(5)
 
@@ -1,3 +1,4 @@
+from typing import Any, List
 from typing_extensions import Protocol
 
 
@@ -11,3 +12,9 @@ class UiPublisher(Protocol):
         Publishes message to all connected ui clients
         """
         raise NotImplementedError
+
+    def send(self, websocket: Any, messages: List[dict]) -> None:
+        """
+        Sends messages to a single ui client, in order
+        """
+        raise NotImplementedError
@@ -0,0 +1,105 @@
+import logging
+from itertools import count
+from unittest import TestCase
+from unittest.mock import Mock, patch
+from radio_bus import ActuatorReconciler, OutboundMessage, TransmitScheduler
+
+
+class TestActuatorReconciler(TestCase):
+    """
+    Test cases for confirming actuator commands with device pings
+    """
+
+    def setUp(self) -> None:
+        logging.disable(logging.CRITICAL)
+        self.outbound_bus = TransmitScheduler(0)
+        self.nounce_manager = Mock(next_outbound_nounce=Mock(side_effect=count(2)))
+        self.reconciler = ActuatorReconciler(self.outbound_bus, self.nounce_manager)
+        self.turn_on = OutboundMessage(0x01, 0x30, 0x01, 1)
+
+    def test_not_commanded(self):
+        """
+        Tests whether devices that haven't been commanded are not reconciled
+        """
+        self.reconciler.transmitted(OutboundMessage(0x01, 0x30, 0x00, 1, b'\x00\x00\x00\x00'))
+        self.assertIsNone(self.reconciler.desired_state(0x30))
+        self.assertFalse(self.reconciler.reported(0x30, True))
+
+    @patch("radio_bus.ActuatorReconciler.monotonic")
+    def test_confirmation(self, monotonic):
+        """
+        Tests whether a ping in line with the command confirms it and records the latency
+        """
+        monotonic.return_value = 100.0
+        self.reconciler.transmitted(self.turn_on)
+        self.assertTrue(self.reconciler.desired_state(0x30))
+        self.assertTrue(self.reconciler.is_pending(0x30))
+
+        monotonic.return_value = 130.0
+        self.assertTrue(self.reconciler.reported(0x30, True))
+        self.assertFalse(self.reconciler.is_pending(0x30))
+        self.assertEqual(30.0, self.reconciler.median_latency())
+        self.assertEqual(0, self.outbound_bus.qsize())
+
+        # once confirmed, pings are recorded as usual
+        self.assertFalse(self.reconciler.reported(0x30, False))
+
+    @patch("radio_bus.ActuatorReconciler.monotonic")
+    def test_retransmission_backoff(self, monotonic):
+        """
+        Tests whether disagreeing pings cause retransmissions, no more often than the backoff allows
+        """
+        monotonic.return_value = 100.0
+        self.reconciler.transmitted(self.turn_on)
+
+        monotonic.return_value = 101.0  # still within the initial backoff
+        self.assertTrue(self.reconciler.reported(0x30, False))
+        self.assertEqual(0, self.outbound_bus.qsize())
+
+        monotonic.return_value = 102.0
+        self.assertTrue(self.reconciler.reported(0x30, False))
+        retry = self.outbound_bus.get_nowait()
+        self.reconciler.transmitted(retry)
+
+        monotonic.return_value = 105.0  # backoff doubled to 4 seconds
+        self.assertTrue(self.reconciler.reported(0x30, False))
+        self.assertEqual(0, self.outbound_bus.qsize())
+
+        monotonic.return_value = 106.0
+        self.assertTrue(self.reconciler.reported(0x30, False))
+        self.assertEqual(3, self.outbound_bus.get_nowait().nounce)
+        self.assertEqual(2, self.reconciler.counters["retransmitted"])
+
+        monotonic.return_value = 110.0
+        self.assertTrue(self.reconciler.reported(0x30, True))
+        self.assertEqual(10.0, self.reconciler.median_latency())
+
+    def test_newer_command(self):
+        """
+        Tests whether a newer command replaces the one awaiting confirmation
+        """
+        self.reconciler.transmitted(self.turn_on)
+        self.reconciler.transmitted(OutboundMessage(0x01, 0x30, 0x02, 2))
+
+        self.assertFalse(self.reconciler.desired_state(0x30))
+        self.assertTrue(self.reconciler.reported(0x30, False))
+        self.assertFalse(self.reconciler.is_pending(0x30))
+
+    @patch("radio_bus.ActuatorReconciler.monotonic")
+    def test_retransmission_nounce(self, monotonic):
+        """
+        Tests whether a retransmission is the same command, signed with a fresh nounce, as the device rejects the
+        original one once it has accepted anything newer from us
+        """
+        monotonic.return_value = 100.0
+        self.reconciler.transmitted(self.turn_on)
+
+        monotonic.return_value = 102.0
+        self.assertTrue(self.reconciler.reported(0x30, False))
+        retry = self.outbound_bus.get_nowait()
+        self.nounce_manager.next_outbound_nounce.assert_called_once_with(0x30)
+        self.assertEqual(2, retry.nounce)
+        self.assertEqual(self.turn_on.from_address, retry.from_address)
+        self.assertEqual(self.turn_on.to_address, retry.to_address)
+        self.assertEqual(self.turn_on.command, retry.command)
+        self.assertEqual(self.turn_on.data, retry.data)
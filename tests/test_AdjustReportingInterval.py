@@ -0,0 +1,108 @@
+import logging
+from datetime import datetime, timedelta
+from unittest import TestCase
+from unittest.mock import Mock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from command_bus import AdjustReportingInterval
+from command_bus.ExecutionContext import ExecutionContext
+from persistence import (
+    AbstractBase, DeviceStatus, NounceManager, ReportingInterval, SensorMeasure, ThresholdTemperature,
+)
+from radio_bus import TransmitScheduler
+from domain_types import DeviceKind, MeasureKind, OperatingMode, PowerStatus
+
+
+class TestAdjustReportingInterval(TestCase):
+    """
+    Test case for adjusting the sensor reporting interval
+    """
+    NOW = datetime(2023, 9, 13, 11, 35, 15)
+    HEATING = ThresholdTemperature(DeviceKind.HEATING, OperatingMode.DAY, 1900)
+
+    def setUp(self) -> None:
+        engine = create_engine("sqlite://")
+        AbstractBase.metadata.create_all(engine)
+        logging.disable(logging.CRITICAL)
+
+        self.session = Session(engine)
+        self.outbound_bus = TransmitScheduler()
+        self.mock_datetime = Mock()
+        self.mock_datetime.now = Mock(return_value=self.NOW)
+
+        self.nounce_manager = NounceManager(sessionmaker(engine))
+
+        # noinspection PyTypeChecker
+        self.context = ExecutionContext(
+            self.session,
+            self.outbound_bus,
+            Mock(),
+            Mock(),
+            self.mock_datetime,
+            self.nounce_manager,
+        )
+
+    def tearDown(self) -> None:
+        self.session.close()
+
+    def adjust(self, temperature: float) -> None:
+        """
+        Helper function that executes the command for a bedroom measure regulating the heating
+        """
+        measure = SensorMeasure(self.mock_datetime.now(), MeasureKind.BEDROOM, temperature, None, None)
+        AdjustReportingInterval(measure, [(DeviceKind.HEATING, self.HEATING)]).execute(self.context)
+        self.session.commit()
+
+    def assert_sent(self, interval: int) -> None:
+        """
+        Asserts that the reporting interval has been sent to the bedroom sensor and recorded
+        """
+        self.assertEqual(1, self.outbound_bus.qsize())
+        message = self.outbound_bus.get_nowait()
+        self.assertEqual(MeasureKind.BEDROOM.value, message.to_address)
+        self.assertEqual(0x04, message.command)
+        self.assertEqual(interval, self.session.get(ReportingInterval, MeasureKind.BEDROOM).interval)
+
+    def test_interval_for(self):
+        """
+        The interval is short near the thresholds or when the device runs, and long in the dead band
+        """
+        interval_for = AdjustReportingInterval.interval_for
+        self.assertEqual(AdjustReportingInterval.SHORT_INTERVAL, interval_for(19.2, [self.HEATING], False))
+        self.assertEqual(AdjustReportingInterval.SHORT_INTERVAL, interval_for(18.8, [self.HEATING], False))
+        self.assertEqual(AdjustReportingInterval.MEDIUM_INTERVAL, interval_for(20.5, [self.HEATING], False))
+        self.assertEqual(AdjustReportingInterval.LONG_INTERVAL, interval_for(22.0, [self.HEATING], False))
+        self.assertEqual(AdjustReportingInterval.SHORT_INTERVAL, interval_for(22.0, [self.HEATING], True))
+        self.assertEqual(AdjustReportingInterval.LONG_INTERVAL, interval_for(19.2, [], False))
+
+    def test_sent_only_on_change(self):
+        """
+        The interval is sent for the first time, then only once it changes
+        """
+        self.adjust(22.0)
+        self.assert_sent(AdjustReportingInterval.LONG_INTERVAL)
+
+        self.adjust(21.8)
+        self.assertEqual(0, self.outbound_bus.qsize())
+
+        self.adjust(19.3)
+        self.assert_sent(AdjustReportingInterval.SHORT_INTERVAL)
+
+    def test_short_while_device_runs(self):
+        """
+        While the regulated device runs the sensor should report often, even far from the thresholds
+        """
+        self.session.add(DeviceStatus(DeviceKind.HEATING, self.NOW - timedelta(minutes=5), PowerStatus.TURNED_ON))
+        self.adjust(22.0)
+        self.assert_sent(AdjustReportingInterval.SHORT_INTERVAL)
+
+    def test_refresh(self):
+        """
+        Unchanged interval is sent again after a while, in case the previous message got lost
+        """
+        self.adjust(22.0)
+        self.assert_sent(AdjustReportingInterval.LONG_INTERVAL)
+
+        self.mock_datetime.now.return_value = self.NOW + AdjustReportingInterval.REFRESH_AFTER
+        self.adjust(22.0)
+        self.assert_sent(AdjustReportingInterval.LONG_INTERVAL)
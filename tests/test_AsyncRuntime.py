@@ -0,0 +1,101 @@
+import logging
+import os
+import shutil
+import socket
+import tempfile
+from datetime import datetime
+from threading import Event, Thread
+from unittest import TestCase
+from unittest.mock import Mock
+from secrets import MY_ADDRESS
+from sqlalchemy.orm import sessionmaker
+from command_bus import CommandBus, CommandExecutor
+from persistence import AbstractBase, NounceManager, create_database_engine
+from radio_bus import (
+    Framing,
+    InboundMessage,
+    OutboundMessage,
+    RadioController,
+    RadioGateway,
+    TransmitScheduler,
+    UdpGateway,
+)
+from radio_bus.radio.FrameParser import FrameParser
+from runtime import AsyncRuntime
+from ui import UiController
+
+
+class TestAsyncRuntime(TestCase):
+    """
+    Test cases for running radio, commands and UI on a single event loop
+    """
+    SENDER = 0x20
+
+    def setUp(self) -> None:
+        logging.disable(logging.CRITICAL)
+        self.addCleanup(logging.disable, logging.NOTSET)
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, True)
+        engine = create_database_engine(os.path.join(directory, "runtime.db"))
+        self.addCleanup(engine.dispose)
+        AbstractBase.metadata.create_all(engine)
+        session_factory = sessionmaker(engine, expire_on_commit=False)
+
+        self.stop = Event()
+        self.command_bus = CommandBus()
+        self.nounce_manager = NounceManager(session_factory)
+        self.nounce_manager.load()
+        self.addCleanup(self.nounce_manager.close)
+        # the write-behind thread only notices the stop event once it's done waiting
+        self.nounce_manager.FLUSH_INTERVAL = 0.1
+        self.gateway = UdpGateway("udp", "127.0.0.1", 0)
+        self.addCleanup(self.gateway.close)
+        # a gateway that can't be waited on is received from in a thread
+        self.replayed = RadioGateway("replayed", Mock(fileno=Mock(return_value=None), receive=Mock(return_value=b"")))
+        outbound_bus = TransmitScheduler()
+        self.radio_controller = RadioController(
+            [self.gateway, self.replayed],
+            outbound_bus,
+            self.command_bus,
+            datetime,
+            self.stop,
+            self.nounce_manager
+        )
+        ui_controller = UiController(0, self.command_bus, self.stop)
+        executor = CommandExecutor(
+            session_factory,
+            outbound_bus,
+            self.command_bus,
+            ui_controller,
+            datetime,
+            self.stop,
+            self.nounce_manager,
+            workers=2
+        )
+        self.runtime = AsyncRuntime(self.radio_controller, executor, ui_controller, self.nounce_manager, self.stop)
+
+    def test_nounce_request(self):
+        """
+        A nounce request received through the gateway is responded to through the same gateway, and the runtime
+        stops once the stop event is set
+        """
+        thread = Thread(target=self.runtime.run)
+        thread.start()
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as device:
+                device.settimeout(5)
+                request = OutboundMessage(self.SENDER, MY_ADDRESS, 0x00, 1).encoded_for(Framing.COBS)
+                device.sendto(request, self.gateway.address)
+                frames = FrameParser().feed(device.recv(UdpGateway.MAX_DATAGRAM))
+        finally:
+            self.stop.set()
+            thread.join(10)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(1, len(frames))
+        response = InboundMessage(frames[0].data, frames[0].framing)
+        self.assertEqual(MY_ADDRESS, response.from_address)
+        self.assertEqual(self.SENDER, response.to_address)
+        self.assertEqual(0x00, response.command)
+        self.assertIsNone(self.command_bus.on_put)
+        self.assertEqual(0, self.command_bus.unfinished_tasks)
@@ -0,0 +1,85 @@
+import os
+import tempfile
+from unittest import TestCase
+from radio_bus import CaptureReader, CaptureWriter
+from radio_bus.capture.ReplayRadio import ReplaySerial
+
+
+class TestCapture(TestCase):
+    """
+    Test cases for writing, reading and replaying radio capture files
+    """
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.path = os.path.join(self.directory.name, "radio.cap")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_write_and_read(self):
+        """
+        Tests whether chunks are read back in the order they were written, including those appended later
+        """
+        writer = CaptureWriter(self.path)
+        writer.write(CaptureWriter.RECEIVED, b'\xff\x02\x01\x02')
+        writer.write(CaptureWriter.SENT, b'\xff\x01\x03')
+        writer.close()
+
+        writer = CaptureWriter(self.path)
+        writer.write(CaptureWriter.RECEIVED, b'\x04')
+        writer.close()
+
+        records = list(CaptureReader(self.path))
+        self.assertEqual(
+            [
+                (CaptureWriter.RECEIVED, b'\xff\x02\x01\x02'),
+                (CaptureWriter.SENT, b'\xff\x01\x03'),
+                (CaptureWriter.RECEIVED, b'\x04'),
+            ],
+            [(record.direction, record.data) for record in records]
+        )
+        self.assertLessEqual(records[0].timestamp_ns, records[1].timestamp_ns)
+        self.assertLessEqual(records[1].timestamp_ns, records[2].timestamp_ns)
+
+    def test_truncated_record(self):
+        """
+        Tests whether record cut short by a crash is skipped
+        """
+        writer = CaptureWriter(self.path)
+        writer.write(CaptureWriter.RECEIVED, b'\x01\x02')
+        writer.write(CaptureWriter.RECEIVED, b'\x03\x04')
+        writer.close()
+        os.truncate(self.path, os.path.getsize(self.path) - 1)
+
+        self.assertEqual([b'\x01\x02'], [record.data for record in CaptureReader(self.path)])
+
+    def test_not_a_capture(self):
+        """
+        Tests whether file that isn't a capture is refused
+        """
+        with open(self.path, "wb") as file:
+            file.write(b'not a capture file')
+
+        with self.assertRaises(ValueError):
+            list(CaptureReader(self.path))
+
+    def test_replay(self):
+        """
+        Tests whether replay returns received bytes only, honouring the requested read size
+        """
+        writer = CaptureWriter(self.path)
+        writer.write(CaptureWriter.RECEIVED, b'\x01\x02\x03')
+        writer.write(CaptureWriter.SENT, b'\x09')
+        writer.write(CaptureWriter.RECEIVED, b'\x04')
+        writer.close()
+
+        serial = ReplaySerial(CaptureReader(self.path), 0, 0.01)
+        self.assertEqual(3, serial.in_waiting)
+        self.assertEqual(b'\x01\x02', serial.read(2))
+        self.assertEqual(b'\x03', serial.read(5))
+        self.assertEqual(b'\x04', serial.read(5))
+        self.assertFalse(serial.finished.is_set())
+        self.assertEqual(b'', serial.read(1))
+        self.assertTrue(serial.finished.is_set())
+        self.assertEqual(2, serial.write(b'\xff\x00'))
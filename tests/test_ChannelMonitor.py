@@ -0,0 +1,61 @@
+from unittest import TestCase
+from radio_bus import ChannelMonitor
+
+
+class TestChannelMonitor(TestCase):
+    """
+    Test cases for listen-before-talk transmit gating
+    """
+
+    def setUp(self) -> None:
+        self.now = 100.0
+        self.monitor = ChannelMonitor(0.0625, 0.25, lambda: self.now)
+
+    def test_quiet_channel(self):
+        """
+        Tests whether the channel is quiet when nothing has been received, or only the guard interval ago
+        """
+        self.assertEqual(0, self.monitor.quiet_in())
+        self.monitor.wait_until_quiet()
+        self.assertEqual(1, self.monitor.counters["clear"])
+
+        self.monitor.observe(0, True)
+        self.assertEqual(0, self.monitor.quiet_in())
+
+        self.monitor.observe(10, False)
+        self.assertEqual(0.0625, self.monitor.quiet_in())
+        self.now += 0.0625
+        self.assertEqual(0, self.monitor.quiet_in())
+
+    def test_frame_in_progress(self):
+        """
+        Tests whether the channel is busy while a frame is in progress, unless it hasn't been completed for too long
+        """
+        self.monitor.observe(2, True)
+        self.now += 0.3
+        self.assertAlmostEqual(ChannelMonitor.FRAME_TIMEOUT - 0.3, self.monitor.quiet_in())
+
+        self.now += ChannelMonitor.FRAME_TIMEOUT
+        self.assertEqual(0, self.monitor.quiet_in())
+
+    def test_deferral(self):
+        """
+        Tests whether transmission waits for the guard interval to pass
+        """
+        monitor = ChannelMonitor(0.02, 1.0)
+        monitor.observe(10, False)
+        monitor.wait_until_quiet()
+
+        self.assertEqual(0, monitor.quiet_in())
+        self.assertEqual(1, monitor.counters["deferred"])
+
+    def test_forced(self):
+        """
+        Tests whether transmission is forced once it's been deferred for too long
+        """
+        monitor = ChannelMonitor(0.5, 0.02)
+        monitor.observe(10, False)
+        monitor.wait_until_quiet()
+
+        self.assertGreater(monitor.quiet_in(), 0)
+        self.assertEqual(1, monitor.counters["forced"])
@@ -0,0 +1,48 @@
+import os
+from unittest import TestCase
+from radio_bus.radio.CobsCodec import decode, encode
+
+
+class TestCobsCodec(TestCase):
+    """
+    Test cases for consistent overhead byte stuffing
+    """
+
+    def test_known_encodings(self):
+        """
+        Tests encoding against the reference COBS examples, inverted
+        """
+        cases = [
+            (b'', b'\x01'),
+            (b'\x00', b'\x01\x01'),
+            (b'\x00\x00', b'\x01\x01\x01'),
+            (b'\x11\x22\x00\x33', b'\x03\x11\x22\x02\x33'),
+            (b'\x11\x00\x00\x00', b'\x02\x11\x01\x01\x01'),
+            (bytes(range(1, 255)), b'\xff' + bytes(range(1, 255)) + b'\x01'),
+        ]
+        for message, reference in cases:
+            inverted = bytes(b ^ 0xFF for b in reference)
+            self.assertEqual(inverted, encode(message))
+            self.assertEqual(message, decode(inverted))
+
+    def test_round_trip(self):
+        """
+        Tests whether random messages of various lengths survive the round trip, never contain the start marker
+        and have the promised overhead
+        """
+        for length in [1, 16, 40, 253, 254, 255, 600]:
+            message = os.urandom(length)
+            encoded = encode(message)
+            self.assertNotIn(0xFF, encoded)
+            self.assertLessEqual(len(encoded), length + 1 + length // 254)
+            self.assertEqual(message, decode(encoded))
+
+        message = b'\xff' * 300
+        self.assertEqual(message, decode(encode(message)))
+
+    def test_invalid(self):
+        """
+        Tests whether data that is not a valid encoding is refused
+        """
+        self.assertRaises(ValueError, decode, b'\xfa\x00')
+        self.assertRaises(ValueError, decode, b'\xff')
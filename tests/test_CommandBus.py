@@ -0,0 +1,234 @@
+from datetime import datetime
+from queue import Empty
+from unittest import TestCase
+from command_bus import (
+    AssignTransmitSlot,
+    CommandBus,
+    CommandPriority,
+    EvaluateDevice,
+    EvaluateMeasure,
+    InitializeDisplay,
+    RecordDeviceStatus,
+    RespondNounceRequest,
+    SaveMeasure,
+    SavePing,
+    UpdateConfiguration,
+)
+from domain_types import DeviceKind, MeasureKind
+from persistence import SensorMeasure
+
+
+class TestCommandBus(TestCase):
+    """
+    Test cases for ordering and aging of commands on the command bus
+    """
+
+    def setUp(self) -> None:
+        self.now = 0.0
+        self.bus = CommandBus(aging_interval=2.0, clock=lambda: self.now)
+
+    def test_priorities(self):
+        """
+        Critical commands go first, background ones go last, and the order is kept within each class
+        """
+        display = InitializeDisplay(None)
+        first_slot = AssignTransmitSlot(0x20, None)
+        second_slot = AssignTransmitSlot(0x21, None)
+        nounce = RespondNounceRequest(0x30)
+
+        for command in (display, first_slot, second_slot, nounce):
+            self.bus.put_nowait(command)
+
+        self.assertEqual(4, self.bus.qsize())
+        self.assertEqual(
+            [nounce, first_slot, second_slot, display],
+            [self.bus.get_nowait() for _ in range(4)]
+        )
+        self.assertRaises(Empty, self.bus.get_nowait)
+
+    def test_aging(self):
+        """
+        Commands that have been waiting long enough go before the newer ones of a higher class
+        """
+        display = InitializeDisplay(None)
+        self.bus.put_nowait(display)
+        self.now = 3.0
+        nounce = RespondNounceRequest(0x30)
+        self.bus.put_nowait(nounce)
+        self.assertIs(nounce, self.bus.get_nowait())
+
+        self.now = 5.0
+        self.bus.put_nowait(nounce)
+        self.assertIs(display, self.bus.get_nowait())
+
+    def test_coalescing(self):
+        """
+        A command replaces the queued one with the same key, and is queued at the end
+        """
+        cooling = EvaluateDevice(DeviceKind.COOLING)
+        heating = EvaluateDevice(DeviceKind.HEATING)
+        nounce = RespondNounceRequest(0x30)
+        newer_cooling = EvaluateDevice(DeviceKind.COOLING)
+
+        for command in (cooling, heating, nounce, newer_cooling):
+            self.bus.put_nowait(command)
+
+        self.assertEqual(3, self.bus.qsize())
+        self.assertEqual(3, self.bus.unfinished_tasks)
+        self.assertEqual([heating, nounce, newer_cooling], [self.bus.get_nowait() for _ in range(3)])
+        self.assertEqual(1, self.bus.counters["coalesced"])
+        self.assertEqual(1, self.bus.coalesced["EvaluateDevice"])
+
+        # once taken off the queue, the command is not replaced anymore
+        self.bus.put_nowait(cooling)
+        self.assertEqual(1, self.bus.qsize())
+
+    def test_coalescing_partition_order(self):
+        """
+        A replacement is executed after the commands of its partition queued after the command it replaces, but waits
+        since the replaced one has been queued
+        """
+        cooling = EvaluateDevice(DeviceKind.COOLING)
+        ping = SavePing(DeviceKind.COOLING, None)
+        newer_cooling = EvaluateDevice(DeviceKind.COOLING)
+        self.bus.put_nowait(cooling)
+        self.bus.put_nowait(ping)
+        self.now = 5.0
+        self.bus.put_nowait(newer_cooling)
+
+        self.assertEqual([ping, newer_cooling], [self.bus.get_nowait() for _ in range(2)])
+        self.assertEqual([0, 0, 0, 0, 2, 0], self.bus.wait_histogram()[CommandPriority.CRITICAL])
+
+    def test_configuration_coalescing(self):
+        """
+        Configuration updates are only coalesced when they update exactly the same settings
+        """
+        def threshold(device: str, mode: str, value: float) -> UpdateConfiguration:
+            return UpdateConfiguration(
+                {"isAway": None, "thresholdTemperature": {device: {mode: value}}, "controlMeasures": None}
+            )
+
+        self.bus.put_nowait(threshold("48", "day", 24.0))
+        night = threshold("48", "night", 22.0)
+        self.bus.put_nowait(night)
+        latest = threshold("48", "day", 24.5)
+        self.bus.put_nowait(latest)
+
+        self.assertEqual(2, self.bus.qsize())
+        self.assertEqual([night, latest], [self.bus.get_nowait() for _ in range(2)])
+
+    def test_partitions(self):
+        """
+        Commands of a partition claimed by one worker are only handed out to that worker until it releases them
+        """
+        cooling = EvaluateDevice(DeviceKind.COOLING)
+        heating = EvaluateDevice(DeviceKind.HEATING)
+        ping = SavePing(DeviceKind.COOLING, None)
+        for command in (cooling, heating, ping):
+            self.bus.put_nowait(command)
+
+        self.assertIs(cooling, self.bus.claim("first", block=False))
+        self.assertIs(heating, self.bus.claim("second", block=False))
+        self.assertRaises(Empty, self.bus.claim, "second", block=False)
+
+        self.bus.release("first")
+        self.assertIs(ping, self.bus.claim("second", block=False))
+
+    def test_partition_order(self):
+        """
+        Commands of a partition are handed out in the order they have been queued, priority classes only decide between
+        the partitions
+        """
+        living_room = SensorMeasure(datetime(2024, 1, 1), MeasureKind.LIVING_ROOM, 21.0, 40.0, 3.3)
+        bedroom = SensorMeasure(datetime(2024, 1, 1), MeasureKind.BEDROOM, 19.0, 40.0, 3.3)
+        save = SaveMeasure(living_room)
+        evaluate = EvaluateMeasure(living_room)
+        other = EvaluateMeasure(bedroom)
+        for command in (save, evaluate, other):
+            self.bus.put_nowait(command)
+
+        self.assertIs(other, self.bus.claim("first", block=False))
+        self.assertIs(save, self.bus.claim("second", block=False))
+        # the partition is claimed by the second worker until it releases it
+        self.assertRaises(Empty, self.bus.claim, "first", block=False)
+        self.assertIs(evaluate, self.bus.claim("second", block=False))
+
+    def test_configuration_partition(self):
+        """
+        Configuration updates are handed out one at a time, in the order they have been queued
+        """
+        def away(is_away: bool) -> UpdateConfiguration:
+            return UpdateConfiguration({"isAway": is_away, "thresholdTemperature": None, "controlMeasures": None})
+
+        def threshold(value: float) -> UpdateConfiguration:
+            return UpdateConfiguration(
+                {"isAway": None, "thresholdTemperature": {"48": {"day": value}}, "controlMeasures": None}
+            )
+
+        first = away(True)
+        second = threshold(24.0)
+        self.bus.put_nowait(first)
+        self.bus.put_nowait(second)
+
+        self.assertIs(first, self.bus.claim("first", block=False))
+        self.assertRaises(Empty, self.bus.claim, "second", block=False)
+        self.bus.release("first")
+        self.assertIs(second, self.bus.claim("second", block=False))
+
+    def test_ping_commands(self):
+        """
+        Commands of a ping are handed out in the order the ping has been dispatched to them, so the device is only
+        evaluated once the ping has been saved, and none of them waits for normal commands
+        """
+        earlier = object()
+        record = RecordDeviceStatus(DeviceKind.COOLING, True)
+        ping = SavePing(DeviceKind.COOLING, None)
+        evaluate = EvaluateDevice(DeviceKind.COOLING)
+        for command in (earlier, record, ping, evaluate):
+            self.bus.put_nowait(command)
+
+        self.assertEqual([record, ping, evaluate, earlier], [self.bus.get_nowait() for _ in range(4)])
+
+    def test_long_queue(self):
+        """
+        Commands of many partitions, some of them replaced many times over, are handed out in the order they have been
+        queued within their partitions, and every replaced command is dropped
+        """
+        slots = []
+        for index in range(3000):
+            slots.append(AssignTransmitSlot(index % 30, None))
+            self.bus.put_nowait(slots[-1])
+            self.bus.put_nowait(EvaluateDevice((DeviceKind.COOLING, DeviceKind.HEATING)[index % 2]))
+
+        latest = EvaluateDevice(DeviceKind.COOLING)
+        self.bus.put_nowait(latest)
+        self.assertEqual(3002, self.bus.qsize())
+
+        taken = []
+        while self.bus.qsize():
+            taken.append(self.bus.claim("first", block=False))
+            self.bus.task_done()
+        self.assertEqual(0, self.bus.unfinished_tasks)
+        self.assertEqual(3002, len(taken))
+        self.assertIn(latest, taken)
+        for address in range(30):
+            self.assertEqual(
+                [slot for slot in slots if slot.address == address],
+                [command for command in taken if getattr(command, "address", None) == address]
+            )
+
+    def test_wait_histogram(self):
+        """
+        Queue waits are counted per priority class
+        """
+        self.bus.put_nowait(RespondNounceRequest(0x30))
+        self.bus.put_nowait(object())
+        self.now = 0.05
+        self.bus.get_nowait()
+        self.now = 20.0
+        self.bus.get_nowait()
+
+        histogram = self.bus.wait_histogram()
+        self.assertEqual([0, 0, 1, 0, 0, 0], histogram[CommandPriority.CRITICAL])
+        self.assertEqual([0, 0, 0, 0, 0, 1], histogram[CommandPriority.NORMAL])
+        self.assertEqual([0] * 6, histogram[CommandPriority.BACKGROUND])
@@ -0,0 +1,222 @@
+import logging
+import os
+import tempfile
+from datetime import datetime
+from threading import Event, Thread
+from unittest import TestCase
+from unittest.mock import Mock
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+from command_bus import AbstractCommand, CommandBus, CommandExecutor, SavePing
+from command_bus.ExecutionContext import ExecutionContext
+from domain_types import DeviceKind
+from persistence import AbstractBase, DevicePing, NounceManager, create_database_engine
+
+
+class FailingPing(AbstractCommand):
+    """
+    Command that saves a ping and fails afterwards
+    """
+
+    def execute(self, context: ExecutionContext) -> None:
+        """
+        Saves the ping and fails
+        """
+        SavePing(DeviceKind.HEATING, datetime(2024, 1, 1)).execute(context)
+        raise RuntimeError("Failed on purpose")
+
+
+class BlockedDisplay(AbstractCommand):
+    """
+    Read-only command that waits until it's let go, like a display initialization waiting for a slow client
+    """
+    READS_ONLY = True
+
+    def __init__(self, let_go: Event):
+        self.let_go = let_go
+
+    def execute(self, context: ExecutionContext) -> None:
+        """
+        Reads from the database and waits
+        """
+        context.db_session.query(DevicePing).count()
+        self.let_go.wait(5)
+
+
+class TakeNounces(AbstractCommand):
+    """
+    Command that writes something and takes a few outbound nounces, like one transmitting several messages to a device
+    """
+
+    def __init__(self, count: int):
+        self.count = count
+        self.nounces: list = []
+
+    def execute(self, context: ExecutionContext) -> None:
+        """
+        Saves a ping and takes the nounces
+        """
+        SavePing(DeviceKind.COOLING, datetime(2024, 1, 1)).execute(context)
+        context.db_session.flush()
+        self.nounces = [context.nounce_manager.next_outbound_nounce(0x30) for _ in range(self.count)]
+
+
+class TestCommandExecutor(TestCase):
+    """
+    Test cases for executing batches of commands in a single transaction
+    """
+
+    def setUp(self) -> None:
+        logging.disable(logging.CRITICAL)
+        engine = create_database_engine(":memory:")
+        AbstractBase.metadata.create_all(engine)
+        self.commits = 0
+        event.listen(engine, "commit", self.count_commit)
+
+        self.session_factory = sessionmaker(engine)
+        self.bus = CommandBus()
+        self.executor = CommandExecutor(
+            self.session_factory,
+            Mock(),
+            self.bus,
+            Mock(),
+            datetime,
+            Event(),
+            Mock(),
+            batch_size=3,
+            batch_window=0
+        )
+
+    def tearDown(self) -> None:
+        logging.disable(logging.NOTSET)
+
+    def count_commit(self, _connection) -> None:
+        """
+        Counts the transactions committed
+        """
+        self.commits += 1
+
+    def pings(self) -> int:
+        """
+        Returns the number of pings saved
+        """
+        with self.session_factory() as session:
+            return session.query(DevicePing).count()
+
+    def test_batch(self):
+        """
+        Ready commands are committed together, up to the batch size
+        """
+        for _ in range(4):
+            self.bus.put_nowait(SavePing(DeviceKind.COOLING, datetime(2024, 1, 1)))
+
+        self.executor.execute_batch(self.bus.get_nowait())
+        self.assertEqual(1, self.commits)
+        self.assertEqual(3, self.pings())
+        self.assertEqual(1, self.bus.unfinished_tasks)
+
+        self.executor.execute_batch(self.bus.get_nowait())
+        self.assertEqual(2, self.commits)
+        self.assertEqual(4, self.pings())
+        self.assertEqual(0, self.bus.unfinished_tasks)
+        self.assertEqual({"batches": 2, "commands": 4}, dict(self.executor.counters))
+
+    def test_failing_command(self):
+        """
+        A failing command rolls back only what it has done itself
+        """
+        self.bus.put_nowait(SavePing(DeviceKind.COOLING, datetime(2024, 1, 1)))
+        self.bus.put_nowait(FailingPing())
+        self.bus.put_nowait(SavePing(DeviceKind.COOLING, datetime(2024, 1, 1)))
+
+        self.executor.execute_batch(self.bus.get_nowait())
+        self.assertEqual(1, self.commits)
+        self.assertEqual(2, self.pings())
+        self.assertEqual(1, self.executor.counters["failed"])
+
+    def test_failing_reservation(self):
+        """
+        A batch is executed even if the nounces can't be reserved ahead of it, and every claimed command is done
+        """
+        self.executor.nounce_manager = Mock(reserve_ahead=Mock(side_effect=RuntimeError("database is locked")))
+        self.bus.put_nowait(SavePing(DeviceKind.COOLING, datetime(2024, 1, 1)))
+        self.bus.put_nowait(SavePing(DeviceKind.COOLING, datetime(2024, 1, 1)))
+
+        self.executor.execute_batch(self.bus.get_nowait())
+        self.assertEqual(2, self.pings())
+        self.assertEqual(0, self.bus.unfinished_tasks)
+        self.bus.join()
+
+    def test_unexecuted_commands_done(self):
+        """
+        Commands claimed by a batch that fails as a whole are done nevertheless, so nothing waits for them forever
+        """
+        self.executor.db_session_factory = Mock(side_effect=RuntimeError("unable to open database file"))
+        self.bus.put_nowait(SavePing(DeviceKind.COOLING, datetime(2024, 1, 1)))
+
+        self.executor.execute_batch(self.bus.get_nowait())
+        self.assertEqual(0, self.bus.unfinished_tasks)
+        self.bus.join()
+
+    def test_workers(self):
+        """
+        A command stuck in one worker doesn't stop the other workers from executing the rest of the commands
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            engine = create_database_engine(os.path.join(directory, "workers.db"))
+            AbstractBase.metadata.create_all(engine)
+            session_factory = sessionmaker(engine)
+            stop, let_go = Event(), Event()
+            executor = CommandExecutor(
+                session_factory, Mock(), self.bus, Mock(), datetime, stop, Mock(), batch_size=1, workers=2
+            )
+            thread = Thread(target=executor.run)
+            thread.start()
+
+            self.bus.put_nowait(BlockedDisplay(let_go))
+            self.bus.put_nowait(SavePing(DeviceKind.COOLING, datetime(2024, 1, 1)))
+            try:
+                for _ in range(100):
+                    if executor.counters["commands"] > 0:
+                        break
+                    stop.wait(0.05)
+                self.assertEqual(1, executor.counters["commands"])
+                self.assertFalse(let_go.is_set())
+            finally:
+                let_go.set()
+                self.bus.join()
+                stop.set()
+                # wake the idle workers up, so they notice they've been stopped
+                self.bus.put_nowait(object())
+                self.bus.put_nowait(object())
+                thread.join()
+
+            with session_factory() as session:
+                self.assertEqual(1, session.query(DevicePing).count())
+            engine.dispose()
+
+    def test_nounces_reserved_ahead(self):
+        """
+        Outbound nounces running out are reserved before the batch locks the database, rather than within the batch,
+        where reserving them would wait for the lock held by the batch itself
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            engine = create_database_engine(os.path.join(directory, "nounces.db"))
+            try:
+                AbstractBase.metadata.create_all(engine)
+                session_factory = sessionmaker(engine)
+                nounce_manager = NounceManager(session_factory, outbound_block=4)
+                nounce_manager.load()
+                self.assertEqual([1, 2], [nounce_manager.next_outbound_nounce(0x30) for _ in range(2)])
+
+                executor = CommandExecutor(
+                    session_factory, Mock(), self.bus, Mock(), datetime, Event(), nounce_manager, batch_window=0
+                )
+                command = TakeNounces(3)
+                self.bus.put_nowait(command)
+                executor.execute_batch(self.bus.get_nowait())
+
+                self.assertEqual(0, executor.counters["failed"])
+                self.assertEqual([3, 4, 5], command.nounces)
+            finally:
+                engine.dispose()
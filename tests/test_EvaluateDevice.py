@@ -4,11 +4,11 @@ from queue import Empty, Queue
 from unittest import TestCase
 from unittest.mock import Mock
 from sqlalchemy import create_engine
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, sessionmaker
 from command_bus import EvaluateDevice
 from command_bus.ExecutionContext import ExecutionContext
 from persistence import (
-    AbstractBase, DeviceControl, DevicePing, DeviceStatus, DeviceStatusRepository, SensorMeasure,
+    AbstractBase, DeviceControl, DevicePing, DeviceStatus, DeviceStatusRepository, NounceManager, SensorMeasure,
     ThresholdTemperature,
 )
 from domain_types import DeviceKind, MeasureKind, OperatingMode, PowerStatus
@@ -35,6 +35,8 @@ class TestEvaluateDevice(TestCase):
         self.session.add(ThresholdTemperature(DeviceKind.HEATING, OperatingMode.DAY, 1900))
         self.session.add(ThresholdTemperature(DeviceKind.HEATING, OperatingMode.NIGHT, 1800))
 
+        self.nounce_manager = NounceManager(sessionmaker(engine))
+
         # noinspection PyTypeChecker
         self.context = ExecutionContext(
             self.session,
@@ -42,6 +44,7 @@ class TestEvaluateDevice(TestCase):
             Queue(),
             Mock(),
             self.mock_datetime,
+            self.nounce_manager,
         )
 
         def is_status_log_eq(first: DeviceStatus, second: DeviceStatus, msg=None) -> None:
@@ -4,10 +4,13 @@ from queue import Empty, Queue
 from unittest import TestCase
 from unittest.mock import Mock
 from sqlalchemy import create_engine
-from sqlalchemy.orm import Session
-from command_bus import EvaluateMeasure
+from sqlalchemy.orm import Session, sessionmaker
+from command_bus import AdjustReportingInterval, EvaluateMeasure
 from command_bus.ExecutionContext import ExecutionContext
-from persistence import AbstractBase, DeviceControl, DevicePing, DeviceStatus, SensorMeasure, ThresholdTemperature
+from radio_bus import TransmitScheduler
+from persistence import (
+    AbstractBase, DeviceControl, DevicePing, DeviceStatus, NounceManager, SensorMeasure, ThresholdTemperature,
+)
 from domain_types import DeviceKind, MeasureKind, OperatingMode, PowerStatus
 
 
@@ -28,7 +31,7 @@ class TestEvaluateMeasure(TestCase):
         AbstractBase.metadata.create_all(engine)
         logging.disable(logging.CRITICAL)
 
-        self.outbound_bus: Queue = Queue()
+        self.outbound_bus = TransmitScheduler()
         self.mock_datetime = Mock()
         self.mock_datetime.now = Mock(return_value=self.NOW)
         self.session = Session(engine)
@@ -41,6 +44,8 @@ class TestEvaluateMeasure(TestCase):
         self.session.add(DeviceControl(DeviceKind.HEATING, MeasureKind.BEDROOM, OperatingMode.DAY))
         self.session.add(DeviceControl(DeviceKind.HEATING, MeasureKind.BEDROOM, OperatingMode.NIGHT))
 
+        self.nounce_manager = NounceManager(sessionmaker(engine))
+
         # noinspection PyTypeChecker
         self.context = ExecutionContext(
             self.session,
@@ -48,6 +53,7 @@ class TestEvaluateMeasure(TestCase):
             Queue(),
             Mock(),
             self.mock_datetime,
+            self.nounce_manager,
         )
 
         def is_status_log_eq(first: DeviceStatus, second: DeviceStatus, msg=None) -> None:
@@ -63,12 +69,15 @@ class TestEvaluateMeasure(TestCase):
     def execute(self, measure: SensorMeasure):
         """
         Helper function that executes the command with given measure and then also executes
-        all the commands that have been enqueued by the execution.
+        all the commands that have been enqueued by the execution. Reporting interval adjustments are
+        skipped, they are covered by their own test case.
         """
         EvaluateMeasure(measure).execute(self.context)
         try:
             while True:
-                self.context.command_queue.get_nowait().execute(self.context)
+                command = self.context.command_queue.get_nowait()
+                if not isinstance(command, AdjustReportingInterval):
+                    command.execute(self.context)
         except Empty:
             pass
 
@@ -174,8 +183,7 @@ class TestEvaluateMeasure(TestCase):
         )
 
         self.execute(SensorMeasure(self.NOW - timedelta(minutes=9, seconds=59), MeasureKind.LIVING_ROOM, 24.49))
-        self.assertEqual(2, self.outbound_bus.qsize())
-        self.assertEqual(self.TURN_OFF_BYTES, self.outbound_bus.get_nowait().encoded_data)
+        self.assertEqual(1, self.outbound_bus.qsize())
         self.assertEqual(self.TURN_OFF_BYTES, self.outbound_bus.get_nowait().encoded_data)
 
         logged_statuses = self.session.query(DeviceStatus).all()
@@ -286,8 +294,7 @@ class TestEvaluateMeasure(TestCase):
         )
 
         self.execute(SensorMeasure(self.NOW - timedelta(minutes=8, seconds=59), MeasureKind.LIVING_ROOM, 25.4))
-        self.assertEqual(2, self.outbound_bus.qsize())
-        self.assertEqual(self.TURN_ON_BYTES, self.outbound_bus.get_nowait().encoded_data)
+        self.assertEqual(1, self.outbound_bus.qsize())
         self.assertEqual(self.TURN_ON_BYTES, self.outbound_bus.get_nowait().encoded_data)
 
         logged_statuses = self.session.query(DeviceStatus).all()
@@ -0,0 +1,81 @@
+from unittest import TestCase
+from radio_bus import Framing
+from radio_bus.radio.FrameParser import Frame, FrameParser
+
+
+class TestFrameParser(TestCase):
+    """
+    Test cases for splitting the received byte stream into frames
+    """
+
+    def setUp(self) -> None:
+        self.parser = FrameParser()
+
+    def feed(self, data: bytes) -> list:
+        """
+        Feeds the parser with given data and returns the completed frames, all expected to be nibble-split
+        """
+        frames = self.parser.feed(data)
+        self.assertTrue(all(frame.framing == Framing.NIBBLE for frame in frames))
+        return [frame.data for frame in frames]
+
+    def test_complete_frames(self):
+        """
+        Tests whether complete frames received in a single chunk are all emitted
+        """
+        self.assertEqual(
+            [b'\x01\x02\x03', b'', b'\x7f\x8f'],
+            self.feed(b'\xff\x03\x01\x02\x03\xff\x00\xff\x02\x7f\x8f')
+        )
+        self.assertEqual(0, self.parser.discarded_bytes)
+        self.assertEqual(0, self.parser.resynchronizations)
+
+    def test_frame_split_across_chunks(self):
+        """
+        Tests whether frame is emitted only once all of its bytes have been received
+        """
+        self.assertFalse(self.parser.in_frame)
+        self.assertEqual([], self.feed(b'\xff'))
+        self.assertTrue(self.parser.in_frame)
+        self.assertEqual([], self.feed(b'\x04\x01'))
+        self.assertEqual([], self.feed(b'\x02\x03'))
+        self.assertEqual([b'\x01\x02\x03\x04'], self.feed(b'\x04\xff\x01'))
+        self.assertEqual([b'\x05'], self.feed(b'\x05'))
+        self.assertFalse(self.parser.in_frame)
+
+    def test_noise_before_frame(self):
+        """
+        Tests whether bytes received outside any frame are discarded
+        """
+        self.assertEqual([], self.feed(b'\x01\x02'))
+        self.assertEqual([b'\x0a\x0b'], self.feed(b'\x03\xff\x02\x0a\x0b\x04'))
+        self.assertEqual(4, self.parser.discarded_bytes)
+
+    def test_resynchronization_on_start_marker(self):
+        """
+        Tests whether a frame that got cut short is dropped as soon as the next frame starts, rather than consuming
+        bytes of the following frame
+        """
+        self.assertEqual([], self.feed(b'\xff\x20\x01\x02\x03'))
+        self.assertEqual([b'\x0a\x0b'], self.feed(b'\xff\x02\x0a\x0b'))
+        self.assertEqual(1, self.parser.resynchronizations)
+        self.assertEqual(5, self.parser.discarded_bytes)
+
+    def test_resynchronization_on_corrupted_size(self):
+        """
+        Tests whether start marker received in place of the size byte begins a new frame
+        """
+        self.assertEqual([b'\x0a'], self.feed(b'\xff\xff\x01\x0a'))
+        self.assertEqual(1, self.parser.resynchronizations)
+
+    def test_cobs_frames(self):
+        """
+        Tests whether COBS frames are told apart from nibble-split frames
+        """
+        self.assertEqual([], self.parser.feed(b'\xff\xfe'))
+        self.assertEqual([], self.parser.feed(b'\x02\x01'))
+        self.assertEqual(
+            [Frame(Framing.COBS, b'\x01\x02'), Frame(Framing.NIBBLE, b'\x03'), Frame(Framing.COBS, b'')],
+            self.parser.feed(b'\x02\xff\x01\x03\xff\xfe\x00')
+        )
+        self.assertEqual(0, self.parser.discarded_bytes)
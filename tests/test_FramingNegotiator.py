@@ -0,0 +1,47 @@
+import logging
+from unittest import TestCase
+from radio_bus import Framing, InboundMessage, OutboundMessage
+from radio_bus.FramingNegotiator import FramingNegotiator
+
+
+class TestFramingNegotiator(TestCase):
+    """
+    Test cases for choosing the framing per device address
+    """
+
+    def setUp(self) -> None:
+        logging.disable(logging.CRITICAL)
+        self.negotiator = FramingNegotiator()
+
+    def test_cobs_message(self):
+        """
+        Tests whether message sent in COBS framing is received intact
+        """
+        outbound = OutboundMessage(0x30, 0x01, 0x01, 0x01020304, b'\x00\xff\x80\x7f')
+        frame = outbound.encoded_for(Framing.COBS)
+        self.assertEqual(b'\xff\xfe', frame[:2])
+        self.assertEqual(len(frame) - 3, frame[2])
+        self.assertNotIn(0xFF, frame[1:])
+
+        inbound = InboundMessage(frame[3:], Framing.COBS)
+        self.assertFalse(inbound.is_malformed)
+        self.assertTrue(inbound.is_authentic())
+        self.assertEqual(0x30, inbound.from_address)
+        self.assertEqual(0x01020304, inbound.nounce)
+        self.assertEqual(b'\x00\xff\x80\x7f', inbound.extended_bytes)
+
+        self.assertTrue(InboundMessage(b'\x05', Framing.COBS).is_malformed)
+
+    def test_negotiation(self):
+        """
+        Tests whether the framing follows the last authentic message received from the address
+        """
+        outbound = OutboundMessage(0x30, 0x01, 0x01, 1, b'\x01')
+        self.assertEqual(Framing.NIBBLE, self.negotiator.framing_for(0x30))
+
+        self.negotiator.observe(InboundMessage(outbound.encoded_for(Framing.COBS)[3:], Framing.COBS))
+        self.assertEqual(Framing.COBS, self.negotiator.framing_for(0x30))
+        self.assertEqual(Framing.NIBBLE, self.negotiator.framing_for(0x31))
+
+        self.negotiator.observe(InboundMessage(outbound.encoded_data[2:]))
+        self.assertEqual(Framing.NIBBLE, self.negotiator.framing_for(0x30))
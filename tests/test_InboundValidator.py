@@ -0,0 +1,140 @@
+import logging
+from unittest import TestCase
+from unittest.mock import Mock
+from secrets import MY_ADDRESS
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from persistence import AbstractBase, NounceManager, NounceRepository
+from radio_bus import Budget, FrameDeduplicator, InboundMessage, OutboundMessage, RateLimiter, TrafficClass
+from radio_bus.InboundValidator import InboundValidator
+from radio_bus.PayloadRegistry import PayloadRegistry
+
+
+class TestInboundValidator(TestCase):
+    """
+    Test cases for staged validation of inbound messages
+    """
+    SENDER = 0x20
+
+    def setUp(self) -> None:
+        engine = create_engine("sqlite://")
+        AbstractBase.metadata.create_all(engine)
+        logging.disable(logging.CRITICAL)
+
+        self.session_factory = sessionmaker(engine)
+        self.nounce_manager = NounceManager(self.session_factory)
+        registry = PayloadRegistry()
+        registry.register(self.SENDER, 0x00, None, Mock())
+        registry.register(self.SENDER, 0x01, "B", Mock())
+        self.now = 0.0
+        self.validator = InboundValidator(registry, self.nounce_manager, FrameDeduplicator(clock=lambda: self.now))
+
+    @staticmethod
+    def receive(from_address: int, to_address: int, command: int, nounce: int) -> InboundMessage:
+        """
+        Creates inbound message as it would be received from radio
+        """
+        return InboundMessage(OutboundMessage(from_address, to_address, command, nounce, b'\x01').encoded_data[2:])
+
+    def last_inbound_nounce(self) -> int:
+        """
+        Returns the inbound nounce of the sender, as written down on shutdown
+        """
+        self.nounce_manager.close()
+        with self.session_factory() as session:
+            return NounceRepository(session).get_last_inbound_nounce(self.SENDER)
+
+    def test_accepted(self):
+        """
+        Tests whether valid message is accepted and its nounce is registered
+        """
+        msg = self.receive(self.SENDER, MY_ADDRESS, 0x01, 5)
+
+        self.assertIs(msg, self.validator.validate(msg))
+        self.assertEqual(5, self.last_inbound_nounce())
+        self.assertEqual(1, self.validator.counters["accepted"])
+
+    def test_replayed(self):
+        """
+        Tests whether message is rejected when its nounce has been used before
+        """
+        self.assertIsNotNone(self.validator.validate(self.receive(self.SENDER, MY_ADDRESS, 0x01, 5)))
+        self.now += FrameDeduplicator.WINDOW
+        self.assertIsNone(self.validator.validate(self.receive(self.SENDER, MY_ADDRESS, 0x01, 5)))
+        self.assertEqual(1, self.validator.counters["replayed"])
+
+    def test_duplicate(self):
+        """
+        Tests whether copy of a message heard by another gateway is dropped without being considered a replay
+        """
+        self.assertIsNotNone(self.validator.validate(self.receive(self.SENDER, MY_ADDRESS, 0x01, 5)))
+        self.now += 0.01
+        self.assertIsNone(self.validator.validate(self.receive(self.SENDER, MY_ADDRESS, 0x01, 5)))
+        self.assertEqual(1, self.validator.counters["duplicate"])
+        self.assertEqual(0, self.validator.counters["replayed"])
+
+    def test_nounce_request(self):
+        """
+        Tests whether nounce request is accepted regardless of its nounce and doesn't touch the persisted one
+        """
+        self.assertIsNotNone(self.validator.validate(self.receive(self.SENDER, MY_ADDRESS, 0x01, 5)))
+        self.assertIsNotNone(self.validator.validate(self.receive(self.SENDER, MY_ADDRESS, 0x00, 1)))
+        self.assertEqual(5, self.last_inbound_nounce())
+
+    def test_foreign_and_unknown(self):
+        """
+        Tests whether messages addressed to someone else, from unknown senders or with unknown commands are rejected
+        before being authenticated
+        """
+        foreign = self.receive(self.SENDER, MY_ADDRESS + 1, 0x01, 5)
+        unknown = self.receive(self.SENDER + 1, MY_ADDRESS, 0x01, 5)
+
+        self.assertIsNone(self.validator.validate(foreign))
+        self.assertIsNone(self.validator.validate(unknown))
+        self.assertIsNone(self.validator.validate(self.receive(self.SENDER, MY_ADDRESS, 0x02, 5)))
+        self.assertIsNone(self.validator.validate(InboundMessage(b'\x01\x02\x03')))
+
+        self.assertEqual(1, self.validator.counters["foreign"])
+        self.assertEqual(1, self.validator.counters["unknown_sender"])
+        self.assertEqual(1, self.validator.counters["unknown_command"])
+        self.assertEqual(1, self.validator.counters["malformed"])
+        self.assertEqual(4, self.validator.counters["received"])
+        self.assertIsNone(getattr(foreign, "_InboundMessage__is_hmac_valid"))
+        self.assertIsNone(getattr(unknown, "_InboundMessage__is_hmac_valid"))
+
+    def test_rate_limited(self):
+        """
+        Tests whether messages over the sender's budget are dropped, while spoofed frames and copies of genuine ones
+        don't use the budget up
+        """
+        registry = PayloadRegistry()
+        registry.register(self.SENDER, 0x01, "B", Mock(), traffic_class=TrafficClass.MEASURE)
+        validator = InboundValidator(
+            registry,
+            self.nounce_manager,
+            FrameDeduplicator(clock=lambda: self.now),
+            RateLimiter({TrafficClass.MEASURE: Budget(0.001, 1)})
+        )
+
+        spoofed = bytearray(OutboundMessage(self.SENDER, MY_ADDRESS, 0x01, 4, b'\x01').encoded_data[2:])
+        spoofed[0] ^= 0x01
+        self.assertIsNone(validator.validate(InboundMessage(bytes(spoofed))))
+        self.assertIsNotNone(validator.validate(self.receive(self.SENDER, MY_ADDRESS, 0x01, 5)))
+        self.assertIsNone(validator.validate(self.receive(self.SENDER, MY_ADDRESS, 0x01, 5)))
+        self.now += FrameDeduplicator.WINDOW
+        self.assertIsNone(validator.validate(self.receive(self.SENDER, MY_ADDRESS, 0x01, 5)))
+        self.assertEqual(0, validator.counters["rate_limited"])
+
+        self.assertIsNone(validator.validate(self.receive(self.SENDER, MY_ADDRESS, 0x01, 6)))
+        self.assertEqual(1, validator.counters["rate_limited"])
+
+    def test_unauthenticated(self):
+        """
+        Tests whether message with incorrect MAC is rejected
+        """
+        encoded = bytearray(OutboundMessage(self.SENDER, MY_ADDRESS, 0x01, 5).encoded_data[2:])
+        encoded[0] ^= 0x01
+
+        self.assertIsNone(self.validator.validate(InboundMessage(bytes(encoded))))
+        self.assertEqual(1, self.validator.counters["unauthenticated"])
+        self.assertEqual(0, self.last_inbound_nounce())
@@ -0,0 +1,92 @@
+from random import Random
+from unittest import TestCase
+from radio_bus.radio.NibbleCodec import decode, encode
+
+
+def reference_encode(message: bytes) -> bytes:
+    """
+    Byte-by-byte encoding the codec must stay compatible with
+    """
+    encoded = bytearray()
+    for b in message:
+        if b & 0x80:
+            encoded.append((b >> 4) | 0x80)
+            encoded.append(b & 0x0F)
+        else:
+            encoded.append(b)
+    return bytes(encoded)
+
+
+def reference_decode(data: bytes) -> bytes:
+    """
+    Byte-by-byte decoding the codec must give the same result as, for any data
+    """
+    decoded = bytearray()
+    i = 0
+    while i < len(data):
+        if data[i] & 0x80 and i < len(data) - 1:
+            decoded.append(((data[i] & 0x0F) << 4) | data[i + 1])
+            i += 1
+        else:
+            decoded.append(data[i])
+        i += 1
+    return bytes(decoded)
+
+
+class TestNibbleCodec(TestCase):
+    """
+    Test cases for the nibble-split encoding
+    """
+
+    def test_every_byte_value(self):
+        """
+        Tests whether every possible byte value survives encoding and decoding
+        """
+        message = bytes(range(256))
+        encoded = encode(message)
+
+        self.assertEqual(reference_encode(message), encoded)
+        self.assertEqual(384, len(encoded))
+        self.assertNotIn(0xFF, encoded)
+        self.assertEqual(message, decode(encoded))
+
+    def test_message_without_high_bits(self):
+        """
+        Tests whether message without any byte needing split is left as it is
+        """
+        self.assertEqual(b'\x00\x01\x7f', encode(b'\x00\x01\x7f'))
+        self.assertEqual(b'\x00\x01\x7f', decode(b'\x00\x01\x7f'))
+        self.assertEqual(b'', encode(b''))
+        self.assertEqual(b'', decode(b''))
+
+    def test_random_messages(self):
+        """
+        Tests random messages against the byte-by-byte reference encoding
+        """
+        generator = Random(4800)
+        for length in range(1, 120):
+            message = bytes(generator.getrandbits(8) for _ in range(length))
+            encoded = encode(message)
+
+            self.assertEqual(reference_encode(message), encoded)
+            self.assertEqual(message, decode(encoded))
+
+    def test_malformed_data(self):
+        """
+        Tests whether data that couldn't have been encoded decodes the way the byte-by-byte loop decodes it
+        """
+        corrupted = bytes.fromhex(
+            "83866a8b860b08ab870ee78e01369d0d59ae80080c820084848c8f188c220a01098d8e808c810da90b0872875cffe5080b8c0382aa"
+            "8e8f01050e3702"
+        )
+        for data in (b'\x81', b'\x01\x81', b'\x81\x82\x03', b'\x81\x7f', b'\x8f\xff', b'\x81\x02\x83', corrupted):
+            self.assertEqual(reference_decode(data), decode(data))
+
+    def test_random_data(self):
+        """
+        Tests random data, mostly not encoded by anyone, against the byte-by-byte reference decoding
+        """
+        generator = Random(4801)
+        for length in range(1, 2000):
+            data = bytes(generator.getrandbits(8) for _ in range(length % 120))
+            self.assertEqual(reference_decode(data), decode(data))
@@ -0,0 +1,108 @@
+from typing import Tuple
+from unittest import TestCase
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from persistence import AbstractBase, NounceManager, NounceRepository
+
+
+class TestNounceManager(TestCase):
+    """
+    Test cases for keeping nounces in memory and writing them down behind
+    """
+    DEVICE = 0x30
+
+    def setUp(self) -> None:
+        engine = create_engine("sqlite://")
+        AbstractBase.metadata.create_all(engine)
+        self.session_factory = sessionmaker(engine)
+
+    def persisted(self) -> Tuple[int, int]:
+        """
+        Returns the inbound and outbound nounce of the device, as written down
+        """
+        with self.session_factory() as session:
+            nounce = NounceRepository(session).get_nounce(self.DEVICE)
+            return nounce.inbound, nounce.outbound
+
+    def test_inbound_marks(self):
+        """
+        Inbound nounces below the persisted mark are accepted without writing anything, the mark is moved forward
+        once half of the margin is used up, and a nounce past it is written down before it's accepted
+        """
+        manager = NounceManager(self.session_factory, recovery_margin=16)
+        manager.load()
+        self.assertEqual(16, self.persisted()[0])
+
+        manager.register_inbound_nounce(self.DEVICE, 5)
+        self.assertEqual(5, manager.get_last_inbound_nounce(self.DEVICE))
+        manager.flush()
+        self.assertEqual(0, manager.counters["flushes"])
+        self.assertEqual(16, self.persisted()[0])
+
+        manager.register_inbound_nounce(self.DEVICE, 8)
+        manager.run(FiringOnce())
+        self.assertEqual(8 + 16, self.persisted()[0])
+
+        manager.register_inbound_nounce(self.DEVICE, 1000)
+        self.assertEqual(1000 + 16, self.persisted()[0])
+        self.assertEqual(1000, manager.get_last_inbound_nounce(self.DEVICE))
+
+    def test_clean_shutdown(self):
+        """
+        After clean shutdown, nounces continue exactly where they have been left
+        """
+        manager = NounceManager(self.session_factory)
+        manager.register_inbound_nounce(self.DEVICE, 5)
+        manager.next_outbound_nounce(self.DEVICE)
+        manager.close()
+
+        restarted = NounceManager(self.session_factory)
+        self.assertEqual(5, restarted.get_last_inbound_nounce(self.DEVICE))
+        self.assertEqual(2, restarted.next_outbound_nounce(self.DEVICE))
+
+    def test_crash_recovery(self):
+        """
+        After a crash, nounces resume at the persisted marks, so neither inbound nor outbound ones are ever reused
+        """
+        manager = NounceManager(self.session_factory, recovery_margin=16, outbound_block=8)
+        manager.register_inbound_nounce(self.DEVICE, 5)
+        manager.register_inbound_nounce(self.DEVICE, 1000)
+        manager.next_outbound_nounce(self.DEVICE)
+        # crashed, never closed
+
+        restarted = NounceManager(self.session_factory, recovery_margin=16, outbound_block=8)
+        self.assertEqual(1000 + 16, restarted.get_last_inbound_nounce(self.DEVICE))
+        self.assertEqual(8 + 1, restarted.next_outbound_nounce(self.DEVICE))
+        self.assertEqual((1016 + 16, 16), self.persisted())
+
+    def test_outbound_blocks(self):
+        """
+        Outbound nounces are reserved a block at a time, ahead of being handed out
+        """
+        manager = NounceManager(self.session_factory, outbound_block=4)
+        manager.load()
+        self.assertEqual((64, 4), self.persisted())
+
+        self.assertEqual([1, 2], [manager.next_outbound_nounce(self.DEVICE) for _ in range(2)])
+        manager.run(FiringOnce())
+        self.assertEqual((64, 6), self.persisted())
+
+        # the write-behind process hasn't caught up, so the block is reserved right away
+        self.assertEqual([3, 4, 5, 6, 7], [manager.next_outbound_nounce(self.DEVICE) for _ in range(5)])
+        self.assertEqual((64, 10), self.persisted())
+
+
+class FiringOnce:
+    """
+    Stop event that lets the loop run exactly once
+    """
+
+    def __init__(self) -> None:
+        self.checks = 0
+
+    def is_set(self) -> bool:
+        """
+        Returns false for the first check only
+        """
+        self.checks += 1
+        return self.checks > 1
@@ -0,0 +1,130 @@
+import logging
+from datetime import datetime, timedelta
+from struct import pack
+from unittest import TestCase
+from unittest.mock import Mock
+from secrets import MY_ADDRESS
+from command_bus import (
+    EvaluateDevice, EvaluateMeasure, RecordDeviceStatus, RespondNounceRequest, SaveMeasure, SaveMeasures, SavePing
+)
+from domain_types import DeviceKind, MeasureKind
+from radio_bus import ActuatorReconciler, InboundMessage, OutboundMessage, TransmitScheduler
+from radio_bus.PayloadRegistryFactory import create_payload_registry
+
+
+class TestPayloadRegistry(TestCase):
+    """
+    Test cases for dispatching inbound messages to their handlers
+    """
+    NOW = datetime(2023, 9, 13, 11, 35, 15)
+
+    def setUp(self) -> None:
+        logging.disable(logging.CRITICAL)
+        self.reconciler = ActuatorReconciler(TransmitScheduler(), Mock())
+        self.registry = create_payload_registry(self.reconciler)
+
+    def dispatch(self, from_address: int, command: int, data: bytes) -> list:
+        """
+        Dispatches message as it would be received from radio and returns the created commands
+        """
+        msg = InboundMessage(OutboundMessage(from_address, MY_ADDRESS, command, 1, data).encoded_data[2:])
+        return [*self.registry.dispatch(msg, self.NOW)]
+
+    def test_nounce_request(self):
+        """
+        Tests whether nounce request from any known sender is responded
+        """
+        for address in [DeviceKind.COOLING.value, MeasureKind.OUTDOOR.value]:
+            [command] = self.dispatch(address, 0x00, b'')
+            self.assertIsInstance(command, RespondNounceRequest)
+            self.assertEqual(address, command.respond_to)
+
+    def test_ping(self):
+        """
+        Tests whether device ping records the status, saves the ping and evaluates the device
+        """
+        [status, ping, evaluation] = self.dispatch(DeviceKind.HEATING.value, 0x01, b'\x01')
+
+        self.assertIsInstance(status, RecordDeviceStatus)
+        self.assertEqual(DeviceKind.HEATING, status.kind)
+        self.assertTrue(status.is_working)
+        self.assertIsInstance(ping, SavePing)
+        self.assertEqual(self.NOW, ping.timestamp)
+        self.assertIsInstance(evaluation, EvaluateDevice)
+
+    def test_ping_while_reconciling(self):
+        """
+        Tests whether device ping doesn't override the status while a command sent to the device awaits confirmation
+        """
+        self.reconciler.transmitted(OutboundMessage(MY_ADDRESS, DeviceKind.HEATING.value, 0x02, 1))
+        [ping, evaluation] = self.dispatch(DeviceKind.HEATING.value, 0x01, b'\x01')
+
+        self.assertIsInstance(ping, SavePing)
+        self.assertIsInstance(evaluation, EvaluateDevice)
+
+    def test_indoor_measure(self):
+        """
+        Tests whether indoor measure is saved and evaluated
+        """
+        [save, evaluation] = self.dispatch(MeasureKind.BEDROOM.value, 0x01, pack("<fff", 21.5, 45, 3.25))
+
+        self.assertIsInstance(save, SaveMeasure)
+        self.assertIsInstance(evaluation, EvaluateMeasure)
+        self.assertIs(save.measure, evaluation.measure)
+        self.assertEqual(MeasureKind.BEDROOM, save.measure.kind)
+        self.assertEqual(21.5, save.measure.temperature)
+        self.assertEqual(45, save.measure.humidity)
+        self.assertEqual(3.25, save.measure.voltage)
+        self.assertEqual(self.NOW, save.measure.timestamp)
+
+    def test_outdoor_measure(self):
+        """
+        Tests whether outdoor measure is saved only
+        """
+        [save] = self.dispatch(MeasureKind.OUTDOOR.value, 0x01, pack("<ff", -3.5, 3.25))
+
+        self.assertIsInstance(save, SaveMeasure)
+        self.assertEqual(-3.5, save.measure.temperature)
+        self.assertIsNone(save.measure.humidity)
+
+    def test_indoor_measures(self):
+        """
+        Tests whether a batch of indoor measures is saved at once and only the newest one is evaluated
+        """
+        payload = b''.join([
+            pack("<Hfff", 120, 21.0, 45, 3.25),
+            pack("<Hfff", 0, 21.5, 46, 3.25),
+            pack("<Hfff", 60, 21.25, 47, 3.25),
+        ])
+        [save, evaluation] = self.dispatch(MeasureKind.LIVING_ROOM.value, 0x02, payload)
+
+        self.assertIsInstance(save, SaveMeasures)
+        self.assertEqual(
+            [self.NOW - timedelta(minutes=2), self.NOW, self.NOW - timedelta(minutes=1)],
+            [measure.timestamp for measure in save.measures]
+        )
+        self.assertEqual([21.0, 21.5, 21.25], [measure.temperature for measure in save.measures])
+        self.assertEqual([45, 46, 47], [measure.humidity for measure in save.measures])
+        self.assertIsInstance(evaluation, EvaluateMeasure)
+        self.assertIs(save.measures[1], evaluation.measure)
+
+    def test_outdoor_measures(self):
+        """
+        Tests whether a batch of outdoor measures is saved only
+        """
+        payload = pack("<Hff", 30, -3.5, 3.25) + pack("<Hff", 0, -4, 3.25)
+        [save] = self.dispatch(MeasureKind.OUTDOOR.value, 0x02, payload)
+
+        self.assertIsInstance(save, SaveMeasures)
+        self.assertEqual([-3.5, -4], [measure.temperature for measure in save.measures])
+        self.assertEqual(self.NOW - timedelta(seconds=30), save.measures[0].timestamp)
+
+    def test_unexpected_payload(self):
+        """
+        Tests whether messages with unexpected payload length or unknown command are ignored
+        """
+        self.assertEqual([], self.dispatch(MeasureKind.BEDROOM.value, 0x01, pack("<ff", 21.5, 3.25)))
+        self.assertEqual([], self.dispatch(DeviceKind.COOLING.value, 0x01, b''))
+        self.assertEqual([], self.dispatch(DeviceKind.COOLING.value, 0x7F, b'\x01'))
+        self.assertEqual([], self.dispatch(MeasureKind.BEDROOM.value, 0x02, b''))
+        self.assertEqual([], self.dispatch(MeasureKind.BEDROOM.value, 0x02, pack("<Hfff", 0, 21.5, 45, 3) + b'\x00'))
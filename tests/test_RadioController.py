@@ -0,0 +1,84 @@
+import logging
+from datetime import datetime
+from queue import Queue
+from threading import Event
+from unittest import TestCase
+from unittest.mock import Mock
+from secrets import MY_ADDRESS
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from persistence import AbstractBase, NounceManager
+from radio_bus import Framing, OutboundMessage, RadioController, RadioGateway, TransmitScheduler
+from radio_bus.radio.FrameParser import Frame
+
+
+class TestRadioController(TestCase):
+    """
+    Test cases for receiving through several radio gateways
+    """
+    SENDER = 0x20
+
+    def setUp(self) -> None:
+        engine = create_engine("sqlite://")
+        AbstractBase.metadata.create_all(engine)
+        logging.disable(logging.CRITICAL)
+
+        self.near = RadioGateway("near", Mock())
+        self.far = RadioGateway("far", Mock())
+        self.command_bus: Queue = Queue()
+        self.controller = RadioController(
+            [self.near, self.far],
+            TransmitScheduler(),
+            self.command_bus,
+            datetime,
+            Event(),
+            NounceManager(sessionmaker(engine))
+        )
+
+    def test_slot_schedule(self):
+        """
+        Sensors are scheduled with the reporting interval most recently sent to them, actuators aren't scheduled
+        """
+        schedule = RadioController(
+            [self.near],
+            TransmitScheduler(),
+            self.command_bus,
+            datetime,
+            Event(),
+            self.controller.nounce_manager,
+            reporting_intervals={0x41: 600}
+        ).slots.schedule
+
+        self.assertEqual(60, schedule.cycle)
+        self.assertEqual(600, schedule.slot_of(0x41).interval)
+        self.assertEqual(60, schedule.slot_of(self.SENDER).interval)
+        self.assertIsNone(schedule.slot_of(0x30))
+        self.assertIsNone(schedule.slot_of(0x31))
+
+    def receive(self, gateway: RadioGateway, nounce: int) -> None:
+        """
+        Makes given gateway receive a nounce request from the sender
+        """
+        encoded = OutboundMessage(self.SENDER, MY_ADDRESS, 0x00, nounce).encoded_data[2:]
+        self.controller.handle_frame(Frame(Framing.NIBBLE, encoded), gateway)
+
+    def test_first_gateway_by_default(self):
+        """
+        Addresses that haven't been heard yet are reached through the first gateway
+        """
+        self.assertIs(self.near, self.controller.gateway_for(self.SENDER))
+
+    def test_deduplication_and_routing(self):
+        """
+        Copy of a frame heard by both gateways is handled once, messages are routed through the gateway that heard
+        the address most recently
+        """
+        self.receive(self.far, 1)
+        self.receive(self.near, 1)
+        self.assertEqual(1, self.command_bus.qsize())
+        self.assertEqual(1, self.controller.validator.counters["duplicate"])
+        self.assertIs(self.far, self.controller.gateway_for(self.SENDER))
+
+        self.receive(self.near, 2)
+        self.assertEqual(2, self.command_bus.qsize())
+        self.assertIs(self.near, self.controller.gateway_for(self.SENDER))
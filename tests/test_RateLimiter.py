@@ -0,0 +1,49 @@
+from unittest import TestCase
+from radio_bus import Budget, RateLimiter, TrafficClass
+
+
+class TestRateLimiter(TestCase):
+    """
+    Test cases for per-sender rate limiting of inbound frames
+    """
+
+    def setUp(self) -> None:
+        self.now = 0.0
+        self.limiter = RateLimiter(
+            {TrafficClass.MEASURE: Budget(0.5, 2), TrafficClass.PING: Budget(1, 1)},
+            lambda: self.now
+        )
+
+    def test_burst_and_refill(self):
+        """
+        Sender can send a burst, then it has to wait for the bucket to refill
+        """
+        self.assertTrue(self.limiter.allow(0x20, TrafficClass.MEASURE))
+        self.assertTrue(self.limiter.allow(0x20, TrafficClass.MEASURE))
+        self.assertFalse(self.limiter.allow(0x20, TrafficClass.MEASURE))
+
+        self.now += 1.0
+        self.assertFalse(self.limiter.allow(0x20, TrafficClass.MEASURE))
+        self.now += 1.0
+        self.assertTrue(self.limiter.allow(0x20, TrafficClass.MEASURE))
+        self.assertEqual(2, self.limiter.counters["measure"])
+
+    def test_separate_budgets(self):
+        """
+        Every sender has its own budget for every traffic class, classes without budget are not limited
+        """
+        self.assertTrue(self.limiter.allow(0x20, TrafficClass.PING))
+        self.assertFalse(self.limiter.allow(0x20, TrafficClass.PING))
+        self.assertTrue(self.limiter.allow(0x21, TrafficClass.PING))
+        self.assertTrue(self.limiter.allow(0x20, TrafficClass.MEASURE))
+
+        for _ in range(10):
+            self.assertTrue(self.limiter.allow(0x20, TrafficClass.NOUNCE_REQUEST))
+            self.assertTrue(self.limiter.allow(0x20, None))
+
+    def test_parse_budget(self):
+        """
+        Budget is parsed from the command line format
+        """
+        self.assertEqual((TrafficClass.MEASURE, Budget(0.1, 10)), RateLimiter.parse_budget("measure:0.1:10"))
+        self.assertRaises(ValueError, RateLimiter.parse_budget, "measures:0.1:10")
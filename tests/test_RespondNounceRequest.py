@@ -0,0 +1,85 @@
+import logging
+from datetime import datetime, timedelta
+from unittest import TestCase
+from unittest.mock import Mock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from command_bus import RespondNounceRequest
+from command_bus.ExecutionContext import ExecutionContext
+from persistence import AbstractBase, NounceManager, NounceRequestResponseLog
+from radio_bus import TransmitScheduler
+
+
+class TestRespondNounceRequest(TestCase):
+    """
+    Test case for responding to nounce requests
+    """
+    NOW = datetime(2023, 9, 13, 11, 35, 15)
+    DEVICE = 0x30
+
+    def setUp(self) -> None:
+        engine = create_engine("sqlite://")
+        AbstractBase.metadata.create_all(engine)
+        logging.disable(logging.CRITICAL)
+
+        self.session = Session(engine)
+        self.outbound_bus = TransmitScheduler()
+        self.mock_datetime = Mock()
+        self.mock_datetime.now = Mock(return_value=self.NOW)
+
+        self.nounce_manager = NounceManager(sessionmaker(engine))
+
+        # noinspection PyTypeChecker
+        self.context = ExecutionContext(
+            self.session,
+            self.outbound_bus,
+            Mock(),
+            Mock(),
+            self.mock_datetime,
+            self.nounce_manager,
+        )
+
+    def tearDown(self) -> None:
+        self.session.close()
+
+    def respond(self) -> None:
+        """
+        Helper function that executes the command and commits the results
+        """
+        RespondNounceRequest(self.DEVICE).execute(self.context)
+        self.session.commit()
+
+    def responses(self) -> int:
+        """
+        Returns the number of responses logged
+        """
+        return self.session.query(NounceRequestResponseLog).count()
+
+    def test_reuses_queued_response(self):
+        """
+        Requests coming while the response is still queued are answered by it
+        """
+        self.respond()
+        self.respond()
+        self.respond()
+
+        self.assertEqual(1, self.outbound_bus.qsize())
+        self.assertEqual(1, self.responses())
+        self.assertEqual(2, self.nounce_manager.next_outbound_nounce(self.DEVICE))
+
+    def test_coalesces_within_window(self):
+        """
+        Requests coming shortly after the response has been transmitted are answered by it, later ones get a new one
+        """
+        self.respond()
+        self.outbound_bus.get_nowait()
+
+        self.mock_datetime.now.return_value = self.NOW + timedelta(seconds=1)
+        self.respond()
+        self.assertEqual(0, self.outbound_bus.qsize())
+
+        self.mock_datetime.now.return_value = self.NOW + RespondNounceRequest.COALESCE_WINDOW
+        self.respond()
+        self.assertEqual(1, self.outbound_bus.qsize())
+        self.assertEqual(2, self.responses())
+        self.assertEqual(3, self.nounce_manager.next_outbound_nounce(self.DEVICE))
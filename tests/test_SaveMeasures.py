@@ -0,0 +1,57 @@
+import logging
+from datetime import datetime, timedelta
+from unittest import TestCase
+from unittest.mock import Mock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from command_bus import SaveMeasures
+from command_bus.ExecutionContext import ExecutionContext
+from persistence import AbstractBase, SensorMeasure
+from domain_types import MeasureKind
+
+
+class TestSaveMeasures(TestCase):
+    """
+    Test case for saving a batch of measures
+    """
+    NOW = datetime(2023, 9, 13, 11, 35, 15)
+
+    def setUp(self) -> None:
+        engine = create_engine("sqlite://")
+        AbstractBase.metadata.create_all(engine)
+        logging.disable(logging.CRITICAL)
+
+        self.session = Session(engine)
+        self.publisher = Mock()
+
+        # noinspection PyTypeChecker
+        self.context = ExecutionContext(
+            self.session,
+            Mock(),
+            Mock(),
+            self.publisher,
+            Mock(),
+            Mock(),
+        )
+
+    def tearDown(self) -> None:
+        self.session.close()
+
+    def test_saving_batch(self):
+        """
+        All the measures should be saved, but only the newest one published
+        """
+        measures = [
+            SensorMeasure(self.NOW - timedelta(minutes=2), MeasureKind.BEDROOM, 21.0, 40.0, 3.2),
+            SensorMeasure(self.NOW, MeasureKind.BEDROOM, 21.5, 41.0, 3.2),
+            SensorMeasure(self.NOW - timedelta(minutes=1), MeasureKind.BEDROOM, 21.2, 40.5, 3.2),
+        ]
+        SaveMeasures(measures).execute(self.context)
+        self.session.commit()
+
+        saved = self.session.query(SensorMeasure).order_by(SensorMeasure.timestamp).all()
+        self.assertEqual([21.0, 21.2, 21.5], [measure.temperature for measure in saved])
+        self.assertEqual(2, self.publisher.publish.call_count)
+        [temperature_update], _ = self.publisher.publish.call_args_list[0]
+        self.assertEqual(21.5, temperature_update["payload"]["temperature"])
+        self.assertEqual(self.NOW.isoformat(), temperature_update["payload"]["timestamp"])
@@ -33,6 +33,7 @@ class TestSavePing(TestCase):
             self.mock_queue,
             Mock(),
             self.mock_datetime,
+            Mock(),
         )
 
         def is_ping_eq(first, second, msg=None) -> None:
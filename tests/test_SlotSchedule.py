@@ -0,0 +1,92 @@
+from struct import pack
+from unittest import TestCase
+from radio_bus import OutboundMessage, Slot, SlotSchedule, SlotTracker
+
+
+class TestSlotSchedule(TestCase):
+    """
+    Test cases for computing and tracking transmit slots
+    """
+
+    def setUp(self) -> None:
+        self.schedule = SlotSchedule({0x20: 60, 0x21: 60, 0x30: 60, 0x41: 170}, 0.25, 1000.0)
+
+    def test_slots(self):
+        """
+        Tests whether slots are spread evenly across the cycle and intervals are rounded to whole cycles
+        """
+        self.assertEqual(60, self.schedule.cycle)
+        self.assertEqual(Slot(0.0, 0.25, 60), self.schedule.slot_of(0x20))
+        self.assertEqual(Slot(15.0, 0.25, 60), self.schedule.slot_of(0x21))
+        self.assertEqual(Slot(45.0, 0.25, 180), self.schedule.slot_of(0x41))
+        self.assertIsNone(self.schedule.slot_of(0x31))
+
+        # the cycle stays as long as given, even when every node reports less often
+        schedule = SlotSchedule({0x20: 180, 0x41: 600}, 0.25, 1000.0, 60)
+        self.assertEqual(60, schedule.cycle)
+        self.assertEqual(Slot(30.0, 0.25, 600), schedule.slot_of(0x41))
+
+        self.assertRaises(ValueError, SlotSchedule, {})
+        self.assertRaises(ValueError, SlotSchedule, {address: 1 for address in range(5)})
+
+    def test_slot_at(self):
+        """
+        Tests whether the owner of the slot is found for any point in time
+        """
+        self.assertEqual(0x21, self.schedule.slot_at(1075.1))
+        self.assertEqual(0x41, self.schedule.slot_at(1045.0))
+        self.assertIsNone(self.schedule.slot_at(1075.3))
+
+        self.assertTrue(self.schedule.is_in_slot(0x21, 1075.1))
+        self.assertFalse(self.schedule.is_in_slot(0x20, 1075.1))
+        # node reporting every third cycle only
+        self.assertTrue(self.schedule.is_in_slot(0x41, 1225.0))
+        self.assertFalse(self.schedule.is_in_slot(0x41, 1105.0))
+
+    def test_next_slot_start(self):
+        """
+        Tests whether the next slot start is computed from any point in time
+        """
+        self.assertEqual(1015.0, self.schedule.next_slot_start(0x21, 900.0))
+        self.assertEqual(1015.0, self.schedule.next_slot_start(0x21, 1015.0))
+        self.assertEqual(1075.0, self.schedule.next_slot_start(0x21, 1015.1))
+        self.assertEqual(1225.0, self.schedule.next_slot_start(0x41, 1046.0))
+
+    def test_tracking(self):
+        """
+        Tests whether nodes out of their slots are assigned them, but not more often than they report, and not forever
+        """
+        tracker = SlotTracker(self.schedule)
+        self.assertFalse(tracker.observe(0x31, 1000.0))
+        self.assertFalse(tracker.observe(0x20, 1000.1))
+
+        self.assertTrue(tracker.observe(0x20, 1010.0))
+        self.assertFalse(tracker.observe(0x20, 1050.0))
+        for cycle in range(1, SlotTracker.MAX_ASSIGNMENTS):
+            self.assertTrue(tracker.observe(0x20, 1010.0 + 60 * cycle))
+        self.assertFalse(tracker.observe(0x20, 1010.0 + 60 * SlotTracker.MAX_ASSIGNMENTS))
+
+        self.assertEqual(1, tracker.counters["unscheduled"])
+        self.assertEqual(1, tracker.counters["in_slot"])
+        self.assertEqual(SlotTracker.MAX_ASSIGNMENTS, tracker.counters["assigned"])
+        self.assertEqual(SlotTracker.MAX_ASSIGNMENTS + 2, tracker.counters["between_slots"])
+
+    def test_reporting_interval(self):
+        """
+        Tests whether the reporting interval sent to a node is fed into the schedule, and the node isn't assigned its
+        slot again for keeping its own phase
+        """
+        tracker = SlotTracker(self.schedule)
+        tracker.transmitted(OutboundMessage(0x01, 0x20, 0x04, 1, pack("<H", 600)))
+        tracker.transmitted(OutboundMessage(0x01, 0x21, 0x03, 2, pack("<LHH", 1000, 60, 250)))
+        self.assertEqual(Slot(0.0, 0.25, 600), self.schedule.slot_of(0x20))
+        self.assertEqual(Slot(15.0, 0.25, 60), self.schedule.slot_of(0x21))
+
+        # in its slot, but in a cycle other than the one the schedule would have picked
+        self.assertFalse(tracker.observe(0x20, 1180.1))
+        self.assertEqual(1, tracker.counters["in_slot"])
+
+        # out of the slot, assigned no more often than the node now reports
+        self.assertTrue(tracker.observe(0x20, 1190.0))
+        self.assertFalse(tracker.observe(0x20, 1490.0))
+        self.assertTrue(tracker.observe(0x20, 1790.0))
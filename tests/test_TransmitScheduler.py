@@ -0,0 +1,114 @@
+from queue import Empty
+from time import monotonic
+from unittest import TestCase
+from radio_bus import Framing, OutboundMessage, TransmitScheduler
+
+
+class TestTransmitScheduler(TestCase):
+    """
+    Test cases for ordering, superseding and pacing of outbound frames
+    """
+
+    def test_priorities(self):
+        """
+        Tests whether actuator commands go before other frames, and nounce replies go last
+        """
+        scheduler = TransmitScheduler()
+        nounce_reply = OutboundMessage(0x01, 0x30, 0x00, 1, b'\x00\x00\x00\x00')
+        ping = OutboundMessage(0x01, 0x30, 0x03, 2)
+        turn_on = OutboundMessage(0x01, 0x30, 0x01, 3)
+
+        scheduler.put_nowait(nounce_reply)
+        scheduler.put_nowait(ping)
+        scheduler.put_nowait(turn_on)
+
+        self.assertIs(turn_on, scheduler.get_nowait())
+        self.assertIs(ping, scheduler.get_nowait())
+        self.assertIs(nounce_reply, scheduler.get_nowait())
+        self.assertRaises(Empty, scheduler.get_nowait)
+
+    def test_superseding(self):
+        """
+        Tests whether a newer on / off command drops the queued one for the same device only
+        """
+        scheduler = TransmitScheduler()
+        turn_on = OutboundMessage(0x01, 0x30, 0x01, 1)
+        other_device = OutboundMessage(0x01, 0x31, 0x01, 1)
+        turn_off = OutboundMessage(0x01, 0x30, 0x02, 2)
+
+        scheduler.put_nowait(turn_on)
+        scheduler.put_nowait(turn_on)
+        scheduler.put_nowait(other_device)
+        scheduler.put_nowait(turn_off)
+
+        self.assertEqual(2, scheduler.qsize())
+        self.assertEqual(2, scheduler.unfinished_tasks)
+        self.assertEqual(2, scheduler.counters["superseded"])
+
+        # retransmission of an older command doesn't undo the newer one
+        scheduler.put_nowait(turn_on)
+        self.assertEqual(2, scheduler.qsize())
+        self.assertEqual(2, scheduler.unfinished_tasks)
+        self.assertIs(other_device, scheduler.get_nowait())
+        self.assertIs(turn_off, scheduler.get_nowait())
+
+    def test_repeat_spacing(self):
+        """
+        Tests whether repeats of an identical frame are held back by the spacing
+        """
+        scheduler = TransmitScheduler(0.05)
+        turn_on = OutboundMessage(0x01, 0x30, 0x01, 1)
+        # the repeat is spaced from the moment the first frame has been queued
+        started_at = monotonic()
+        scheduler.put_nowait(turn_on)
+        scheduler.put_nowait(turn_on)
+
+        self.assertIs(turn_on, scheduler.get_nowait())
+        self.assertRaises(Empty, scheduler.get_nowait)
+        self.assertRaises(Empty, scheduler.get, True, 0.01)
+        self.assertIs(turn_on, scheduler.get(timeout=1))
+        self.assertGreaterEqual(monotonic() - started_at, 0.05)
+        self.assertEqual(1, scheduler.counters["repeated"])
+
+    def test_airtime(self):
+        """
+        Tests whether airtime of the frames taken off the queue is accounted
+        """
+        scheduler = TransmitScheduler()
+        msg = OutboundMessage(0x01, 0x30, 0x01, 1)
+        self.assertAlmostEqual(len(msg.encoded_data) / 480, TransmitScheduler.airtime(msg))
+
+        scheduler.put_nowait(msg)
+        self.assertEqual(0, scheduler.airtime_per_minute())
+        scheduler.get_nowait()
+        self.assertAlmostEqual(TransmitScheduler.airtime(msg), scheduler.airtime_per_minute())
+
+    def test_negotiated_airtime(self):
+        """
+        Tests whether airtime is accounted for the bytes sent in the framing negotiated with the recipient
+        """
+        scheduler = TransmitScheduler()
+        scheduler.framing_for = lambda address: Framing.COBS if address == 0x30 else Framing.NIBBLE
+        msg = OutboundMessage(0x01, 0x30, 0x03, 1, b'\x01\x02\x03\x04\x05\x06\x07\x08')
+        cobs_airtime = len(msg.encoded_for(Framing.COBS)) / 480
+        self.assertAlmostEqual(cobs_airtime, TransmitScheduler.airtime(msg, Framing.COBS))
+        self.assertLess(cobs_airtime, TransmitScheduler.airtime(msg))
+
+        scheduler.put_nowait(msg)
+        scheduler.put_nowait(OutboundMessage(0x01, 0x31, 0x03, 2))
+        scheduler.get_nowait()
+        self.assertAlmostEqual(cobs_airtime, scheduler.airtime_per_minute())
+
+    def test_has_pending(self):
+        """
+        Tests whether queued messages are found by their recipient and command until they're taken off the queue
+        """
+        scheduler = TransmitScheduler()
+        scheduler.put_nowait(OutboundMessage(0x01, 0x30, 0x00, 1, b'\x00\x00\x00\x00'))
+
+        self.assertTrue(scheduler.has_pending(0x30, 0x00))
+        self.assertFalse(scheduler.has_pending(0x31, 0x00))
+        self.assertFalse(scheduler.has_pending(0x30, 0x01))
+
+        scheduler.get_nowait()
+        self.assertFalse(scheduler.has_pending(0x30, 0x00))
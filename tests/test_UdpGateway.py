@@ -0,0 +1,48 @@
+import socket
+from unittest import TestCase
+from radio_bus import Framing, OutboundMessage, UdpGateway
+
+
+class TestUdpGateway(TestCase):
+    """
+    Test cases for receiving and sending frames over UDP
+    """
+
+    def setUp(self) -> None:
+        self.gateway = UdpGateway("udp", "127.0.0.1", 0)
+        self.peer = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.peer.bind(("127.0.0.1", 0))
+        self.peer.settimeout(1)
+
+    def tearDown(self) -> None:
+        self.gateway.close()
+        self.peer.close()
+
+    def test_receive(self):
+        """
+        Frames are received in the same framing they have on air, a truncated frame is discarded
+        """
+        nibble = OutboundMessage(0x20, 0x01, 0x01, 1).encoded_for(Framing.NIBBLE)
+        cobs = OutboundMessage(0x20, 0x01, 0x01, 2).encoded_for(Framing.COBS)
+        self.peer.sendto(nibble + cobs, self.gateway.address)
+        self.peer.sendto(cobs[:-1], self.gateway.address)
+
+        frames = self.gateway.receive()
+        self.assertEqual([Framing.NIBBLE, Framing.COBS], [frame.framing for frame in frames])
+        self.assertEqual(nibble[2:], frames[0].data)
+        self.assertEqual(self.peer.getsockname(), frames[0].origin)
+
+        self.assertEqual([], self.gateway.receive())
+        self.assertEqual({"datagrams": 2, "discarded_bytes": 0, "truncated": 1}, self.gateway.counters)
+
+    def test_send(self):
+        """
+        Messages are sent to the peer the recipient has been heard from, and dropped if there is none
+        """
+        msg = OutboundMessage(0x01, 0x20, 0x01, 1)
+        self.gateway.send(msg, Framing.NIBBLE)
+        self.assertEqual(1, self.gateway.counters["unroutable"])
+
+        self.gateway.heard(0x20, self.peer.getsockname())
+        self.gateway.send(msg, Framing.NIBBLE)
+        self.assertEqual(msg.encoded_data, self.peer.recv(UdpGateway.MAX_DATAGRAM))
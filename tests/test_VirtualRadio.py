@@ -0,0 +1,79 @@
+import os
+from unittest import TestCase
+from radio_bus import Hc12Emulator, LoopbackSerial, OutboundMessage, PtySerial, VirtualRadio
+
+
+class TestVirtualRadio(TestCase):
+    """
+    Test cases for radio backends that work without the HC-12 hardware
+    """
+
+    def test_loopback(self):
+        """
+        Tests whether bytes written to one end of a loopback arrive at the other
+        """
+        controller_end, air_end = LoopbackSerial.pair(0.01)
+        radio = VirtualRadio(controller_end)
+        radio.setup_device()
+
+        msg = OutboundMessage(0x01, 0x30, 0x02, 0x01)
+        radio.send(msg)
+        self.assertEqual(msg.encoded_data, air_end.read(air_end.in_waiting))
+
+        air_end.write(b'\xff\x01\x02')
+        self.assertEqual(b'\xff\x01\x02', radio.receive())
+        self.assertEqual(b'', radio.receive())
+
+    def test_emulator_setup(self):
+        """
+        Tests whether the emulated adapter answers the setup commands and keeps them off the air
+        """
+        controller_end, air_end = LoopbackSerial.pair(0.01)
+        emulator = Hc12Emulator(controller_end)
+        radio = VirtualRadio(emulator)
+        radio.setup_device()
+
+        self.assertFalse(emulator.command_mode)
+        self.assertEqual(
+            {"baudrate": "4800", "channel": "003", "mode": "3", "power": "8"},
+            emulator.settings,
+        )
+        self.assertEqual(0, air_end.in_waiting)
+
+        radio.send(OutboundMessage(0x01, 0x30, 0x02, 0x01))
+        self.assertGreater(air_end.in_waiting, 0)
+
+    def test_emulator_commands(self):
+        """
+        Tests responses of the emulated adapter to AT commands
+        """
+        emulator = Hc12Emulator(LoopbackSerial(0.01))
+        emulator.set_command_mode(True)
+
+        emulator.write(b'AT\rAT+C021\rAT+FOO\r')
+        self.assertEqual(b'OK\r\n', emulator.readline())
+        self.assertEqual(b'OK+C021\r\n', emulator.readline())
+        self.assertEqual(b'ERROR\r\n', emulator.readline())
+
+        emulator.write(b'AT+RX\r')
+        self.assertEqual(b'OK+B9600\r\nOK+RC021\r\nOK+RP:+20dBm\r\nOK+FU3\r\n', emulator.read(emulator.in_waiting))
+
+    def test_pty(self):
+        """
+        Tests whether bytes go both ways through the pseudo-terminal
+        """
+        serial = PtySerial(0.1)
+        try:
+            device = os.open(serial.device, os.O_RDWR | os.O_NOCTTY)
+            try:
+                serial.write(b'\xff\x01\x02\n')
+                self.assertEqual(b'\xff\x01\x02\n', os.read(device, 16))
+
+                os.write(device, b'\xff\x03\x04')
+                radio = VirtualRadio(serial)
+                self.assertEqual(b'\xff\x03\x04', radio.receive())
+                self.assertEqual(b'', serial.read(1))
+            finally:
+                os.close(device)
+        finally:
+            serial.close()